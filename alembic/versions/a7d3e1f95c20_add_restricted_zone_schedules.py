@@ -0,0 +1,29 @@
+"""Add activation windows and schedules to restricted_zones
+
+Revision ID: a7d3e1f95c20
+Revises: f2b7d9c3a6e1
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3e1f95c20'
+down_revision = 'f2b7d9c3a6e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('restricted_zones', sa.Column('effective_from', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('restricted_zones', sa.Column('effective_to', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('restricted_zones', sa.Column('schedule_json', sa.JSON(), nullable=True))
+    op.create_index(op.f('ix_restricted_zones_effective_to'), 'restricted_zones', ['effective_to'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_restricted_zones_effective_to'), table_name='restricted_zones')
+    op.drop_column('restricted_zones', 'schedule_json')
+    op.drop_column('restricted_zones', 'effective_to')
+    op.drop_column('restricted_zones', 'effective_from')
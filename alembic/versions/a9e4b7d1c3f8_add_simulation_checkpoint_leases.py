@@ -0,0 +1,25 @@
+"""Lease on simulation checkpoints so only one process simulates a flight
+
+Revision ID: a9e4b7d1c3f8
+Revises: f3c9d5a8b1e4
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a9e4b7d1c3f8'
+down_revision = 'f3c9d5a8b1e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('simulation_checkpoints', sa.Column('owner', sa.String(length=32), nullable=True))
+    op.add_column('simulation_checkpoints', sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('simulation_checkpoints', 'lease_expires_at')
+    op.drop_column('simulation_checkpoints', 'owner')
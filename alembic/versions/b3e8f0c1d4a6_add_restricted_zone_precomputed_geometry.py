@@ -0,0 +1,35 @@
+"""Add precomputed geometry columns to restricted_zones
+
+Revision ID: b3e8f0c1d4a6
+Revises: a7d3e1f95c20
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b3e8f0c1d4a6'
+down_revision = 'a7d3e1f95c20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('restricted_zones', sa.Column('bbox_min_lat', sa.Float(), nullable=True))
+    op.add_column('restricted_zones', sa.Column('bbox_min_lon', sa.Float(), nullable=True))
+    op.add_column('restricted_zones', sa.Column('bbox_max_lat', sa.Float(), nullable=True))
+    op.add_column('restricted_zones', sa.Column('bbox_max_lon', sa.Float(), nullable=True))
+    op.add_column('restricted_zones', sa.Column('centroid_lat', sa.Float(), nullable=True))
+    op.add_column('restricted_zones', sa.Column('centroid_lon', sa.Float(), nullable=True))
+    op.add_column('restricted_zones', sa.Column('projected_json', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('restricted_zones', 'projected_json')
+    op.drop_column('restricted_zones', 'centroid_lon')
+    op.drop_column('restricted_zones', 'centroid_lat')
+    op.drop_column('restricted_zones', 'bbox_max_lon')
+    op.drop_column('restricted_zones', 'bbox_max_lat')
+    op.drop_column('restricted_zones', 'bbox_min_lon')
+    op.drop_column('restricted_zones', 'bbox_min_lat')
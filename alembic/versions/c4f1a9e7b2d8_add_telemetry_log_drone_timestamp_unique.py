@@ -0,0 +1,38 @@
+"""Unique (drone_id, timestamp) on telemetry_logs
+
+Revision ID: c4f1a9e7b2d8
+Revises: b3e8f0c1d4a6
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c4f1a9e7b2d8'
+down_revision = 'b3e8f0c1d4a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing duplicates: repoint drones at the oldest copy, then drop the others
+    op.execute("""
+        UPDATE drones SET last_telemetry_id = keep.keep_id
+        FROM (
+            SELECT t.id, MIN(d.id) AS keep_id
+            FROM telemetry_logs t
+            JOIN telemetry_logs d ON d.drone_id = t.drone_id AND d.timestamp = t.timestamp
+            GROUP BY t.id
+        ) AS keep
+        WHERE drones.last_telemetry_id = keep.id AND keep.keep_id <> keep.id
+    """)
+    op.execute("""
+        DELETE FROM telemetry_logs t
+        USING telemetry_logs d
+        WHERE t.drone_id = d.drone_id AND t.timestamp = d.timestamp AND t.id > d.id
+    """)
+    op.create_index('uq_telemetry_log_drone_timestamp', 'telemetry_logs', ['drone_id', 'timestamp'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_telemetry_log_drone_timestamp', table_name='telemetry_logs')
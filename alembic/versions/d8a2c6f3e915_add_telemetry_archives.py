@@ -0,0 +1,50 @@
+"""Compressed per-flight telemetry archives
+
+Revision ID: d8a2c6f3e915
+Revises: c4f1a9e7b2d8
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd8a2c6f3e915'
+down_revision = 'c4f1a9e7b2d8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'telemetry_archives',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('flight_plan_id', sa.Integer(), nullable=False),
+        sa.Column('drone_id', sa.Integer(), nullable=False),
+        sa.Column('start_time', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('end_time', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('point_count', sa.Integer(), nullable=False),
+        sa.Column('encoding_version', sa.SmallInteger(), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['flight_plan_id'], ['flight_plans.id'], name='fk_telemetry_archive_flight_plan_id', ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['drone_id'], ['drones.id'], name='fk_telemetry_archive_drone_id', ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('flight_plan_id'),
+    )
+    op.create_index(op.f('ix_telemetry_archives_id'), 'telemetry_archives', ['id'], unique=False)
+    op.create_index(op.f('ix_telemetry_archives_drone_id'), 'telemetry_archives', ['drone_id'], unique=False)
+    op.create_index(op.f('ix_telemetry_archives_start_time'), 'telemetry_archives', ['start_time'], unique=False)
+    op.create_index(op.f('ix_telemetry_archives_end_time'), 'telemetry_archives', ['end_time'], unique=False)
+    op.create_index(op.f('ix_telemetry_archives_deleted_at'), 'telemetry_archives', ['deleted_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_telemetry_archives_deleted_at'), table_name='telemetry_archives')
+    op.drop_index(op.f('ix_telemetry_archives_end_time'), table_name='telemetry_archives')
+    op.drop_index(op.f('ix_telemetry_archives_start_time'), table_name='telemetry_archives')
+    op.drop_index(op.f('ix_telemetry_archives_drone_id'), table_name='telemetry_archives')
+    op.drop_index(op.f('ix_telemetry_archives_id'), table_name='telemetry_archives')
+    op.drop_table('telemetry_archives')
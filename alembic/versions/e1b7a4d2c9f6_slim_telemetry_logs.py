@@ -0,0 +1,35 @@
+"""Drop audit columns and redundant indexes from telemetry_logs
+
+Revision ID: e1b7a4d2c9f6
+Revises: d8a2c6f3e915
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e1b7a4d2c9f6'
+down_revision = 'd8a2c6f3e915'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index(op.f('ix_telemetry_logs_deleted_at'), table_name='telemetry_logs')
+    # Duplicates the primary key
+    op.drop_index(op.f('ix_telemetry_logs_id'), table_name='telemetry_logs')
+    # Leading column of uq_telemetry_log_drone_timestamp
+    op.drop_index(op.f('ix_telemetry_logs_drone_id'), table_name='telemetry_logs')
+    op.drop_column('telemetry_logs', 'deleted_at')
+    op.drop_column('telemetry_logs', 'updated_at')
+    op.drop_column('telemetry_logs', 'created_at')
+
+
+def downgrade() -> None:
+    op.add_column('telemetry_logs', sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()')))
+    op.add_column('telemetry_logs', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()')))
+    op.add_column('telemetry_logs', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(op.f('ix_telemetry_logs_drone_id'), 'telemetry_logs', ['drone_id'], unique=False)
+    op.create_index(op.f('ix_telemetry_logs_id'), 'telemetry_logs', ['id'], unique=False)
+    op.create_index(op.f('ix_telemetry_logs_deleted_at'), 'telemetry_logs', ['deleted_at'], unique=False)
@@ -0,0 +1,46 @@
+"""Add route summary columns to flight_plans
+
+Revision ID: e5c8a2f41b7d
+Revises: d93e49272d92
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e5c8a2f41b7d'
+down_revision = 'd93e49272d92'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('flight_plans', sa.Column('route_length_m', sa.Float(), nullable=True))
+    op.add_column('flight_plans', sa.Column('bbox_min_lat', sa.Float(), nullable=True))
+    op.add_column('flight_plans', sa.Column('bbox_min_lon', sa.Float(), nullable=True))
+    op.add_column('flight_plans', sa.Column('bbox_max_lat', sa.Float(), nullable=True))
+    op.add_column('flight_plans', sa.Column('bbox_max_lon', sa.Float(), nullable=True))
+    op.add_column('flight_plans', sa.Column('min_altitude_m', sa.Float(), nullable=True))
+    op.add_column('flight_plans', sa.Column('max_altitude_m', sa.Float(), nullable=True))
+    op.add_column('flight_plans', sa.Column('nearest_nfz_id', sa.Integer(), nullable=True))
+    op.add_column('flight_plans', sa.Column('nearest_nfz_distance_m', sa.Float(), nullable=True))
+    op.add_column('flight_plans', sa.Column('overlap_count', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_flight_plan_nearest_nfz_id', 'flight_plans', 'restricted_zones',
+        ['nearest_nfz_id'], ['id'], ondelete='SET NULL'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('fk_flight_plan_nearest_nfz_id', 'flight_plans', type_='foreignkey')
+    op.drop_column('flight_plans', 'overlap_count')
+    op.drop_column('flight_plans', 'nearest_nfz_distance_m')
+    op.drop_column('flight_plans', 'nearest_nfz_id')
+    op.drop_column('flight_plans', 'max_altitude_m')
+    op.drop_column('flight_plans', 'min_altitude_m')
+    op.drop_column('flight_plans', 'bbox_max_lon')
+    op.drop_column('flight_plans', 'bbox_max_lat')
+    op.drop_column('flight_plans', 'bbox_min_lon')
+    op.drop_column('flight_plans', 'bbox_min_lat')
+    op.drop_column('flight_plans', 'route_length_m')
@@ -0,0 +1,30 @@
+"""Add area search indexes to flight_plans
+
+Revision ID: f2b7d9c3a6e1
+Revises: e5c8a2f41b7d
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'f2b7d9c3a6e1'
+down_revision = 'e5c8a2f41b7d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_flight_plan_bbox', 'flight_plans',
+        ['bbox_min_lat', 'bbox_max_lat', 'bbox_min_lon', 'bbox_max_lon'], unique=False
+    )
+    op.create_index(
+        'ix_flight_plan_schedule', 'flight_plans',
+        ['planned_departure_time', 'planned_arrival_time'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_flight_plan_schedule', table_name='flight_plans')
+    op.drop_index('ix_flight_plan_bbox', table_name='flight_plans')
@@ -0,0 +1,36 @@
+"""Simulation checkpoints for resuming ACTIVE flights after a restart
+
+Revision ID: f3c9d5a8b1e4
+Revises: e1b7a4d2c9f6
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f3c9d5a8b1e4'
+down_revision = 'e1b7a4d2c9f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'simulation_checkpoints',
+        sa.Column('flight_plan_id', sa.Integer(), nullable=False),
+        sa.Column('waypoint_index', sa.Integer(), nullable=False),
+        sa.Column('points_emitted', sa.Integer(), nullable=False),
+        sa.Column('last_emitted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['flight_plan_id'], ['flight_plans.id'], name='fk_simulation_checkpoint_flight_plan_id', ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('flight_plan_id'),
+    )
+    op.create_index(op.f('ix_simulation_checkpoints_deleted_at'), 'simulation_checkpoints', ['deleted_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_simulation_checkpoints_deleted_at'), table_name='simulation_checkpoints')
+    op.drop_table('simulation_checkpoints')
@@ -1,54 +1,118 @@
-from typing import Generator, Optional, List
-from fastapi import Depends, HTTPException, status
+from typing import AsyncGenerator, Generator, Optional, List
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core import security
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import get_db, SessionLocal, ReadSessionLocal
+from app.db.async_session import get_async_db, AsyncSessionLocal, AsyncReadSessionLocal
+from app.db.routing import recent_writes
 from app.models.user import User, UserRole
 from app.schemas.token import TokenPayload
 from app.crud import user as crud_user  # This imports the 'user' instance
 
 reusable_http_bearer = HTTPBearer(auto_error=True)
+optional_http_bearer = HTTPBearer(auto_error=False)
 
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    credentials: HTTPAuthorizationCredentials = Depends(reusable_http_bearer),
-) -> User:
-    token = credentials.credentials
-        
-    credentials_exception = HTTPException(
+
+def _wrote_recently(credentials: Optional[HTTPAuthorizationCredentials]) -> bool:
+    if credentials is None:
+        return False
+    subject = security.decode_token(credentials.credentials)
+    return subject is not None and recent_writes.wrote_recently(subject)
+
+
+def get_read_db(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_http_bearer),
+) -> Generator[Session, None, None]:
+    """
+    Session for read-only endpoints. Uses the replica when one is configured,
+    unless the caller wrote something within READ_YOUR_WRITES_WINDOW_SECONDS.
+    """
+    session_factory = ReadSessionLocal
+    if session_factory is not SessionLocal and _wrote_recently(credentials):
+        session_factory = SessionLocal
+    db = session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_http_bearer),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Async counterpart of get_read_db."""
+    session_factory = AsyncReadSessionLocal
+    if session_factory is not AsyncSessionLocal and _wrote_recently(credentials):
+        session_factory = AsyncSessionLocal
+    async with session_factory() as db:
+        yield db
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _user_id_from_credentials(credentials: HTTPAuthorizationCredentials) -> int:
+    token = credentials.credentials
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
         if payload.get("sub") is None:
-            raise credentials_exception
+            raise _credentials_exception()
         token_data = TokenPayload(**payload)
-    except (JWTError, ValidationError):
-        raise credentials_exception
-    
-    user_id = token_data.sub
-    if user_id is None:
-        raise credentials_exception
-    
-    # Fix: Use crud_user.get() instead of crud_user.user.get()
-    user = crud_user.get(db, id=int(user_id))
+        if token_data.sub is None:
+            raise _credentials_exception()
+        return int(token_data.sub)
+    except (JWTError, ValidationError, ValueError):
+        raise _credentials_exception()
+
+
+def _check_authenticated_user(request: Request, user: Optional[User]) -> User:
     if not user:
-        raise credentials_exception
+        raise _credentials_exception()
     if not crud_user.is_active(user):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user")
 
+    # Mutating requests pin this user's subsequent reads to the primary (see get_read_db)
+    if request.method not in SAFE_METHODS:
+        recent_writes.mark_write(str(user.id))
+
     return user
 
+
+def get_current_user(
+    request: Request,
+    db: Session = Depends(get_db),
+    credentials: HTTPAuthorizationCredentials = Depends(reusable_http_bearer),
+) -> User:
+    user_id = _user_id_from_credentials(credentials)
+    user = crud_user.get(db, id=user_id)
+    return _check_authenticated_user(request, user)
+
+
+async def get_current_user_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    credentials: HTTPAuthorizationCredentials = Depends(reusable_http_bearer),
+) -> User:
+    """Same checks as get_current_user, without leaving the event loop."""
+    user_id = _user_id_from_credentials(credentials)
+    user = await crud_user.get_async(db, id=user_id)
+    return _check_authenticated_user(request, user)
+
 # Role-specific dependencies
 def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     return current_user
@@ -99,6 +163,20 @@ def get_current_pilot(current_user: User = Depends(get_current_user)) -> User:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user")
     return current_user
 
+# Async-endpoint variants: same role checks on top of get_current_user_async.
+# The sync checkers are plain functions, so they are reused directly.
+async def get_current_active_user_async(current_user: User = Depends(get_current_user_async)) -> User:
+    return get_current_active_user(current_user)
+
+async def get_current_authority_admin_async(current_user: User = Depends(get_current_user_async)) -> User:
+    return get_current_authority_admin(current_user)
+
+async def get_current_organization_admin_async(current_user: User = Depends(get_current_user_async)) -> User:
+    return get_current_organization_admin(current_user)
+
+async def get_current_pilot_async(current_user: User = Depends(get_current_user_async)) -> User:
+    return get_current_pilot(current_user)
+
 def verify_organization_access(
     organization_id_in_path: int,
     current_user: User = Depends(get_current_organization_admin)
@@ -1,6 +1,7 @@
 from typing import List, Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
@@ -8,6 +9,8 @@ from app.api import deps
 from app.models.user import UserRole
 from app.models.flight_plan import FlightPlanStatus
 from app.services import flight_service # Use the service instance
+from app.services.telemetry_archive_service import merge_points
+from app.services.telemetry_codec import decode_track
 
 router = APIRouter()
 
@@ -37,32 +40,32 @@ def submit_new_flight_plan(
 
 
 @router.get("/my", response_model=List[schemas.FlightPlanReadWithWaypoints])
-def list_my_flight_plans(
-    db: Session = Depends(deps.get_db),
+async def list_my_flight_plans(
+    db: AsyncSession = Depends(deps.get_async_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=200),
     status_filter: Optional[FlightPlanStatus] = Query(None, alias="status"),
-    current_user: models.User = Depends(deps.get_current_pilot),
+    current_user: models.User = Depends(deps.get_current_pilot_async),
 ) -> Any:
     """
     List flight plans submitted by the currently authenticated user (Pilot).
     Includes drone details and waypoints.
     """
     # Use a CRUD method that loads drone and waypoints
-    flight_plans = crud.flight_plan.get_multi_for_user_with_details( # Changed method name
+    flight_plans = await crud.flight_plan.get_multi_for_user_with_details_async(
         db, user_id=current_user.id, skip=skip, limit=limit, status=status_filter
     )
     return flight_plans
 
 
 @router.get("/organization", response_model=List[schemas.FlightPlanRead])
-def list_organization_flight_plans(
-    db: Session = Depends(deps.get_db),
+async def list_organization_flight_plans(
+    db: AsyncSession = Depends(deps.get_async_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=200),
     status_filter: Optional[FlightPlanStatus] = Query(None, alias="status"),
     user_id_filter: Optional[int] = Query(None, alias="user_id"),
-    current_org_admin: models.User = Depends(deps.get_current_organization_admin),
+    current_org_admin: models.User = Depends(deps.get_current_organization_admin_async),
 ) -> Any:
     """
     List all flight plans associated with the Organization Admin's organization.
@@ -70,7 +73,7 @@ def list_organization_flight_plans(
     if not current_org_admin.organization_id: # Should be guaranteed by dependency
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Admin not linked to an organization.")
         
-    flight_plans = crud.flight_plan.get_multi_for_organization(
+    flight_plans = await crud.flight_plan.get_multi_for_organization_async(
         db, 
         organization_id=current_org_admin.organization_id, 
         skip=skip, 
@@ -86,21 +89,21 @@ def list_organization_flight_plans(
     response_model=List[schemas.FlightPlanReadWithWaypoints],  # ← note the changed model
     status_code=status.HTTP_200_OK
 )
-def list_all_flight_plans_admin_with_waypoints(
-    db: Session = Depends(deps.get_db),
+async def list_all_flight_plans_admin_with_waypoints(
+    db: AsyncSession = Depends(deps.get_async_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=200),
     status_filter: Optional[FlightPlanStatus] = Query(None, alias="status"),
     organization_id_filter: Optional[int] = Query(None, alias="organization_id"),
     user_id_filter: Optional[int] = Query(None, alias="user_id"),
-    current_authority_admin: models.User = Depends(deps.get_current_authority_admin),
+    current_authority_admin: models.User = Depends(deps.get_current_authority_admin_async),
 ) -> Any:
     """
     List ALL flight plans in the system (Authority Admin Only),
     including their waypoints (just like /my does).
     """
-    # Fetch all FlightPlan ORM objects
-    flight_plans = crud.flight_plan.get_all_flight_plans_admin(
+    # Waypoints, drone and submitter are eager-loaded by the CRUD statement
+    flight_plans = await crud.flight_plan.get_all_flight_plans_admin_async(
         db,
         skip=skip,
         limit=limit,
@@ -108,12 +111,73 @@ def list_all_flight_plans_admin_with_waypoints(
         organization_id=organization_id_filter,
         user_id=user_id_filter
     )
+    return flight_plans
 
-    # Eager-load each plan’s waypoints so Pydantic can serialize them
-    for fp in flight_plans:
-        db.refresh(fp, attribute_names=["waypoints"])
 
-    return flight_plans
+@router.get("/admin/approval-queue", response_model=List[schemas.FlightPlanQueueItem])
+def get_approval_queue(
+    db: Session = Depends(deps.get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    current_authority_admin: models.User = Depends(deps.get_current_authority_admin),
+) -> Any:
+    """
+    Plans awaiting authority approval, earliest departure first, with their
+    current 4D conflicts and NFZ violations (Authority Admin Only).
+    """
+    queue = flight_service.get_approval_queue(db, skip=skip, limit=limit)
+    return [
+        schemas.FlightPlanQueueItem.model_validate(db_flight_plan).model_copy(
+            update={"conflicting_flight_plan_ids": conflicting_ids, "nfz_violations": nfz_violations}
+        )
+        for db_flight_plan, conflicting_ids, nfz_violations in queue
+    ]
+
+
+@router.post("/admin/status-batch", response_model=List[schemas.FlightPlanDecisionResult])
+def batch_update_flight_plan_status(
+    batch_in: schemas.FlightPlanBatchStatusUpdate,
+    db: Session = Depends(deps.get_db),
+    current_authority_admin: models.User = Depends(deps.get_current_authority_admin),
+) -> Any:
+    """
+    Approve or reject many flight plans in one transaction (Authority Admin Only).
+    Each decision follows the same rules as PUT /{flight_plan_id}/status; failures are reported per item.
+    """
+    try:
+        return flight_service.batch_update_flight_plan_status(
+            db, decisions=batch_in.decisions, actor=current_authority_admin
+        )
+    except Exception as e:
+        print(f"Error applying batch status update: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error applying batch status update.")
+
+
+@router.post("/admin/search", response_model=List[schemas.FlightPlanRead])
+def search_flight_plans_by_area(
+    search_in: schemas.FlightPlanAreaSearch,
+    db: Session = Depends(deps.get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    current_authority_admin: models.User = Depends(deps.get_current_authority_admin),
+) -> Any:
+    """
+    Flight plans whose route crosses a polygon while scheduled within a time
+    window, e.g. for incident response or a proposed NFZ (Authority Admin Only).
+    """
+    try:
+        return flight_service.search_by_area(
+            db,
+            polygon=search_in.polygon,
+            start_time=search_in.start_time,
+            end_time=search_in.end_time,
+            statuses=search_in.statuses,
+            skip=skip,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
 
 @router.get("/{flight_plan_id}", response_model=schemas.FlightPlanReadWithWaypoints)
 def read_flight_plan_by_id(
@@ -228,15 +292,15 @@ def cancel_flight_endpoint( # Renamed
 
 
 @router.get("/{flight_plan_id}/history", response_model=schemas.FlightPlanHistory)
-def get_flight_plan_history(
+async def get_flight_plan_history(
     flight_plan_id: int,
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_active_user), # Auth Admin, submitter, relevant Org Admin
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    current_user: models.User = Depends(deps.get_current_active_user_async), # Auth Admin, submitter, relevant Org Admin
 ) -> Any:
     """
     Get the planned waypoints and all recorded telemetry logs for a completed or active flight.
     """
-    db_flight_plan = crud.flight_plan.get_flight_history(db, flight_plan_id=flight_plan_id) # This method loads waypoints and telemetry
+    db_flight_plan = await crud.flight_plan.get_flight_history_async(db, flight_plan_id=flight_plan_id) # Loads waypoints, drone, submitter
     
     if not db_flight_plan:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Flight plan not found")
@@ -253,14 +317,15 @@ def get_flight_plan_history(
     if not can_view:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view this flight plan history")
 
-    # Ensure all necessary data is loaded for FlightPlanReadWithWaypoints
-    # The get_flight_history CRUD method should handle this with selectinload
-    
     # Convert to FlightPlanReadWithWaypoints
     flight_plan_details_schema = schemas.FlightPlanReadWithWaypoints.model_validate(db_flight_plan)
     
-    # Telemetry logs are already loaded by crud.flight_plan.get_flight_history
-    actual_telemetry_schema = [schemas.TelemetryLogRead.model_validate(log) for log in db_flight_plan.telemetry_logs]
+    # Telemetry in chronological order: the flight's archive (once finished) plus what is still in telemetry_logs
+    telemetry_logs = await crud.telemetry_log.get_logs_for_flight_async(db, flight_plan_id=flight_plan_id)
+    archive = await crud.telemetry_archive.get_by_flight_async(db, flight_plan_id=flight_plan_id)
+    if archive is not None:
+        telemetry_logs = merge_points(decode_track(archive.data, flight_plan_id), telemetry_logs)
+    actual_telemetry_schema = [schemas.TelemetryLogRead.model_validate(log) for log in telemetry_logs]
 
     return schemas.FlightPlanHistory(
         flight_plan_details=flight_plan_details_schema,
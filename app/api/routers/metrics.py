@@ -0,0 +1,31 @@
+from typing import List, Any
+
+from fastapi import APIRouter, Depends
+
+from app import models, schemas
+from app.api import deps
+from app.db.session import pool_metrics
+from app.services.telemetry_spool import telemetry_spool
+
+router = APIRouter()
+
+@router.get("/db-pool", response_model=List[schemas.DBPoolStats])
+def read_db_pool_metrics(
+    current_admin: models.User = Depends(deps.get_current_authority_admin),
+) -> Any:
+    """
+    Connection pool usage per database engine (Authority Admin only).
+    A rising checkout wait or non-zero timeouts means the pool is starved for this deployment.
+    """
+    return [metrics.snapshot() for metrics in pool_metrics.values()]
+
+
+@router.get("/telemetry-spool", response_model=schemas.TelemetrySpoolStats)
+def read_telemetry_spool_metrics(
+    current_admin: models.User = Depends(deps.get_current_authority_admin),
+) -> Any:
+    """
+    Telemetry write-ahead spool of this worker (Authority Admin only).
+    Growing pending_points / lag_seconds with drain failures means the database is not keeping up or is down.
+    """
+    return telemetry_spool.stats()
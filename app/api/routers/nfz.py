@@ -1,14 +1,24 @@
 from typing import List, Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Path, Request, Response
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
 from app.models.user import UserRole
+from app.services.nfz_geometry import normalize_zone_geometry
+from app.services.nfz_impact_service import nfz_impact_service
+from app.services.nfz_map_service import nfz_map_service
+from app.services.nfz_service import nfz_service
 
 router = APIRouter()
 
+# Updates that can change which flights a zone affects
+IMPACT_FIELDS = {
+    "is_active", "geometry_type", "definition_json", "min_altitude_m", "max_altitude_m",
+    "effective_from", "effective_to", "schedule_json",
+}
+
 # --- Endpoints under /admin/nfz (Authority Admin Only) ---
 
 @router.post("/admin/nfz/", response_model=schemas.RestrictedZoneRead, status_code=status.HTTP_201_CREATED)
@@ -16,10 +26,12 @@ def create_nfz(
     *,
     db: Session = Depends(deps.get_db),
     nfz_in: schemas.RestrictedZoneCreate,
+    background_tasks: BackgroundTasks,
     current_admin: models.User = Depends(deps.get_current_authority_admin),
 ) -> Any:
     """
     Create a new No-Fly Zone (Authority Admin only).
+    Affected flights are alerted over the WebSocket once the response is sent.
     """
     # Check for duplicate name if names should be unique
     existing_nfz = crud.restricted_zone.get_by_name(db, name=nfz_in.name)
@@ -29,18 +41,22 @@ def create_nfz(
             detail=f"A No-Fly Zone with the name '{nfz_in.name}' already exists.",
         )
     
-    # TODO: Add validation for nfz_in.definition_json based on nfz_in.geometry_type
-    # e.g., circle needs center_lat, center_lon, radius_m
-    # polygon needs coordinates: List[List[List[float]]]
+    try:
+        geometry = normalize_zone_geometry(nfz_in.geometry_type, nfz_in.definition_json)
+        nfz_service.validate_activation_window(nfz_in.effective_from, nfz_in.effective_to)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     db_nfz = models.RestrictedZone(
-        **nfz_in.model_dump(),
+        **{**nfz_in.model_dump(), **geometry},
         created_by_authority_id=current_admin.id,
         is_active=True # Default to active on creation
     )
     db.add(db_nfz)
     db.commit()
     db.refresh(db_nfz)
+    nfz_service.invalidate_zones()
+    background_tasks.add_task(nfz_impact_service.run_impact_job, db_nfz.id)
     return db_nfz
 
 
@@ -82,11 +98,13 @@ def get_nfz_by_id_admin(
 def update_nfz(
     zone_id: int,
     nfz_in: schemas.RestrictedZoneUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(deps.get_db),
     current_admin: models.User = Depends(deps.get_current_authority_admin),
 ) -> Any:
     """
     Update an existing NFZ (Authority Admin only).
+    Activating a zone or changing its geometry/altitudes re-runs the impact job.
     """
     db_nfz = crud.restricted_zone.get(db, id=zone_id)
     if not db_nfz:
@@ -99,12 +117,43 @@ def update_nfz(
         if existing_nfz_name and existing_nfz_name.id != zone_id:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="NFZ name already taken.")
 
-    # TODO: Add validation for definition_json if geometry_type is also changing or if definition_json is updated.
+    try:
+        if "geometry_type" in update_data or "definition_json" in update_data:
+            update_data.update(normalize_zone_geometry(
+                update_data.get("geometry_type", db_nfz.geometry_type),
+                update_data.get("definition_json", db_nfz.definition_json),
+            ))
+        nfz_service.validate_activation_window(
+            update_data.get("effective_from", db_nfz.effective_from),
+            update_data.get("effective_to", db_nfz.effective_to),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     updated_nfz = crud.restricted_zone.update(db, db_obj=db_nfz, obj_in=update_data)
+    nfz_service.invalidate_zones()
+    if updated_nfz.is_active and IMPACT_FIELDS & update_data.keys():
+        background_tasks.add_task(nfz_impact_service.run_impact_job, updated_nfz.id)
     return updated_nfz
 
 
+@router.get("/admin/nfz/{zone_id}/impact", response_model=schemas.NFZImpactReport)
+def get_nfz_impact(
+    zone_id: int,
+    db: Session = Depends(deps.get_db),
+    current_admin: models.User = Depends(deps.get_current_authority_admin),
+) -> Any:
+    """
+    Pending, approved and active flights whose route enters the zone, plus live
+    drones currently inside it (Authority Admin only). Works for inactive zones
+    too, to preview a zone before activating it.
+    """
+    db_nfz = crud.restricted_zone.get(db, id=zone_id)
+    if not db_nfz:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No-Fly Zone not found")
+    return nfz_impact_service.analyze(db, db_nfz)
+
+
 @router.delete("/admin/nfz/{zone_id}", response_model=schemas.RestrictedZoneRead, status_code=status.HTTP_200_OK)
 def delete_nfz(
     zone_id: int,
@@ -128,6 +177,7 @@ def delete_nfz(
         db.add(deleted_nfz)
         db.commit()
         db.refresh(deleted_nfz)
+    nfz_service.invalidate_zones()
         
     return deleted_nfz
 
@@ -135,7 +185,7 @@ def delete_nfz(
 # --- Public/Authenticated Read Endpoint for NFZ map display ---
 @router.get("/nfz/", response_model=List[schemas.RestrictedZoneRead])
 def list_active_nfzs_for_map(
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     # No specific authentication for this, public or any authenticated user
     # current_user: models.User = Depends(deps.get_current_active_user), # If auth required
 ) -> Any:
@@ -143,4 +193,45 @@ def list_active_nfzs_for_map(
     List active No-Fly Zones for map display (Public or Authenticated).
     """
     active_nfzs = crud.restricted_zone.get_all_active_zones(db)
-    return active_nfzs
\ No newline at end of file
+    return active_nfzs
+
+
+def _map_response(request: Request, body: bytes, etag: str) -> Response:
+    # Clients always revalidate; an unchanged map costs a 304 with no body
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/geo+json", headers=headers)
+
+
+@router.get("/nfz/map.geojson", response_class=Response)
+def get_nfz_map_geojson(
+    request: Request,
+    db: Session = Depends(deps.get_read_db),
+) -> Any:
+    """
+    All active No-Fly Zones as one pre-rendered GeoJSON FeatureCollection
+    (circles as polygons), served from memory with a strong ETag.
+    """
+    body, etag = nfz_map_service.geojson(db)
+    return _map_response(request, body, etag)
+
+
+@router.get("/nfz/tiles/{z}/{x}/{y}.geojson", response_class=Response)
+def get_nfz_map_tile(
+    request: Request,
+    z: int = Path(..., ge=0),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+    db: Session = Depends(deps.get_read_db),
+) -> Any:
+    """
+    Active No-Fly Zones in one Web Mercator z/x/y tile, simplified for the zoom
+    level and clipped to the tile, as GeoJSON. Cached per tile with a strong ETag.
+    """
+    try:
+        body, etag = nfz_map_service.tile(db, z, x, y)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return _map_response(request, body, etag)
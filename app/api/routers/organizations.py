@@ -24,7 +24,7 @@ class PilotDroneResponse(BaseModel):
     summary="List pilots in your org + their assigned drones"
 )
 def list_my_org_user_drones(
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     current_admin: models.User = Depends(deps.get_current_organization_admin),
 ) -> Any:
     """
@@ -223,7 +223,7 @@ def delete_organization(
 @router.get("/{organization_id}/users", response_model=List[schemas.UserRead])
 def list_organization_users(
     organization_id: int,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=200),
     current_user: models.User = Depends(deps.get_current_active_user),
@@ -257,7 +257,7 @@ def list_organization_users(
 @router.get("/{organization_id}/drones", response_model=List[schemas.DroneRead])
 def list_organization_drones(
     organization_id: int,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=200),
     current_user: models.User = Depends(deps.get_current_active_user),
@@ -1,10 +1,16 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query, HTTPException, status
-from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from typing import Any, Dict, Optional, Union
+
+import orjson
 
 from app.services.telemetry_service import connection_manager
+from app.services.telemetry_ingest_service import telemetry_ingest_service
+from app.services.telemetry_replay_service import telemetry_replay_service
 from app.core.security import decode_token
 from app.crud import user as crud_user # Renamed to avoid conflict
-from app.db.session import get_db # For token validation if needed
+from app.db.session import get_db, SessionLocal # For token validation if needed
+from app.models.user import User, UserRole
 from sqlalchemy.orm import Session
 from app.core.config import settings
 
@@ -84,4 +90,91 @@ async def websocket_telemetry_endpoint(
         try:
             await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
         except RuntimeError: # Already closed
-            pass
\ No newline at end of file
+            pass
+
+
+def _token_user(token: Optional[str]) -> Optional[User]:
+    user_id_str = decode_token(token) if token else None
+    if not user_id_str:
+        return None
+    with SessionLocal() as db:
+        try:
+            user = crud_user.get(db, id=int(user_id_str))
+        except ValueError:
+            return None
+        return user if user and crud_user.is_active(user) else None
+
+
+def _ingest_uplink_message(user: User, data: Union[str, bytes, None]) -> Dict[str, Any]:
+    with SessionLocal() as db:
+        try:
+            return telemetry_ingest_service.ingest(db, user, orjson.loads(data or b""))
+        except orjson.JSONDecodeError:
+            return {"accepted": 0, "late": 0, "duplicates": 0, "rejected": [], "error": "Message is not valid JSON."}
+        except ValueError as e:
+            return {"accepted": 0, "late": 0, "duplicates": 0, "rejected": [], "error": str(e)}
+
+
+@router.websocket(settings.WS_TELEMETRY_UPLINK_PATH)
+async def websocket_telemetry_uplink(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None),
+):
+    """
+    Persistent uplink for drones and ground stations (token required). Each
+    text or binary message is one JSON batch, in the same format as
+    POST /telemetry/ingest, and is acknowledged with the same result plus an
+    "error" key when the whole message was rejected.
+    """
+    user = await run_in_threadpool(_token_user, token)
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid or expired token")
+        return
+
+    await websocket.accept()
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            ack = await run_in_threadpool(_ingest_uplink_message, user, message.get("bytes") or message.get("text"))
+            await websocket.send_text(orjson.dumps(ack).decode())
+    except WebSocketDisconnect:
+        pass
+    print(f"Telemetry uplink for user {user.id} closed.")
+
+
+@router.websocket(settings.WS_TELEMETRY_REPLAY_PATH)
+async def websocket_telemetry_replay(
+    websocket: WebSocket,
+    replay_id: str,
+    token: Optional[str] = Query(None),
+):
+    """
+    Frames of one replay started with POST /telemetry/replays (token required:
+    whoever started it, or an Authority Admin). Playback waits for the first
+    connection; the socket is closed with 1000 when the replay ends, and the
+    replay stops once every viewer has left.
+    """
+    user = await run_in_threadpool(_token_user, token)
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid or expired token")
+        return
+    replay = telemetry_replay_service.get(replay_id)
+    if replay is None or replay.state != "RUNNING" or (
+        user.role != UserRole.AUTHORITY_ADMIN and replay.user_id != user.id
+    ):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Replay not found")
+        return
+
+    await websocket.accept()
+    telemetry_replay_service.subscribe(replay, websocket)
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+    except (WebSocketDisconnect, RuntimeError): # Closed by the server when the replay ended
+        pass
+    finally:
+        telemetry_replay_service.unsubscribe(replay, websocket)
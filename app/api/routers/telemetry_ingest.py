@@ -0,0 +1,120 @@
+from datetime import datetime
+from typing import Any, List, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.api import deps
+from app.models.user import UserRole
+from app.services.telemetry_export_service import MEDIA_TYPES, telemetry_export_service
+from app.services.telemetry_ingest_service import telemetry_ingest_service
+from app.services.telemetry_replay_service import telemetry_replay_service
+
+router = APIRouter()
+
+
+@router.post("/ingest", response_model=schemas.TelemetryIngestResult)
+async def ingest_telemetry(
+    request: Request,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Batch of telemetry points from drones or ground stations: a JSON array (or
+    {"points": [...]}) of {drone_id, timestamp, latitude, longitude, altitude_m,
+    speed_mps?, heading_degrees?, flight_plan_id?, status_message?}.
+    Callers may report for the drones they can view. Invalid points are
+    rejected individually; the rest are stored.
+    """
+    try:
+        payload = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body is not valid JSON.")
+    try:
+        return await run_in_threadpool(telemetry_ingest_service.ingest, db, current_user, payload)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/export")
+def export_telemetry(
+    start: datetime = Query(..., description="Inclusive start of the time range"),
+    end: datetime = Query(..., description="Exclusive end of the time range"),
+    format: str = Query("parquet", pattern="^(parquet|arrow)$"),
+    organization_id: Optional[int] = Query(None),
+    drone_ids: Optional[List[int]] = Query(None, alias="drone_id"),
+    current_admin: models.User = Depends(deps.get_current_authority_admin),
+) -> Any:
+    """
+    Telemetry for a time range (optionally one organization's drones or a set
+    of drones) as a Parquet file or an Arrow IPC stream, streamed in chunks
+    from the read replica. For analytics tools; use the CLI for large ranges.
+    """
+    if not telemetry_export_service.available():
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Telemetry export requires pyarrow.")
+    try:
+        start, end = telemetry_export_service.validate(start=start, end=end, fmt=format)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    filename = f"telemetry_{start:%Y%m%dT%H%M%S}_{end:%Y%m%dT%H%M%S}.{format}"
+    return StreamingResponse(
+        telemetry_export_service.stream(
+            start=start, end=end, fmt=format, organization_id=organization_id, drone_ids=drone_ids,
+        ),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/replays", response_model=schemas.TelemetryReplayRead, status_code=status.HTTP_202_ACCEPTED)
+async def start_telemetry_replay(
+    replay_in: schemas.TelemetryReplayCreate,
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    current_user: models.User = Depends(deps.get_current_active_user_async), # Auth Admin, submitter, relevant Org Admin
+) -> Any:
+    """
+    Replay a recorded flight at `speed` times its recorded pace. Connect to
+    /ws/telemetry/replays/{id} with the returned id to receive it (playback
+    starts then); messages are LiveTelemetryMessage with replay_id set.
+    """
+    db_flight_plan = await crud.flight_plan.get_async(db, id=replay_in.flight_plan_id)
+    if not db_flight_plan:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Flight plan not found")
+    can_view = current_user.role == UserRole.AUTHORITY_ADMIN or current_user.id == db_flight_plan.user_id or (
+        current_user.role == UserRole.ORGANIZATION_ADMIN and db_flight_plan.organization_id == current_user.organization_id
+    )
+    if not can_view:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to replay this flight")
+    try:
+        return telemetry_replay_service.start(
+            flight_plan_id=db_flight_plan.id, user_id=current_user.id, speed=replay_in.speed,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/replays", response_model=List[schemas.TelemetryReplayRead])
+async def list_telemetry_replays(
+    current_user: models.User = Depends(deps.get_current_active_user_async),
+) -> Any:
+    """Recent replays: all of them for Authority Admins, otherwise the caller's own."""
+    replays = telemetry_replay_service.replays()
+    if current_user.role != UserRole.AUTHORITY_ADMIN:
+        replays = [replay for replay in replays if replay.user_id == current_user.id]
+    return replays
+
+
+@router.delete("/replays/{replay_id}", response_model=schemas.TelemetryReplayRead)
+async def stop_telemetry_replay(
+    replay_id: str,
+    current_user: models.User = Depends(deps.get_current_active_user_async),
+) -> Any:
+    replay = telemetry_replay_service.get(replay_id)
+    if replay is None or (current_user.role != UserRole.AUTHORITY_ADMIN and replay.user_id != current_user.id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Replay not found")
+    return telemetry_replay_service.stop(replay_id)
@@ -3,14 +3,13 @@ import asyncio
 from app.crud import telemetry_log as crud_telemetry_log
 from app.models.drone import DroneOwnerType # For Remote ID
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models, schemas
 from app.api import deps
 from app.models.user import UserRole
 from app.models.flight_plan import FlightPlanStatus
 from app.crud import flight_plan as crud_flight_plan
-from app.crud import drone as crud_drone # For Remote ID
 
 router = APIRouter()
 
@@ -44,11 +43,11 @@ async def get_weather_info(
 
 @router.get("/remoteid/active-flights", response_model=List[schemas.RemoteIdBroadcast])
 async def get_active_flights_remote_id(
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_read_db),
     # Authorization: Public or AUTHORITY_ADMIN as per spec
     # For now, let's make it require Authority Admin to align with potential sensitivity
     # If public, remove current_user dependency or use an optional one.
-    current_user: Optional[models.User] = Depends(deps.get_current_active_user), # Make it optional for public access
+    current_user: Optional[models.User] = Depends(deps.get_current_active_user_async), # Make it optional for public access
 ) -> Any:
     """
     Get a list of currently active flights with their emulated Remote ID data.
@@ -63,17 +62,21 @@ async def get_active_flights_remote_id(
     # If public access is not desired without any auth, make current_user non-optional.
 
 
-    # 1. Get all active flight plans
-    active_flight_plans = crud_flight_plan.get_all_flight_plans_admin(
+    # 1. Get all active flight plans (drone eager-loaded for the serial number)
+    active_flight_plans = await crud_flight_plan.get_all_flight_plans_admin_async(
         db, status=FlightPlanStatus.ACTIVE, limit=1000 # Get all active
     )
 
+    # 2. Latest telemetry for every active drone in one query
+    latest_by_drone = await crud_telemetry_log.get_latest_logs_for_drones_async(
+        db, drone_ids=[fp.drone_id for fp in active_flight_plans]
+    )
+
     remote_id_broadcasts: List[schemas.RemoteIdBroadcast] = []
 
     for fp in active_flight_plans:
-        # 2. For each active flight, get its latest telemetry
-        latest_telemetry = crud_telemetry_log.get_latest_log_for_drone(db, drone_id=fp.drone_id)
-        db_drone = crud_drone.get(db, id=fp.drone_id) # Get drone for serial number
+        latest_telemetry = latest_by_drone.get(fp.drone_id)
+        db_drone = fp.drone
 
         if latest_telemetry and db_drone:
             operator_id = None
@@ -94,5 +97,3 @@ async def get_active_flights_remote_id(
             remote_id_broadcasts.append(broadcast)
             
     return remote_id_broadcasts
-
-# Need to import asyncio for the weather endpoint
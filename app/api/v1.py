@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.routers import auth, users, organizations, drones, flights, nfz, utility
+from app.api.routers import auth, users, organizations, drones, flights, nfz, utility, metrics, telemetry_ingest
 # Telemetry router (for WebSocket) is usually added in main.py directly to the app.
 # If telemetry.py also had HTTP routes, it would be included here.
 
@@ -12,9 +12,13 @@ api_router.include_router(users.router, prefix="/users", tags=["Users"])
 api_router.include_router(organizations.router, prefix="/organizations", tags=["Organizations"])
 api_router.include_router(drones.router, prefix="/drones", tags=["Drones"])
 api_router.include_router(flights.router, prefix="/flights", tags=["Flight Plans"])
+api_router.include_router(telemetry_ingest.router, prefix="/telemetry", tags=["Telemetry"])
 
 # The nfz.py router contains routes starting with /admin/nfz and /nfz, so no prefix needed here.
 api_router.include_router(nfz.router, tags=["No-Fly Zones (NFZ)"])
 
 # The utility.py router contains routes like /weather and /remoteid/active-flights, so no prefix needed here.
-api_router.include_router(utility.router, tags=["Utilities"])
\ No newline at end of file
+api_router.include_router(utility.router, tags=["Utilities"])
+
+# Operational metrics (DB pool, ...)
+api_router.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
\ No newline at end of file
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Export telemetry for a time range to a Parquet file or Arrow IPC stream.
+
+Reads from the read replica (DATABASE_REPLICA_URL) when one is configured, in
+bounded chunks, so long ranges can be exported without touching the API
+workers.
+
+Run with: python -m app.cli.export_telemetry --start 2025-06-01T00:00:00Z --end 2025-06-02T00:00:00Z
+          [--organization-id N] [--drone-id N ...] [--format parquet|arrow] [--output PATH]
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timezone
+
+from app.services.telemetry_export_service import EXPORT_FORMATS, telemetry_export_service
+
+
+def _datetime(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export telemetry_logs to Parquet / Arrow IPC.")
+    parser.add_argument("--start", type=_datetime, required=True, help="inclusive, ISO 8601 (naive means UTC)")
+    parser.add_argument("--end", type=_datetime, required=True, help="exclusive, ISO 8601 (naive means UTC)")
+    parser.add_argument("--organization-id", type=int)
+    parser.add_argument("--drone-id", type=int, action="append", dest="drone_ids", help="repeat for several drones")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="parquet")
+    parser.add_argument("--output", help="file path (default: telemetry_<start>_<end>.<format>)")
+    args = parser.parse_args()
+
+    if not telemetry_export_service.available():
+        sys.exit("Telemetry export requires pyarrow.")
+    try:
+        telemetry_export_service.validate(start=args.start, end=args.end, fmt=args.format)
+    except ValueError as e:
+        sys.exit(str(e))
+    output = args.output or f"telemetry_{args.start:%Y%m%dT%H%M%S}_{args.end:%Y%m%dT%H%M%S}.{args.format}"
+
+    started = time.perf_counter()
+    with open(output, "wb") as out:
+        written = telemetry_export_service.export_to(
+            out, start=args.start, end=args.end, fmt=args.format,
+            organization_id=args.organization_id, drone_ids=args.drone_ids,
+        )
+    print(f"Wrote {written / 1e6:.1f} MB to {output} in {time.perf_counter() - started:.1f}s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Fleet load generator for the telemetry stack.
+
+Synthesizes N drones flying between random waypoints over a region and pushes
+their positions to a running API at a target rate, through POST
+/telemetry/ingest or the WebSocket uplink. A subscriber on the telemetry
+WebSocket measures end-to-end latency (point timestamp to broadcast, so run it
+on a host with a synced clock). Reports achieved throughput, ingest ack and
+end-to-end latency percentiles, and error counts.
+
+Drones: --drone-ids (any role allowed to report for them, e.g. an Authority
+Admin), or --provision to reuse / register drones named <serial-prefix>N as a
+Solo Pilot or Organization Admin.
+
+Run with: python -m app.cli.fleet_loadgen --base-url http://localhost:8000 --email pilot@example.com
+          --password ... --provision --drones 200 --rate 1 --duration 60 [--transport http|ws]
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+import httpx
+import orjson
+import websockets
+
+EARTH_M_PER_DEG = 111_320.0
+
+
+class SimDrone:
+    """A drone flying straight legs between random waypoints inside the region at a fixed cruise speed."""
+
+    def __init__(self, drone_id: int, region: Tuple[float, float, float, float], rng: random.Random):
+        self.drone_id = drone_id
+        self.region = region
+        self.rng = rng
+        self.lat, self.lon = self._random_point()
+        self.alt = rng.uniform(40, 120)
+        self.speed = rng.uniform(8, 20)
+        self._target = self._random_point()
+
+    def _random_point(self) -> Tuple[float, float]:
+        min_lat, min_lon, max_lat, max_lon = self.region
+        return self.rng.uniform(min_lat, max_lat), self.rng.uniform(min_lon, max_lon)
+
+    def step(self, seconds: float) -> Dict[str, float]:
+        dy = (self._target[0] - self.lat) * EARTH_M_PER_DEG
+        dx = (self._target[1] - self.lon) * EARTH_M_PER_DEG * math.cos(math.radians(self.lat))
+        distance, travel = math.hypot(dx, dy), self.speed * seconds
+        heading = math.degrees(math.atan2(dx, dy)) % 360
+        if distance <= travel:
+            self.lat, self.lon = self._target
+            self._target = self._random_point()
+        else:
+            self.lat += dy / distance * travel / EARTH_M_PER_DEG
+            self.lon += dx / distance * travel / (EARTH_M_PER_DEG * math.cos(math.radians(self.lat)))
+        return {
+            "drone_id": self.drone_id,
+            "latitude": round(self.lat, 7),
+            "longitude": round(self.lon, 7),
+            "altitude_m": round(self.alt + self.rng.gauss(0, 0.5), 2),
+            "speed_mps": round(self.speed, 2),
+            "heading_degrees": round(heading, 1),
+        }
+
+
+class Stats:
+    def __init__(self):
+        self.sent = self.accepted = self.late = self.duplicates = self.rejected = 0
+        self.requests = self.errors = 0
+        self.elapsed = 0.0
+        self.behind_schedule = 0 # Batches sent late because the previous one was still in flight
+        self.ack_ms: List[float] = []
+        self.e2e_ms: List[float] = []
+        self.error_samples: List[str] = []
+
+    def error(self, detail: str) -> None:
+        self.errors += 1
+        if len(self.error_samples) < 5:
+            self.error_samples.append(detail[:200])
+
+
+def percentiles(values: List[float]) -> str:
+    if not values:
+        return "n/a"
+    ordered = sorted(values)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return f"p50 {pick(0.5):.1f} ms, p95 {pick(0.95):.1f} ms, p99 {pick(0.99):.1f} ms, max {ordered[-1]:.1f} ms"
+
+
+def parse_ids(value: str) -> List[int]:
+    ids = []
+    for part in value.split(","):
+        low, _, high = part.partition("-")
+        ids.extend(range(int(low), int(high or low) + 1))
+    return ids
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    response = await client.post("/auth/login/access-token", data={"username": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def provision(client: httpx.AsyncClient, count: int, prefix: str) -> List[int]:
+    """Ids of `count` drones named <prefix>0.. of the caller, registering the missing ones."""
+    existing: Dict[str, int] = {}
+    while True:
+        response = await client.get("/drones/my", params={"skip": len(existing), "limit": 200})
+        response.raise_for_status()
+        page = response.json()
+        existing.update((drone["serial_number"], drone["id"]) for drone in page)
+        if len(page) < 200:
+            break
+    ids = []
+    for i in range(count):
+        serial = f"{prefix}{i}"
+        if serial not in existing:
+            created = await client.post("/drones/", json={"brand": "LoadGen", "model": "Sim", "serial_number": serial})
+            created.raise_for_status()
+            existing[serial] = created.json()["id"]
+        ids.append(existing[serial])
+    return ids
+
+
+def record_ack(stats: Stats, result: Dict, started: float) -> None:
+    stats.ack_ms.append((time.perf_counter() - started) * 1000)
+    if result.get("error"):
+        stats.error(result["error"])
+        return
+    stats.accepted += result.get("accepted", 0)
+    stats.late += result.get("late", 0)
+    stats.duplicates += result.get("duplicates", 0)
+    stats.rejected += len(result.get("rejected", []))
+    if result.get("rejected"):
+        stats.error(f"rejected: {result['rejected'][0]['detail']}")
+
+
+async def sender(args, drones: List[SimDrone], stats: Stats, client: httpx.AsyncClient, ws_url: str, stop_at: float) -> None:
+    """One connection: every interval, the new points of its drones as one batch."""
+    points_per_batch = max(1, round(args.rate * args.interval))
+    step = args.interval / points_per_batch
+    uplink = await websockets.connect(ws_url, max_size=None) if args.transport == "ws" else None
+    try:
+        next_at = time.perf_counter() + random.uniform(0, args.interval) # Spread the connections over an interval
+        while next_at < stop_at:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                stats.behind_schedule += 1
+            now = time.time()
+            batch = []
+            for i in range(points_per_batch):
+                at = now - (points_per_batch - 1 - i) * step
+                for drone in drones:
+                    point = drone.step(step)
+                    point["timestamp"] = datetime.fromtimestamp(at, tz=timezone.utc).isoformat()
+                    batch.append(point)
+            started = time.perf_counter()
+            stats.sent += len(batch)
+            stats.requests += 1
+            try:
+                if uplink is not None:
+                    await uplink.send(orjson.dumps(batch))
+                    record_ack(stats, orjson.loads(await uplink.recv()), started)
+                else:
+                    response = await client.post("/telemetry/ingest", content=orjson.dumps(batch))
+                    if response.status_code != 200:
+                        stats.ack_ms.append((time.perf_counter() - started) * 1000)
+                        stats.error(f"HTTP {response.status_code}: {response.text}")
+                    else:
+                        record_ack(stats, response.json(), started)
+            except (httpx.HTTPError, websockets.WebSocketException, OSError) as e:
+                stats.error(f"{type(e).__name__}: {e}")
+            next_at += args.interval
+    finally:
+        if uplink is not None:
+            await uplink.close()
+
+
+async def subscriber(ws_url: str, drone_ids: set, stats: Stats, ready: asyncio.Event) -> None:
+    """End-to-end latency: broadcast receive time minus the point's timestamp."""
+    try:
+        async with websockets.connect(ws_url, max_size=None) as ws:
+            ready.set()
+            async for message in ws:
+                received = time.time()
+                data = orjson.loads(message)
+                if data.get("drone_id") in drone_ids and "lat" in data and not data.get("replay_id"):
+                    stats.e2e_ms.append((received - datetime.fromisoformat(data["timestamp"].replace("Z", "+00:00")).timestamp()) * 1000)
+    except (websockets.WebSocketException, OSError) as e:
+        stats.error(f"subscriber: {e}")
+        ready.set()
+
+
+async def run(args) -> Stats:
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    api_url = args.base_url.rstrip("/") + args.api_prefix # Request paths are relative to the API prefix
+    async with httpx.AsyncClient(base_url=api_url, headers=headers, timeout=30.0, limits=limits) as client:
+        if not args.token:
+            args.token = await login(client, args.email, args.password)
+            client.headers["Authorization"] = f"Bearer {args.token}"
+        drone_ids = parse_ids(args.drone_ids) if args.drone_ids else await provision(client, args.drones, args.serial_prefix)
+        rng = random.Random(args.seed)
+        region = tuple(float(v) for v in args.region.split(","))
+        drones = [SimDrone(drone_id, region, rng) for drone_id in drone_ids]
+        batch_size = math.ceil(len(drones) / args.connections) * max(1, round(args.rate * args.interval))
+        if batch_size > args.max_batch:
+            sys.exit(f"Batches of {batch_size} points exceed --max-batch ({args.max_batch}); add --connections or lower --interval.")
+        print(f"{len(drones)} drones, {len(drones) * args.rate:,.0f} points/s target over {args.connections} {args.transport} connections")
+
+        ws_base = args.base_url.rstrip("/").replace("http", "ws", 1)
+        stats = Stats()
+        ready = asyncio.Event()
+        watch = asyncio.create_task(subscriber(f"{ws_base}{args.ws_path}?token={args.token}", set(drone_ids), stats, ready))
+        await ready.wait()
+
+        started = time.perf_counter()
+        stop_at = started + args.duration
+        groups = [drones[i::args.connections] for i in range(min(args.connections, len(drones)))]
+        uplink_url = f"{ws_base}{args.uplink_path}?token={args.token}"
+        senders = [asyncio.create_task(sender(args, group, stats, client, uplink_url, stop_at)) for group in groups]
+        while not all(task.done() for task in senders):
+            await asyncio.sleep(min(args.report_every, max(0.1, stop_at - time.perf_counter())))
+            elapsed = time.perf_counter() - started
+            print(f"[{elapsed:6.1f}s] sent {stats.sent:,} ({stats.sent / elapsed:,.0f}/s), accepted {stats.accepted:,}, "
+                  f"errors {stats.errors}, broadcasts {len(stats.e2e_ms):,}")
+        for task in senders:
+            task.result() # Surface crashes
+        stats.elapsed = time.perf_counter() - started
+        await asyncio.sleep(1.0) # Last broadcasts
+        watch.cancel()
+        return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Synthetic fleet traffic against the telemetry ingest and WebSocket paths.")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    # Server layout; defaults match the server's settings, which this tool does not load (no server secrets needed)
+    parser.add_argument("--api-prefix", default="/api/v1", help="the server's API_V1_STR")
+    parser.add_argument("--ws-path", default="/ws/telemetry", help="the server's WS_TELEMETRY_PATH")
+    parser.add_argument("--uplink-path", default="/ws/telemetry/uplink", help="the server's WS_TELEMETRY_UPLINK_PATH")
+    parser.add_argument("--max-batch", type=int, default=5000, help="the server's TELEMETRY_INGEST_MAX_BATCH")
+    parser.add_argument("--token", help="bearer token (or --email / --password)")
+    parser.add_argument("--email")
+    parser.add_argument("--password")
+    parser.add_argument("--drone-ids", help="e.g. 1-100,205")
+    parser.add_argument("--provision", action="store_true", help="reuse / register drones named <serial-prefix>N")
+    parser.add_argument("--drones", type=int, default=100, help="with --provision")
+    parser.add_argument("--serial-prefix", default="LOADGEN-")
+    parser.add_argument("--rate", type=float, default=1.0, help="points per drone per second")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between batches of one connection")
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--transport", choices=("http", "ws"), default="http")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds")
+    parser.add_argument("--region", default="43.15,76.80,43.30,77.05", help="min_lat,min_lon,max_lat,max_lon")
+    parser.add_argument("--report-every", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    if not args.token and not (args.email and args.password):
+        sys.exit("Pass --token or --email and --password.")
+    if not args.drone_ids and not args.provision:
+        sys.exit("Pass --drone-ids or --provision.")
+
+    stats = asyncio.run(run(args))
+    print()
+    print(f"duration     : {stats.elapsed:.1f} s, {stats.requests:,} batches ({stats.behind_schedule} behind schedule)")
+    print(f"points       : sent {stats.sent:,}, accepted {stats.accepted:,} (late {stats.late}, duplicates {stats.duplicates}), rejected {stats.rejected}")
+    print(f"throughput   : {stats.accepted / stats.elapsed:,.0f} points/s accepted")
+    print(f"ingest ack   : {percentiles(stats.ack_ms)}")
+    print(f"end-to-end   : {percentiles(stats.e2e_ms)} over {len(stats.e2e_ms):,} broadcasts")
+    print(f"errors       : {stats.errors}")
+    for sample in stats.error_samples:
+        print(f"  {sample}")
+    sys.exit(1 if stats.errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,97 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     DATABASE_URL: str  # This should come directly from .env
 
+    # Connection pool (server databases only; SQLite keeps SQLAlchemy's defaults)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 30
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0 # How long a request waits for a free connection
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_STATEMENT_TIMEOUT_MS: Optional[int] = None # Postgres statement_timeout; None keeps the server default
+    DB_QUERY_CACHE_SIZE: int = 1200 # SQLAlchemy compiled-statement cache entries per engine
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 256 # asyncpg server-side prepared statements per connection; 0 disables
+
+    # Read replica for heavy list endpoints; unset means everything reads from DATABASE_URL
+    DATABASE_REPLICA_URL: Optional[str] = None
+    READ_YOUR_WRITES_WINDOW_SECONDS: float = 5.0 # After a user's own write, their reads stay on the primary
+
+    # Strategic deconfliction of submitted plans against APPROVED/ACTIVE 4D volumes
+    DECONFLICTION_ENABLED: bool = True
+    DECONFLICTION_HORIZONTAL_SEPARATION_M: float = 100.0
+    DECONFLICTION_VERTICAL_SEPARATION_M: float = 30.0
+    DECONFLICTION_TIME_BUFFER_SECONDS: float = 120.0 # Schedule slack added on both sides of every leg
+    DECONFLICTION_GRID_CELL_DEG: float = 0.02 # ~2 km index cells
+    DECONFLICTION_TIME_BUCKET_SECONDS: float = 900.0
+    DECONFLICTION_INDEX_REFRESH_SECONDS: Optional[int] = None # Rebuild from the DB periodically (multi-worker deployments)
+
+    # Tactical conflict detection between live drones
+    TACTICAL_TICK_SECONDS: float = 1.0
+    TACTICAL_HORIZONTAL_SEPARATION_M: float = 50.0
+    TACTICAL_VERTICAL_SEPARATION_M: float = 15.0
+    TACTICAL_LOOKAHEAD_SECONDS: float = 30.0 # Closest-point-of-approach horizon
+    TACTICAL_STALE_AFTER_SECONDS: float = 10.0 # Drop drones that stopped reporting
+    TACTICAL_MAX_SPEED_MPS: float = 40.0 # Grid cells are sized for this; faster drones are checked against all drones
+
+    # Conformance monitoring of ACTIVE flights against their approved route
+    CONFORMANCE_LATERAL_TOLERANCE_M: float = 50.0
+    CONFORMANCE_VERTICAL_TOLERANCE_M: float = 20.0
+    CONFORMANCE_SCHEDULE_TOLERANCE_SECONDS: Optional[float] = 300.0 # None disables schedule checks
+
+    # NFZ activation windows / recurring schedules
+    NFZ_SCHEDULE_BUCKET_SECONDS: float = 3600.0
+    NFZ_SCHEDULE_HORIZON_DAYS: int = 14 # Expanded ahead of time; later windows are evaluated directly
+    NFZ_SCHEDULE_REFRESH_SECONDS: Optional[int] = None # Rebuild from the DB periodically (multi-worker deployments)
+
+    # NFZ geometry normalization at ingest
+    NFZ_MAX_POLYGON_VERTICES: int = 500 # Larger rings are simplified down to this budget
+    NFZ_MAX_RADIUS_M: float = 100_000.0
+
+    # NFZ map (pre-rendered GeoJSON and per-zoom tiles)
+    NFZ_MAP_CIRCLE_SEGMENTS: int = 64 # Circles are rendered as polygons
+    NFZ_MAP_SIMPLIFY_PIXELS: float = 0.5 # Douglas-Peucker tolerance in 256 px tile pixels
+    NFZ_MAP_TILE_CACHE_SIZE: int = 4096
+    NFZ_MAP_MAX_AGE_SECONDS: float = 60.0 # Served from the replica: reloaded at least this often in case a read lagged a write
+
+    # Telemetry ingest from physical drones and ground stations
+    TELEMETRY_INGEST_MAX_BATCH: int = 5000 # Points per HTTP request / WebSocket message
+    TELEMETRY_INGEST_MAX_FUTURE_SECONDS: float = 300.0 # Points stamped further ahead of the server clock are rejected
+
+    # Local write-ahead spool for telemetry (memory-mapped segments drained into telemetry_logs)
+    TELEMETRY_SPOOL_ENABLED: bool = True
+    TELEMETRY_SPOOL_DIR: str = "var/telemetry_spool" # Each worker process claims its own slot-N subdirectory
+    TELEMETRY_SPOOL_SLOTS: int = 64
+    TELEMETRY_SPOOL_SEGMENT_BYTES: int = 16 * 1024 * 1024
+    TELEMETRY_SPOOL_MAX_BYTES: int = 1024 * 1024 * 1024 # When full, telemetry is written straight to the database
+    TELEMETRY_SPOOL_FSYNC: bool = False # msync after every append (survives power loss, not only process crashes)
+    TELEMETRY_SPOOL_DRAIN_BATCH: int = 5000 # Points per bulk load
+    TELEMETRY_SPOOL_DRAIN_INTERVAL_SECONDS: float = 0.2 # Idle poll; appends wake the drainer immediately
+    TELEMETRY_SPOOL_RETRY_SECONDS: float = 5.0 # Back-off after a failed drain (database down)
+    TELEMETRY_SPOOL_MAX_ATTEMPTS: int = 5 # Failed drains of the same chunk before it is retried row by row and bad rows dead-lettered
+
+    # Compressed archive of finished flights' telemetry (moved out of telemetry_logs)
+    TELEMETRY_ARCHIVE_ENABLED: bool = True
+    TELEMETRY_ARCHIVE_DELAY_SECONDS: float = 600.0 # After a flight finishes; grace for late points
+    TELEMETRY_ARCHIVE_INTERVAL_SECONDS: float = 60.0
+    TELEMETRY_ARCHIVE_BATCH_FLIGHTS: int = 20 # Flights per sweep
+
+    # Replay of recorded flights to WebSocket clients
+    TELEMETRY_REPLAY_MAX_CONCURRENT: int = 100
+    TELEMETRY_REPLAY_MAX_SPEED: float = 1000.0 # Multiple of the recorded pace
+    TELEMETRY_REPLAY_WINDOW_ROWS: int = 2000 # Points buffered per replay; the connection is released between windows
+    TELEMETRY_REPLAY_SUBSCRIBE_TIMEOUT_SECONDS: float = 30.0 # A replay nobody connects to within this expires unplayed
+
+    # Columnar telemetry export (Parquet / Arrow IPC) for analytics
+    TELEMETRY_EXPORT_CHUNK_ROWS: int = 50000 # Rows per replica query; one Parquet row group / Arrow batch each
+
+    # Flight simulator (telemetry of ACTIVE flights started through the API)
+    SIMULATION_POINT_INTERVAL_SECONDS: float = 5.0 # One point per waypoint
+    SIMULATION_CHECKPOINT_INTERVAL_SECONDS: float = 30.0 # Progress saved at most this often (and at shutdown)
+    SIMULATION_RESUME_ON_STARTUP: bool = True # Pick up ACTIVE flights where a previous process left them
+    SIMULATION_LEASE_SECONDS: float = 60.0 # A process's claim on a flight's simulation; renewed while it flies, unclaimed flights rescanned this often
+
+    # Background services, started and stopped in order by the app lifespan (app/services/service_registry.py)
+    SERVICE_STOP_TIMEOUT_SECONDS: float = 30.0 # Per service; a telemetry writer still draining is left to the next start
+    SERVICE_DRAIN_GRACE_SECONDS: float = 10.0 # After SIGTERM, readiness reports draining this long before the server stops listening
+
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
@@ -32,6 +123,8 @@ class Settings(BaseSettings):
     
     # WebSocket
     WS_TELEMETRY_PATH: str = "/ws/telemetry"
+    WS_TELEMETRY_UPLINK_PATH: str = "/ws/telemetry/uplink" # Drones / ground stations pushing telemetry
+    WS_TELEMETRY_REPLAY_PATH: str = "/ws/telemetry/replays/{replay_id}" # One replay's frames, for whoever started it
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,191 @@
+import math
+from typing import Tuple
+
+EARTH_RADIUS_M = 6_371_000.0
+METERS_PER_DEG_LAT = math.pi * EARTH_RADIUS_M / 180.0
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in meters."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def meters_per_deg_lon(lat: float) -> float:
+    # Clamped so buffers near the poles stay finite
+    return max(METERS_PER_DEG_LAT * math.cos(math.radians(lat)), 1.0)
+
+
+def buffer_deg(lat: float, meters: float) -> Tuple[float, float]:
+    """(dlat, dlon) in degrees covering `meters` around latitude `lat`."""
+    return meters / METERS_PER_DEG_LAT, meters / meters_per_deg_lon(lat)
+
+
+class LocalProjection:
+    """
+    Equirectangular projection around a reference point, in meters.
+    Accurate to well under a meter over the few-kilometre extents used for
+    separation checks.
+    """
+
+    def __init__(self, ref_lat: float, ref_lon: float):
+        self.ref_lat = ref_lat
+        self.ref_lon = ref_lon
+        self._kx = meters_per_deg_lon(ref_lat)
+
+    def to_xy(self, lat: float, lon: float) -> Tuple[float, float]:
+        return (lon - self.ref_lon) * self._kx, (lat - self.ref_lat) * METERS_PER_DEG_LAT
+
+    def to_latlon(self, x: float, y: float) -> Tuple[float, float]:
+        return self.ref_lat + y / METERS_PER_DEG_LAT, self.ref_lon + x / self._kx
+
+
+def point_segment_distance(px: float, py: float, ax: float, ay: float, bx: float, by: float) -> float:
+    dx, dy = bx - ax, by - ay
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0.0:
+        return math.hypot(px - ax, py - ay)
+    t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length_sq))
+    return math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+
+def _orientation(ax: float, ay: float, bx: float, by: float, cx: float, cy: float) -> float:
+    return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+
+def segments_intersect(
+    ax: float, ay: float, bx: float, by: float, cx: float, cy: float, dx: float, dy: float
+) -> bool:
+    d1 = _orientation(cx, cy, dx, dy, ax, ay)
+    d2 = _orientation(cx, cy, dx, dy, bx, by)
+    d3 = _orientation(ax, ay, bx, by, cx, cy)
+    d4 = _orientation(ax, ay, bx, by, dx, dy)
+    return ((d1 > 0) != (d2 > 0)) and ((d3 > 0) != (d4 > 0)) and d1 != 0 and d2 != 0 and d3 != 0 and d4 != 0
+
+
+def segment_segment_distance(
+    ax: float, ay: float, bx: float, by: float, cx: float, cy: float, dx: float, dy: float
+) -> float:
+    """Minimum distance between segments AB and CD in the plane."""
+    if segments_intersect(ax, ay, bx, by, cx, cy, dx, dy):
+        return 0.0
+    return min(
+        point_segment_distance(ax, ay, cx, cy, dx, dy),
+        point_segment_distance(bx, by, cx, cy, dx, dy),
+        point_segment_distance(cx, cy, ax, ay, bx, by),
+        point_segment_distance(dx, dy, ax, ay, bx, by),
+    )
+
+
+def point_in_polygon(x: float, y: float, ring) -> bool:
+    """Even-odd rule; `ring` is a sequence of (x, y) vertices, closed or not."""
+    inside = False
+    n = len(ring)
+    for i in range(n):
+        (ax, ay), (bx, by) = ring[i], ring[(i + 1) % n]
+        if (ay > y) != (by > y) and x < ax + (y - ay) * (bx - ax) / (by - ay):
+            inside = not inside
+    return inside
+
+
+def polyline_polygon_distance(route, ring) -> float:
+    """
+    Minimum distance between a polyline and a polygon (0 when the line enters
+    it). Both are sequences of (x, y); a single-point route is a point.
+    """
+    if point_in_polygon(route[0][0], route[0][1], ring):
+        return 0.0
+    legs = list(zip(route, route[1:])) or [(route[0], route[0])]
+    edges = list(zip(ring, list(ring[1:]) + list(ring[:1])))
+    return min(
+        segment_segment_distance(ax, ay, bx, by, cx, cy, dx, dy)
+        for (ax, ay), (bx, by) in legs
+        for (cx, cy), (dx, dy) in edges
+    )
+
+
+def simplify_line(points, tolerance: float):
+    """
+    Douglas-Peucker simplification of a sequence of (x, y); endpoints are kept.
+    For a closed ring (first == last) the point farthest from the start is
+    kept as well, so the ring does not collapse.
+    """
+    n = len(points)
+    if n < 3 or tolerance <= 0:
+        return list(points)
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        (ax, ay), (bx, by) = points[first], points[last]
+        index, max_distance = -1, -1.0
+        for i in range(first + 1, last):
+            distance = point_segment_distance(points[i][0], points[i][1], ax, ay, bx, by)
+            if distance > max_distance:
+                index, max_distance = i, distance
+        if index != -1 and (max_distance > tolerance or (first == 0 and last == n - 1 and points[0] == points[-1])):
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [p for p, kept in zip(points, keep) if kept]
+
+
+def clip_polygon_to_box(ring, min_x: float, min_y: float, max_x: float, max_y: float):
+    """Sutherland-Hodgman clip of a polygon ring to an axis-aligned box; returns an open ring."""
+    def clip(points, inside, intersect):
+        result = []
+        for i, current in enumerate(points):
+            previous = points[i - 1]
+            if inside(current):
+                if not inside(previous):
+                    result.append(intersect(previous, current))
+                result.append(current)
+            elif inside(previous):
+                result.append(intersect(previous, current))
+        return result
+
+    def at_x(x):
+        return lambda p, q: (x, p[1] + (q[1] - p[1]) * (x - p[0]) / (q[0] - p[0]))
+
+    def at_y(y):
+        return lambda p, q: (p[0] + (q[0] - p[0]) * (y - p[1]) / (q[1] - p[1]), y)
+
+    points = list(ring[:-1]) if len(ring) > 1 and ring[0] == ring[-1] else list(ring)
+    for inside, intersect in (
+        (lambda p: p[0] >= min_x, at_x(min_x)),
+        (lambda p: p[0] <= max_x, at_x(max_x)),
+        (lambda p: p[1] >= min_y, at_y(min_y)),
+        (lambda p: p[1] <= max_y, at_y(max_y)),
+    ):
+        if not points:
+            break
+        points = clip(points, inside, intersect)
+    return points
+
+
+def ring_signed_area(ring) -> float:
+    """Shoelace area of a closed (x, y) ring; positive when counter-clockwise."""
+    return sum(ax * by - bx * ay for (ax, ay), (bx, by) in zip(ring, ring[1:])) / 2.0
+
+
+def ring_self_intersects(ring) -> bool:
+    """True if two non-adjacent edges of a closed ring cross."""
+    edges = list(zip(ring, ring[1:]))
+    n = len(edges)
+    for i in range(n):
+        (ax, ay), (bx, by) = edges[i]
+        e_min_x, e_max_x = min(ax, bx), max(ax, bx)
+        e_min_y, e_max_y = min(ay, by), max(ay, by)
+        for j in range(i + 2, n):
+            if i == 0 and j == n - 1: # First and last edges share the closing vertex
+                continue
+            (cx, cy), (dx, dy) = edges[j]
+            if max(cx, dx) < e_min_x or min(cx, dx) > e_max_x or max(cy, dy) < e_min_y or min(cy, dy) > e_max_y:
+                continue
+            if segments_intersect(ax, ay, bx, by, cx, cy, dx, dy):
+                return True
+    return False
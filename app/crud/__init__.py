@@ -3,6 +3,8 @@ from .crud_organization import organization
 from .crud_drone import drone, user_drone_assignment
 from .crud_flight_plan import flight_plan
 from .crud_telemetry_log import telemetry_log
+from .crud_telemetry_archive import telemetry_archive
+from .crud_simulation_checkpoint import simulation_checkpoint
 from .crud_restricted_zone import restricted_zone
 
 # Only import waypoint if the file is properly implemented
@@ -1,8 +1,11 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Generic, Hashable, List, Optional, Type, TypeVar, Union
 
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import bindparam, inspect as sa_inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 from sqlalchemy.sql import func # For count
 
 from app.db.base_class import Base
@@ -13,6 +16,13 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+@lru_cache(maxsize=None)
+def mapped_column_keys(model: Type[Base]) -> FrozenSet[str]:
+    """Column attribute names of a mapped class, introspected once per model."""
+    # Resolved lazily: the mapper can only be inspected once every model is imported.
+    return frozenset(attr.key for attr in sa_inspect(model).column_attrs)
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         """
@@ -24,12 +34,33 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         * `schema`: A Pydantic model (schema) class
         """
         self.model = model
+        self._statement_cache: Dict[Hashable, Select] = {}
 
-    def get(self, db: Session, id: Any, include_deleted: bool = False) -> Optional[ModelType]:
-        query = db.query(self.model)
+    def _select_active(self, include_deleted: bool = False) -> Select:
+        stmt = select(self.model)
         if not include_deleted and hasattr(self.model, "deleted_at"):
-            query = query.filter(self.model.deleted_at.is_(None))
-        return query.filter(self.model.id == id).first()
+            stmt = stmt.where(self.model.deleted_at.is_(None))
+        return stmt
+
+    def _cached_statement(self, key: Hashable, build: Callable[[], Select]) -> Select:
+        """
+        Build a hot lookup statement once per CRUD instance. Values are passed as
+        bindparam() parameters at execution, so the statement object (and its
+        memoized cache key) is reused and SQLAlchemy never recompiles it.
+        """
+        stmt = self._statement_cache.get(key)
+        if stmt is None:
+            stmt = self._statement_cache[key] = build()
+        return stmt
+
+    def _get_stmt(self, include_deleted: bool) -> Select:
+        return self._cached_statement(
+            ("get", include_deleted),
+            lambda: self._select_active(include_deleted).where(self.model.id == bindparam("id")).limit(1),
+        )
+
+    def get(self, db: Session, id: Any, include_deleted: bool = False) -> Optional[ModelType]:
+        return db.scalars(self._get_stmt(include_deleted), {"id": id}).first()
 
     def get_multi(
         self, db: Session, *, skip: int = 0, limit: int = 100, include_deleted: bool = False
@@ -57,8 +88,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         return query.scalar_one()
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
-        obj_in_data = jsonable_encoder(obj_in)
-        db_obj = self.model(**obj_in_data)  # type: ignore
+        db_obj = self.model(**obj_in.model_dump())  # type: ignore
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
@@ -71,14 +101,14 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
-        obj_data = jsonable_encoder(db_obj)
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
             update_data = obj_in.model_dump(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+        column_keys = mapped_column_keys(self.model)
+        for field, value in update_data.items():
+            if field in column_keys:
+                setattr(db_obj, field, value)
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
@@ -101,4 +131,78 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             return obj
         elif obj: # If no deleted_at, perform hard delete
             return self.remove(db, id=id)
-        return None
\ No newline at end of file
+        return None
+
+    # --- Async variants (AsyncSession) for endpoints migrated to `async def` ---
+
+    async def get_async(self, db: AsyncSession, id: Any, include_deleted: bool = False) -> Optional[ModelType]:
+        result = await db.scalars(self._get_stmt(include_deleted), {"id": id})
+        return result.first()
+
+    async def get_multi_async(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100, include_deleted: bool = False
+    ) -> List[ModelType]:
+        result = await db.execute(self._select_active(include_deleted).offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def get_multi_with_filter_async(
+        self, db: AsyncSession, *, filter_conditions: Optional[List] = None, skip: int = 0, limit: int = 100, include_deleted: bool = False
+    ) -> List[ModelType]:
+        stmt = self._select_active(include_deleted)
+        if filter_conditions:
+            stmt = stmt.where(*filter_conditions)
+        result = await db.execute(stmt.offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def get_count_async(self, db: AsyncSession, include_deleted: bool = False) -> int:
+        stmt = select(func.count(self.model.id))
+        if not include_deleted and hasattr(self.model, "deleted_at"):
+            stmt = stmt.where(self.model.deleted_at.is_(None))
+        result = await db.execute(stmt)
+        return result.scalar_one()
+
+    async def create_async(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        db_obj = self.model(**obj_in.model_dump())  # type: ignore
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def update_async(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        column_keys = mapped_column_keys(self.model)
+        for field, value in update_data.items():
+            if field in column_keys:
+                setattr(db_obj, field, value)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def remove_async(self, db: AsyncSession, *, id: Any) -> Optional[ModelType]:
+        obj = await db.get(self.model, id)
+        if obj:
+            await db.delete(obj)
+            await db.commit()
+        return obj
+
+    async def soft_remove_async(self, db: AsyncSession, *, id: Any) -> Optional[ModelType]:
+        obj = await db.get(self.model, id)
+        if obj and hasattr(self.model, "deleted_at"):
+            setattr(obj, "deleted_at", func.now())
+            db.add(obj)
+            await db.commit()
+            await db.refresh(obj)
+            return obj
+        elif obj: # If no deleted_at, perform hard delete
+            return await self.remove_async(db, id=id)
+        return None
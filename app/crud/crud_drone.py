@@ -1,18 +1,22 @@
-from typing import Optional, List, Any
+from datetime import datetime
+from typing import Optional, List, Any, Dict, Iterable
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_
+from sqlalchemy import and_, bindparam, or_, select, update
 
 from app.crud.base import CRUDBase
 from app.models.drone import Drone, DroneStatus
+from app.models.telemetry_log import TelemetryLog
+from app.models.user import User, UserRole
 from app.models.user_drone_assignment import UserDroneAssignment
 from app.schemas.drone import DroneCreate, DroneUpdate
 
 class CRUDDrone(CRUDBase[Drone, DroneCreate, DroneUpdate]):
     def get_by_serial_number(self, db: Session, *, serial_number: str, include_deleted: bool = False) -> Optional[Drone]:
-        query = db.query(Drone).filter(Drone.serial_number == serial_number)
-        if not include_deleted:
-            query = query.filter(Drone.deleted_at.is_(None))
-        return query.first()
+        stmt = self._cached_statement(
+            ("get_by_serial_number", include_deleted),
+            lambda: self._select_active(include_deleted).where(Drone.serial_number == bindparam("serial_number")).limit(1),
+        )
+        return db.scalars(stmt, {"serial_number": serial_number}).first()
 
     def get_multi_drones_for_user(
         self, 
@@ -71,16 +75,57 @@ class CRUDDrone(CRUDBase[Drone, DroneCreate, DroneUpdate]):
             
         return query.order_by(Drone.id).offset(skip).limit(limit).all()
 
+    def get_reportable_last_seen(self, db: Session, *, user: User, drone_ids: Iterable[int]) -> Dict[int, Optional[datetime]]:
+        """
+        drone_id -> last_seen_at for the drones among `drone_ids` that `user`
+        may report telemetry for (same rules as viewing a drone).
+        """
+        drone_ids = list(drone_ids)
+        if not drone_ids:
+            return {}
+        stmt = select(Drone.id, Drone.last_seen_at).where(Drone.id.in_(drone_ids), Drone.deleted_at.is_(None))
+        if user.role == UserRole.ORGANIZATION_ADMIN:
+            stmt = stmt.where(Drone.organization_id == user.organization_id)
+        elif user.role == UserRole.ORGANIZATION_PILOT:
+            stmt = stmt.join(UserDroneAssignment, UserDroneAssignment.drone_id == Drone.id)\
+                       .where(UserDroneAssignment.user_id == user.id, Drone.organization_id == user.organization_id)
+        elif user.role == UserRole.SOLO_PILOT:
+            stmt = stmt.where(Drone.solo_owner_user_id == user.id)
+        return dict(db.execute(stmt).all())
+
+    def update_last_seen_bulk(self, db: Session, *, latest: List[Dict[str, Any]]) -> None:
+        """
+        Staged only. `latest` rows are {"b_id", "b_seen"}: the drone's newest
+        point just written. last_telemetry_id is resolved from the
+        (drone_id, timestamp) index; a drone is never moved back to an older point.
+        """
+        if not latest:
+            return
+        table = Drone.__table__
+        log_id = select(TelemetryLog.id).where(
+            TelemetryLog.drone_id == bindparam("b_id"), TelemetryLog.timestamp == bindparam("b_seen")
+        ).order_by(TelemetryLog.id.desc()).limit(1).scalar_subquery()
+        db.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"), or_(table.c.last_seen_at.is_(None), table.c.last_seen_at <= bindparam("b_seen")))
+            .values(last_seen_at=bindparam("b_seen"), last_telemetry_id=log_id),
+            latest,
+        )
+
 drone = CRUDDrone(Drone)
 
 
 class CRUDUserDroneAssignment(CRUDBase[UserDroneAssignment, Any, Any]): # Schemas not strictly needed for base
     def get_assignment(self, db: Session, *, user_id: int, drone_id: int) -> Optional[UserDroneAssignment]:
         # UserDroneAssignment does not have 'deleted_at' in its strict schema definition
-        return db.query(UserDroneAssignment).filter(
-            UserDroneAssignment.user_id == user_id,
-            UserDroneAssignment.drone_id == drone_id
-        ).first()
+        stmt = self._cached_statement(
+            "get_assignment",
+            lambda: select(UserDroneAssignment).where(
+                UserDroneAssignment.user_id == bindparam("user_id"),
+                UserDroneAssignment.drone_id == bindparam("drone_id"),
+            ).limit(1),
+        )
+        return db.scalars(stmt, {"user_id": user_id, "drone_id": drone_id}).first()
 
     def assign_user_to_drone(self, db: Session, *, user_id: int, drone_id: int) -> UserDroneAssignment:
         # Check if already assigned
@@ -1,6 +1,9 @@
-from typing import Optional, List, Any
-from sqlalchemy.orm import Session, selectinload
-from sqlalchemy.sql import func 
+from datetime import datetime
+from typing import Optional, List, Any, Dict
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload, lazyload
+from sqlalchemy.sql import func, Select
 from app.crud.base import CRUDBase
 from app.models.flight_plan import FlightPlan, FlightPlanStatus
 from app.models.waypoint import Waypoint
@@ -9,7 +12,7 @@ from app.schemas.waypoint import WaypointCreate
 
 
 class CRUDFlightPlan(CRUDBase[FlightPlan, FlightPlanCreate, FlightPlanUpdate]):
-    def create_with_waypoints(self, db: Session, *, obj_in: FlightPlanCreate, user_id: int, organization_id: Optional[int] = None, initial_status: FlightPlanStatus) -> FlightPlan:
+    def create_with_waypoints(self, db: Session, *, obj_in: FlightPlanCreate, user_id: int, organization_id: Optional[int] = None, initial_status: FlightPlanStatus, summary: Optional[Dict[str, Any]] = None) -> FlightPlan:
         db_flight_plan = FlightPlan(
             user_id=user_id,
             drone_id=obj_in.drone_id,
@@ -17,7 +20,8 @@ class CRUDFlightPlan(CRUDBase[FlightPlan, FlightPlanCreate, FlightPlanUpdate]):
             planned_departure_time=obj_in.planned_departure_time,
             planned_arrival_time=obj_in.planned_arrival_time,
             notes=obj_in.notes,
-            status=initial_status # Set by service layer
+            status=initial_status, # Set by service layer
+            **(summary or {}) # Route summary columns
         )
         db.add(db_flight_plan)
         # Must flush to get flight_plan.id for waypoints
@@ -34,19 +38,39 @@ class CRUDFlightPlan(CRUDBase[FlightPlan, FlightPlanCreate, FlightPlanUpdate]):
         db.refresh(db_flight_plan)
         return db_flight_plan
 
+    def _read_options(self, *, with_submitter: bool = False) -> list:
+        # Everything the FlightPlanRead* schemas touch is loaded up front (async sessions cannot
+        # lazy-load during serialization); lazyload("*") stops the selectin cascades of the
+        # related Drone/User.
+        options = [
+            selectinload(FlightPlan.drone).lazyload("*"),
+            selectinload(FlightPlan.waypoints),
+        ]
+        if with_submitter:
+            options.append(selectinload(FlightPlan.submitter_user).lazyload("*"))
+        return options
+
+    def _multi_for_user_with_details_stmt(
+        self, *, user_id: int, skip: int, limit: int, status: Optional[FlightPlanStatus], include_deleted: bool
+    ) -> Select:
+        stmt = select(FlightPlan).options(*self._read_options(with_submitter=True)).where(FlightPlan.user_id == user_id)
+        if not include_deleted:
+            stmt = stmt.where(FlightPlan.deleted_at.is_(None))
+        if status:
+            stmt = stmt.where(FlightPlan.status == status)
+        return stmt.order_by(FlightPlan.planned_departure_time.desc()).offset(skip).limit(limit)
+
     def get_multi_for_user_with_details(
         self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100, status: Optional[FlightPlanStatus] = None, include_deleted: bool = False
     ) -> List[FlightPlan]:
-        query = db.query(FlightPlan).options(
-            selectinload(FlightPlan.drone),
-            selectinload(FlightPlan.waypoints) # Load waypoints as well
-        ).filter(FlightPlan.user_id == user_id)
-        
-        if not include_deleted:
-            query = query.filter(FlightPlan.deleted_at.is_(None))
-        if status:
-            query = query.filter(FlightPlan.status == status)
-        return query.order_by(FlightPlan.planned_departure_time.desc()).offset(skip).limit(limit).all()
+        stmt = self._multi_for_user_with_details_stmt(user_id=user_id, skip=skip, limit=limit, status=status, include_deleted=include_deleted)
+        return list(db.execute(stmt).scalars().all())
+
+    async def get_multi_for_user_with_details_async(
+        self, db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 100, status: Optional[FlightPlanStatus] = None, include_deleted: bool = False
+    ) -> List[FlightPlan]:
+        stmt = self._multi_for_user_with_details_stmt(user_id=user_id, skip=skip, limit=limit, status=status, include_deleted=include_deleted)
+        return list((await db.execute(stmt)).scalars().all())
 
     def get_flight_plan_with_details(self, db: Session, id: int, include_deleted: bool = False) -> Optional[FlightPlan]:
         query = db.query(FlightPlan).options(
@@ -69,17 +93,49 @@ class CRUDFlightPlan(CRUDBase[FlightPlan, FlightPlanCreate, FlightPlanUpdate]):
             query = query.filter(FlightPlan.status == status)
         return query.order_by(FlightPlan.planned_departure_time.desc()).offset(skip).limit(limit).all()
 
+    def _multi_for_organization_stmt(
+        self, *, organization_id: int, skip: int, limit: int, status: Optional[FlightPlanStatus], user_id: Optional[int], include_deleted: bool
+    ) -> Select:
+        stmt = select(FlightPlan).options(*self._read_options()).where(FlightPlan.organization_id == organization_id)
+        if not include_deleted:
+            stmt = stmt.where(FlightPlan.deleted_at.is_(None))
+        if status:
+            stmt = stmt.where(FlightPlan.status == status)
+        if user_id:
+            stmt = stmt.where(FlightPlan.user_id == user_id)
+        return stmt.order_by(FlightPlan.planned_departure_time.desc()).offset(skip).limit(limit)
+
     def get_multi_for_organization(
         self, db: Session, *, organization_id: int, skip: int = 0, limit: int = 100, status: Optional[FlightPlanStatus] = None, user_id: Optional[int] = None, include_deleted: bool = False
     ) -> List[FlightPlan]:
-        query = db.query(FlightPlan).filter(FlightPlan.organization_id == organization_id)
+        stmt = self._multi_for_organization_stmt(
+            organization_id=organization_id, skip=skip, limit=limit, status=status, user_id=user_id, include_deleted=include_deleted
+        )
+        return list(db.execute(stmt).scalars().all())
+
+    async def get_multi_for_organization_async(
+        self, db: AsyncSession, *, organization_id: int, skip: int = 0, limit: int = 100, status: Optional[FlightPlanStatus] = None, user_id: Optional[int] = None, include_deleted: bool = False
+    ) -> List[FlightPlan]:
+        stmt = self._multi_for_organization_stmt(
+            organization_id=organization_id, skip=skip, limit=limit, status=status, user_id=user_id, include_deleted=include_deleted
+        )
+        return list((await db.execute(stmt)).scalars().all())
+
+    def _all_flight_plans_admin_stmt(
+        self, *, skip: int, limit: int, status: Optional[FlightPlanStatus], organization_id: Optional[int], user_id: Optional[int], include_deleted: bool
+    ) -> Select:
+        stmt = select(FlightPlan).options(*self._read_options(with_submitter=True))
         if not include_deleted:
-            query = query.filter(FlightPlan.deleted_at.is_(None))
+            stmt = stmt.where(FlightPlan.deleted_at.is_(None))
+
         if status:
-            query = query.filter(FlightPlan.status == status)
-        if user_id:
-            query = query.filter(FlightPlan.user_id == user_id)
-        return query.order_by(FlightPlan.planned_departure_time.desc()).offset(skip).limit(limit).all()
+            stmt = stmt.where(FlightPlan.status == status)
+        if organization_id is not None:
+            stmt = stmt.where(FlightPlan.organization_id == organization_id)
+        if user_id is not None:
+            stmt = stmt.where(FlightPlan.user_id == user_id)
+
+        return stmt.order_by(FlightPlan.planned_departure_time.desc()).offset(skip).limit(limit)
 
     def get_all_flight_plans_admin(
         self,
@@ -92,28 +148,223 @@ class CRUDFlightPlan(CRUDBase[FlightPlan, FlightPlanCreate, FlightPlanUpdate]):
         user_id: Optional[int] = None,
         include_deleted: bool = False
     ) -> List[FlightPlan]:
-        query = db.query(FlightPlan)
-        if not include_deleted:
-            query = query.filter(FlightPlan.deleted_at.is_(None))
-        
-        if status:
-            query = query.filter(FlightPlan.status == status)
-        if organization_id is not None:
-            query = query.filter(FlightPlan.organization_id == organization_id)
-        if user_id is not None:
-            query = query.filter(FlightPlan.user_id == user_id)
-            
-        return query.order_by(FlightPlan.planned_departure_time.desc()).offset(skip).limit(limit).all()
+        stmt = self._all_flight_plans_admin_stmt(
+            skip=skip, limit=limit, status=status, organization_id=organization_id, user_id=user_id, include_deleted=include_deleted
+        )
+        return list(db.execute(stmt).scalars().all())
+
+    async def get_all_flight_plans_admin_async(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[FlightPlanStatus] = None,
+        organization_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        include_deleted: bool = False
+    ) -> List[FlightPlan]:
+        stmt = self._all_flight_plans_admin_stmt(
+            skip=skip, limit=limit, status=status, organization_id=organization_id, user_id=user_id, include_deleted=include_deleted
+        )
+        return list((await db.execute(stmt)).scalars().all())
+
+    def get_with_waypoints_by_status(
+        self, db: Session, *, statuses: List[FlightPlanStatus], arriving_after: Optional[datetime] = None
+    ) -> List[FlightPlan]:
+        """Plans in the given statuses with only their waypoints loaded (bulk index builds)."""
+        stmt = select(FlightPlan).options(lazyload("*"), selectinload(FlightPlan.waypoints)).where(
+            FlightPlan.status.in_(statuses),
+            FlightPlan.deleted_at.is_(None),
+        )
+        if arriving_after is not None:
+            stmt = stmt.where(FlightPlan.planned_arrival_time >= arriving_after)
+        return list(db.execute(stmt).scalars().all())
+
+    def get_overlap_candidates(
+        self,
+        db: Session,
+        *,
+        statuses: List[FlightPlanStatus],
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float,
+        departs_before: datetime,
+        arrives_after: datetime,
+    ) -> List[FlightPlan]:
+        """Plans whose stored bounding box and schedule overlap the given envelope, with waypoints loaded."""
+        stmt = select(FlightPlan).options(lazyload("*"), selectinload(FlightPlan.waypoints)).where(
+            FlightPlan.status.in_(statuses),
+            FlightPlan.deleted_at.is_(None),
+            FlightPlan.planned_departure_time <= departs_before,
+            FlightPlan.planned_arrival_time >= arrives_after,
+            FlightPlan.bbox_min_lat <= max_lat,
+            FlightPlan.bbox_max_lat >= min_lat,
+            FlightPlan.bbox_min_lon <= max_lon,
+            FlightPlan.bbox_max_lon >= min_lon,
+        )
+        return list(db.execute(stmt).scalars().all())
+
+    def get_area_candidates(
+        self,
+        db: Session,
+        *,
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float,
+        start_time: datetime,
+        end_time: datetime,
+        statuses: Optional[List[FlightPlanStatus]] = None,
+        after_id: int = 0,
+        limit: int = 200,
+    ) -> List[FlightPlan]:
+        """
+        One keyset page (id > after_id) of plans whose stored bounding box
+        intersects the box and whose schedule overlaps [start_time, end_time].
+        Plans without a route summary are not matched.
+        """
+        stmt = (
+            select(FlightPlan)
+            .options(*self._read_options())
+            .where(
+                FlightPlan.deleted_at.is_(None),
+                FlightPlan.id > after_id,
+                FlightPlan.planned_departure_time <= end_time,
+                FlightPlan.planned_arrival_time >= start_time,
+                FlightPlan.bbox_min_lat <= max_lat,
+                FlightPlan.bbox_max_lat >= min_lat,
+                FlightPlan.bbox_min_lon <= max_lon,
+                FlightPlan.bbox_max_lon >= min_lon,
+            )
+            .order_by(FlightPlan.id)
+            .limit(limit)
+        )
+        if statuses:
+            stmt = stmt.where(FlightPlan.status.in_(statuses))
+        return list(db.execute(stmt).scalars().all())
+
+    def get_zone_impact_waypoints(
+        self,
+        db: Session,
+        *,
+        statuses: List[FlightPlanStatus],
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float,
+        arriving_after: datetime,
+        min_altitude_m: Optional[float] = None,
+        max_altitude_m: Optional[float] = None,
+    ) -> List[Any]:
+        """
+        Waypoint rows (flight_plan_id, drone_id, status, planned times, latitude,
+        longitude, altitude_m, sequence_order) of unfinished plans whose stored bbox and
+        altitude range overlap a zone, ordered by plan. Plain rows, no ORM objects,
+        since a city-scale zone can match thousands of plans.
+        """
+        stmt = (
+            select(
+                Waypoint.flight_plan_id,
+                FlightPlan.drone_id,
+                FlightPlan.status,
+                FlightPlan.planned_departure_time,
+                FlightPlan.planned_arrival_time,
+                Waypoint.latitude,
+                Waypoint.longitude,
+                Waypoint.altitude_m,
+                Waypoint.sequence_order,
+            )
+            .join(FlightPlan, Waypoint.flight_plan_id == FlightPlan.id)
+            .where(
+                FlightPlan.status.in_(statuses),
+                FlightPlan.deleted_at.is_(None),
+                FlightPlan.planned_arrival_time >= arriving_after,
+                FlightPlan.bbox_min_lat <= max_lat,
+                FlightPlan.bbox_max_lat >= min_lat,
+                FlightPlan.bbox_min_lon <= max_lon,
+                FlightPlan.bbox_max_lon >= min_lon,
+            )
+            .order_by(Waypoint.flight_plan_id, Waypoint.sequence_order)
+        )
+        if min_altitude_m is not None:
+            stmt = stmt.where(FlightPlan.max_altitude_m >= min_altitude_m)
+        if max_altitude_m is not None:
+            stmt = stmt.where(FlightPlan.min_altitude_m <= max_altitude_m)
+        return list(db.execute(stmt).all())
+
+    def increment_overlap_count(self, db: Session, *, ids: List[int]) -> None:
+        """Staged only; committed with the caller's transaction."""
+        if not ids:
+            return
+        db.execute(
+            update(FlightPlan)
+            .where(FlightPlan.id.in_(ids))
+            .values(overlap_count=func.coalesce(FlightPlan.overlap_count, 0) + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    def decrement_overlap_count(self, db: Session, *, ids: List[int]) -> None:
+        """Staged only; never below zero."""
+        if not ids:
+            return
+        db.execute(
+            update(FlightPlan)
+            .where(FlightPlan.id.in_(ids), FlightPlan.overlap_count > 0)
+            .values(overlap_count=FlightPlan.overlap_count - 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    def get_active_ids_by_drone(self, db: Session, *, drone_ids: List[int]) -> Dict[int, int]:
+        """drone_id -> id of its ACTIVE flight plan."""
+        if not drone_ids:
+            return {}
+        stmt = select(FlightPlan.drone_id, FlightPlan.id).where(
+            FlightPlan.drone_id.in_(drone_ids),
+            FlightPlan.status == FlightPlanStatus.ACTIVE,
+            FlightPlan.deleted_at.is_(None),
+        )
+        return dict(db.execute(stmt).all())
+
+    def get_drone_ids(self, db: Session, *, ids: List[int]) -> Dict[int, int]:
+        """flight_plan_id -> drone_id for the given plans."""
+        if not ids:
+            return {}
+        stmt = select(FlightPlan.id, FlightPlan.drone_id).where(FlightPlan.id.in_(ids))
+        return dict(db.execute(stmt).all())
+
+    def get_multi_by_ids(self, db: Session, *, ids: List[int]) -> List[FlightPlan]:
+        stmt = select(FlightPlan).options(*self._read_options()).where(
+            FlightPlan.id.in_(ids),
+            FlightPlan.deleted_at.is_(None),
+        )
+        return list(db.execute(stmt).scalars().all())
+
+    def get_queue(
+        self, db: Session, *, statuses: List[FlightPlanStatus], skip: int = 0, limit: int = 100
+    ) -> List[FlightPlan]:
+        """Plans awaiting a decision, earliest departure first."""
+        stmt = (
+            select(FlightPlan)
+            .options(*self._read_options())
+            .where(FlightPlan.status.in_(statuses), FlightPlan.deleted_at.is_(None))
+            .order_by(FlightPlan.planned_departure_time.asc(), FlightPlan.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(db.execute(stmt).scalars().all())
 
     def update_status(
-        self, 
+        self,
         db: Session, 
         *, 
         db_obj: FlightPlan, 
         new_status: FlightPlanStatus, 
         rejection_reason: Optional[str] = None,
         approver_id: Optional[int] = None, # User ID of approver
-        is_org_approval: bool = False # Flag to set correct approver field
+        is_org_approval: bool = False, # Flag to set correct approver field
+        commit: bool = True, # False: stage only, the caller commits (batch decisions)
     ) -> FlightPlan:
         db_obj.status = new_status
         if rejection_reason:
@@ -134,8 +385,9 @@ class CRUDFlightPlan(CRUDBase[FlightPlan, FlightPlanCreate, FlightPlanUpdate]):
             db_obj.approved_by_authority_admin_id = None
 
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        if commit:
+            db.commit()
+            db.refresh(db_obj)
         return db_obj
 
     def start_flight(self, db: Session, *, db_obj: FlightPlan) -> FlightPlan:
@@ -169,17 +421,20 @@ class CRUDFlightPlan(CRUDBase[FlightPlan, FlightPlanCreate, FlightPlanUpdate]):
         db.refresh(db_obj)
         return db_obj
     
+    def _flight_history_stmt(self, *, flight_plan_id: int, include_deleted: bool) -> Select:
+        # Telemetry is fetched separately, in timestamp order (crud.telemetry_log.get_logs_for_flight)
+        stmt = select(FlightPlan).options(*self._read_options(with_submitter=True)).where(FlightPlan.id == flight_plan_id)
+        if not include_deleted:
+            stmt = stmt.where(FlightPlan.deleted_at.is_(None))
+        return stmt.limit(1)
+
     def get_flight_history(self, db: Session, flight_plan_id: int, include_deleted: bool = False) -> Optional[FlightPlan]:
-        query = db.query(FlightPlan).options(
-            selectinload(FlightPlan.waypoints),
-            selectinload(FlightPlan.telemetry_logs).order_by(Waypoint.sequence_order), # Order telemetry if needed by timestamp
-            selectinload(FlightPlan.drone),
-            selectinload(FlightPlan.submitter_user)
-        ).filter(FlightPlan.id == flight_plan_id)
+        stmt = self._flight_history_stmt(flight_plan_id=flight_plan_id, include_deleted=include_deleted)
+        return db.execute(stmt).scalars().first()
 
-        if not include_deleted:
-            query = query.filter(FlightPlan.deleted_at.is_(None))
-        return query.first()
+    async def get_flight_history_async(self, db: AsyncSession, flight_plan_id: int, include_deleted: bool = False) -> Optional[FlightPlan]:
+        stmt = self._flight_history_stmt(flight_plan_id=flight_plan_id, include_deleted=include_deleted)
+        return (await db.execute(stmt)).scalars().first()
 
 
 flight_plan = CRUDFlightPlan(FlightPlan)
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.models.flight_plan import FlightPlan, FlightPlanStatus
+from app.models.simulation_checkpoint import SimulationCheckpoint
+
+# INSERT ... ON CONFLICT DO UPDATE per dialect
+UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+class CRUDSimulationCheckpoint(CRUDBase[SimulationCheckpoint, Any, Any]): # Written by the flight simulator only
+    def get_by_flight(self, db: Session, *, flight_plan_id: int) -> Optional[SimulationCheckpoint]:
+        return db.get(SimulationCheckpoint, flight_plan_id)
+
+    def save(
+        self, db: Session, *, flight_plan_id: int, waypoint_index: int, points_emitted: int,
+        last_emitted_at: Optional[datetime],
+    ) -> None:
+        """Create or move the checkpoint of a flight in one statement (no read first). Staged only."""
+        values = {
+            "flight_plan_id": flight_plan_id,
+            "waypoint_index": waypoint_index,
+            "points_emitted": points_emitted,
+            "last_emitted_at": last_emitted_at,
+        }
+        dialect_insert = UPSERTS.get(db.get_bind().dialect.name)
+        if dialect_insert is None:
+            db.merge(SimulationCheckpoint(**values))
+            return
+        stmt = dialect_insert(SimulationCheckpoint).values(created_at=func.now(), updated_at=func.now(), **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["flight_plan_id"],
+            set_={
+                "waypoint_index": stmt.excluded.waypoint_index,
+                "points_emitted": stmt.excluded.points_emitted,
+                "last_emitted_at": stmt.excluded.last_emitted_at,
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+
+    def claim(self, db: Session, *, flight_plan_id: int, owner: str, lease_seconds: float) -> bool:
+        """
+        Take the lease on a flight's simulation: create its checkpoint, or take
+        over one that is unowned, expired or already ours. Each step is one
+        conditional statement, so of several processes exactly one wins. Staged only.
+        """
+        now = datetime.now(timezone.utc)
+        values = {"owner": owner, "lease_expires_at": now + timedelta(seconds=lease_seconds)}
+        dialect_insert = UPSERTS.get(db.get_bind().dialect.name)
+        if dialect_insert is not None:
+            stmt = dialect_insert(SimulationCheckpoint).values(
+                flight_plan_id=flight_plan_id, waypoint_index=0, points_emitted=0,
+                created_at=func.now(), updated_at=func.now(), **values,
+            ).on_conflict_do_nothing(index_elements=["flight_plan_id"])
+            if db.execute(stmt).rowcount == 1:
+                return True
+        elif self.get_by_flight(db, flight_plan_id=flight_plan_id) is None:
+            db.add(SimulationCheckpoint(flight_plan_id=flight_plan_id, waypoint_index=0, points_emitted=0, **values))
+            return True
+        result = db.execute(
+            update(SimulationCheckpoint)
+            .where(
+                SimulationCheckpoint.flight_plan_id == flight_plan_id,
+                or_(
+                    SimulationCheckpoint.owner.is_(None),
+                    SimulationCheckpoint.owner == owner,
+                    SimulationCheckpoint.lease_expires_at < now,
+                ),
+            )
+            .values(**values)
+        )
+        return result.rowcount == 1
+
+    def renew(self, db: Session, *, flight_plan_id: int, owner: str, lease_seconds: float) -> bool:
+        """Extend our lease; False when another process has taken the flight over. Staged only."""
+        result = db.execute(
+            update(SimulationCheckpoint)
+            .where(SimulationCheckpoint.flight_plan_id == flight_plan_id, SimulationCheckpoint.owner == owner)
+            .values(lease_expires_at=datetime.now(timezone.utc) + timedelta(seconds=lease_seconds))
+        )
+        return result.rowcount == 1
+
+    def release(self, db: Session, *, flight_plan_id: int, owner: str) -> None:
+        """Give up our lease so another process can resume the flight at once. Staged only."""
+        db.execute(
+            update(SimulationCheckpoint)
+            .where(SimulationCheckpoint.flight_plan_id == flight_plan_id, SimulationCheckpoint.owner == owner)
+            .values(owner=None, lease_expires_at=None)
+        )
+
+    def remove_for_flight(self, db: Session, *, flight_plan_id: int) -> None:
+        """Hard delete once the simulation is over. Staged only."""
+        db.execute(delete(SimulationCheckpoint).where(SimulationCheckpoint.flight_plan_id == flight_plan_id))
+
+    def remove_stale(self, db: Session) -> List[int]:
+        """Hard delete checkpoints of flights no longer ACTIVE (cancelled while no process ran); returns their ids. Staged only."""
+        stale = list(db.scalars(
+            select(SimulationCheckpoint.flight_plan_id)
+            .join(FlightPlan, FlightPlan.id == SimulationCheckpoint.flight_plan_id)
+            .where(FlightPlan.status != FlightPlanStatus.ACTIVE)
+        ).all())
+        if stale:
+            db.execute(delete(SimulationCheckpoint).where(SimulationCheckpoint.flight_plan_id.in_(stale)))
+        return stale
+
+simulation_checkpoint = CRUDSimulationCheckpoint(SimulationCheckpoint)
@@ -0,0 +1,46 @@
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.drone import Drone
+from app.models.telemetry_archive import TelemetryArchive
+
+class CRUDTelemetryArchive(CRUDBase[TelemetryArchive, Any, Any]): # Written by the archive service only
+    def get_by_flight(self, db: Session, *, flight_plan_id: int) -> Optional[TelemetryArchive]:
+        return db.scalars(select(TelemetryArchive).where(TelemetryArchive.flight_plan_id == flight_plan_id)).first()
+
+    async def get_by_flight_async(self, db: AsyncSession, *, flight_plan_id: int) -> Optional[TelemetryArchive]:
+        return (await db.execute(
+            select(TelemetryArchive).where(TelemetryArchive.flight_plan_id == flight_plan_id)
+        )).scalars().first()
+
+    def save(self, db: Session, *, flight_plan_id: int, values: Dict[str, Any]) -> TelemetryArchive:
+        """Create or replace the archive of a flight. Staged only."""
+        db_obj = self.get_by_flight(db, flight_plan_id=flight_plan_id)
+        if db_obj is None:
+            db_obj = TelemetryArchive(flight_plan_id=flight_plan_id)
+        for field, value in values.items():
+            setattr(db_obj, field, value)
+        db.add(db_obj)
+        db.flush()
+        return db_obj
+
+    def get_overlapping(
+        self, db: Session, *, start, end, organization_id: Optional[int] = None,
+        drone_ids: Optional[List[int]] = None, after_id: int = 0, limit: int = 100,
+    ) -> List[TelemetryArchive]:
+        """Archives with points in [start, end), by id (pass the last id as after_id to page)."""
+        stmt = select(TelemetryArchive).where(
+            TelemetryArchive.start_time < end,
+            TelemetryArchive.end_time >= start,
+            TelemetryArchive.id > after_id,
+        )
+        if drone_ids:
+            stmt = stmt.where(TelemetryArchive.drone_id.in_(drone_ids))
+        if organization_id is not None:
+            stmt = stmt.where(TelemetryArchive.drone_id.in_(select(Drone.id).where(Drone.organization_id == organization_id)))
+        return list(db.scalars(stmt.order_by(TelemetryArchive.id).limit(limit)).all())
+
+telemetry_archive = CRUDTelemetryArchive(TelemetryArchive)
@@ -1,30 +1,128 @@
-from typing import List, Optional, Any
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import and_, delete, desc, func, insert, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import Select
 
-from app.crud.base import CRUDBase
+from app.models.drone import Drone
+from app.models.flight_plan import FlightPlan, FlightPlanStatus
 from app.models.telemetry_log import TelemetryLog
-from app.schemas.telemetry import TelemetryLogCreate # TelemetryLogUpdate not typical
 
-class CRUDTelemetryLog(CRUDBase[TelemetryLog, TelemetryLogCreate, Any]): # Update schema is Any
-    def create_log(self, db: Session, *, obj_in: TelemetryLogCreate) -> TelemetryLog:
-        # Direct creation, no complex logic here usually
-        return super().create(db, obj_in=obj_in)
+# INSERT ... ON CONFLICT DO NOTHING per dialect
+CONFLICT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
 
-    def get_logs_for_flight(
-        self, db: Session, *, flight_plan_id: int, limit: Optional[int] = None
-    ) -> List[TelemetryLog]:
-        query = db.query(TelemetryLog)\
-                  .filter(TelemetryLog.flight_plan_id == flight_plan_id)\
+# Every column of a point; reads select these and get plain rows, never ORM objects
+ROW_COLUMNS = (
+    TelemetryLog.id, TelemetryLog.flight_plan_id, TelemetryLog.drone_id, TelemetryLog.timestamp,
+    TelemetryLog.latitude, TelemetryLog.longitude, TelemetryLog.altitude_m,
+    TelemetryLog.speed_mps, TelemetryLog.heading_degrees, TelemetryLog.status_message,
+)
+
+# Flights that will not report any more
+FINISHED_STATUSES = (FlightPlanStatus.COMPLETED, FlightPlanStatus.CANCELLED_BY_PILOT, FlightPlanStatus.CANCELLED_BY_ADMIN)
+
+class CRUDTelemetryLog:
+    """
+    telemetry_logs is append-only (AppendOnlyBase): points are inserted in
+    bulk with Core, read back as plain rows and only ever hard-deleted once
+    archived. No CRUDBase: there is no ORM create, update or soft delete.
+    """
+
+    def create_bulk(self, db: Session, *, rows: List[Dict[str, Any]]) -> None:
+        """
+        Core executemany INSERT of column dicts, no ORM objects and no
+        RETURNING (which would force row-at-a-time inserts on some drivers).
+        Points already stored for the same (drone_id, timestamp) are skipped
+        by the database, so retried batches need no read first. Staged only.
+        """
+        if not rows:
+            return
+        dialect_insert = CONFLICT_INSERTS.get(db.get_bind().dialect.name)
+        if dialect_insert is None:
+            db.execute(insert(TelemetryLog.__table__), rows)
+            return
+        stmt = dialect_insert(TelemetryLog.__table__).on_conflict_do_nothing(index_elements=["drone_id", "timestamp"])
+        db.execute(stmt, rows)
+
+    def _logs_for_flight_stmt(self, *, flight_plan_id: int, limit: Optional[int]) -> Select:
+        stmt = select(*ROW_COLUMNS)\
+                  .where(TelemetryLog.flight_plan_id == flight_plan_id)\
                   .order_by(TelemetryLog.timestamp.asc()) # Asc for chronological order
         if limit:
-            query = query.limit(limit)
-        return query.all()
+            stmt = stmt.limit(limit)
+        return stmt
+
+    def get_logs_for_flight(
+        self, db: Session, *, flight_plan_id: int, limit: Optional[int] = None
+    ) -> List[Row]:
+        return list(db.execute(self._logs_for_flight_stmt(flight_plan_id=flight_plan_id, limit=limit)).all())
+
+    async def get_logs_for_flight_async(
+        self, db: AsyncSession, *, flight_plan_id: int, limit: Optional[int] = None
+    ) -> List[Row]:
+        result = await db.execute(self._logs_for_flight_stmt(flight_plan_id=flight_plan_id, limit=limit))
+        return list(result.all())
+
+    async def get_logs_for_flight_page_async(
+        self, db: AsyncSession, *, flight_plan_id: int, after: Optional[Tuple[datetime, int]], limit: int,
+    ) -> List[Row]:
+        """Next `limit` points after the (timestamp, id) key, read through a server-side cursor."""
+        stmt = select(*ROW_COLUMNS)\
+                  .where(TelemetryLog.flight_plan_id == flight_plan_id)\
+                  .order_by(TelemetryLog.timestamp, TelemetryLog.id)\
+                  .limit(limit)
+        if after is not None:
+            stmt = stmt.where(tuple_(TelemetryLog.timestamp, TelemetryLog.id) > tuple_(*after))
+        result = await db.stream(stmt.execution_options(yield_per=min(limit, 1000)))
+        return [row async for row in result]
+
+    def get_rows_for_flight(self, db: Session, *, flight_plan_id: int) -> List[Dict[str, Any]]:
+        stmt = select(*ROW_COLUMNS).where(TelemetryLog.flight_plan_id == flight_plan_id).order_by(TelemetryLog.timestamp)
+        return [dict(row) for row in db.execute(stmt).mappings()]
+
+    def get_archivable_flight_ids(self, db: Session, *, finished_before: datetime, limit: int) -> List[int]:
+        """Finished flights (last updated before `finished_before`) that still have points in this table."""
+        stmt = select(TelemetryLog.flight_plan_id)\
+                  .join(FlightPlan, FlightPlan.id == TelemetryLog.flight_plan_id)\
+                  .where(FlightPlan.status.in_(FINISHED_STATUSES), FlightPlan.updated_at < finished_before)\
+                  .distinct()\
+                  .limit(limit)
+        return list(db.scalars(stmt).all())
+
+    def delete_by_ids(self, db: Session, *, ids: List[int], chunk_size: int = 1000) -> int:
+        """Hard delete (archived points); drones pointing at them lose last_telemetry_id, not last_seen_at. Staged only."""
+        deleted = 0
+        for i in range(0, len(ids), chunk_size):
+            chunk = ids[i:i + chunk_size]
+            db.execute(update(Drone).where(Drone.last_telemetry_id.in_(chunk)).values(last_telemetry_id=None))
+            deleted += db.execute(delete(TelemetryLog.__table__).where(TelemetryLog.id.in_(chunk))).rowcount
+        return deleted
+
+    def get_latest_log_for_drone(self, db: Session, *, drone_id: int) -> Optional[Row]:
+        stmt = select(*ROW_COLUMNS)\
+                  .where(TelemetryLog.drone_id == drone_id)\
+                  .order_by(TelemetryLog.timestamp.desc())\
+                  .limit(1)
+        return db.execute(stmt).first()
 
-    def get_latest_log_for_drone(self, db: Session, *, drone_id: int) -> Optional[TelemetryLog]:
-        return db.query(TelemetryLog)\
-                 .filter(TelemetryLog.drone_id == drone_id)\
-                 .order_by(TelemetryLog.timestamp.desc())\
-                 .first()
+    async def get_latest_logs_for_drones_async(self, db: AsyncSession, *, drone_ids: List[int]) -> Dict[int, Row]:
+        """Latest log per drone in a single round trip (drone_id -> log)."""
+        if not drone_ids:
+            return {}
+        latest = select(TelemetryLog.drone_id, func.max(TelemetryLog.timestamp).label("latest_timestamp"))\
+                   .where(TelemetryLog.drone_id.in_(drone_ids))\
+                   .group_by(TelemetryLog.drone_id)\
+                   .subquery()
+        stmt = select(*ROW_COLUMNS).join(
+            latest,
+            and_(TelemetryLog.drone_id == latest.c.drone_id, TelemetryLog.timestamp == latest.c.latest_timestamp),
+        )
+        latest_by_drone: Dict[int, Row] = {}
+        for log in (await db.execute(stmt)).all():
+            latest_by_drone.setdefault(log.drone_id, log) # Ties on timestamp: keep the first
+        return latest_by_drone
 
-telemetry_log = CRUDTelemetryLog(TelemetryLog)
\ No newline at end of file
+telemetry_log = CRUDTelemetryLog()
\ No newline at end of file
@@ -1,7 +1,8 @@
 from typing import Any, Dict, Optional, Union, List
 
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import bindparam, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import CRUDBase
 from app.models.user import User, UserRole
@@ -12,10 +13,11 @@ from app.db.utils import apply_soft_delete_filter_to_query_condition
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     def get_by_email(self, db: Session, *, email: str, include_deleted: bool = False) -> Optional[User]:
-        query = db.query(User).filter(User.email == email)
-        if not include_deleted and hasattr(User, "deleted_at"):
-            query = query.filter(User.deleted_at.is_(None))
-        return query.first()
+        stmt = self._cached_statement(
+            ("get_by_email", include_deleted),
+            lambda: self._select_active(include_deleted).where(User.email == bindparam("email")).limit(1),
+        )
+        return db.scalars(stmt, {"email": email}).first()
 
     def get_by_iin(self, db: Session, *, iin: str, include_deleted: bool = False) -> Optional[User]:
         query = db.query(User).filter(User.iin == iin)
@@ -23,8 +25,8 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             query = query.filter(User.deleted_at.is_(None))
         return query.first()
 
-    def create(self, db: Session, *, obj_in: UserCreate) -> User:
-        db_obj = User(
+    def _build_user(self, obj_in: UserCreate) -> User:
+        return User(
             email=obj_in.email,
             hashed_password=get_password_hash(obj_in.password),
             full_name=obj_in.full_name,
@@ -34,14 +36,22 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             is_active=True, # Default, can be overridden if UserCreate has is_active
             organization_id=getattr(obj_in, 'organization_id', None) # If present in schema
         )
+
+    def create(self, db: Session, *, obj_in: UserCreate) -> User:
+        db_obj = self._build_user(obj_in)
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
-    def update(
-        self, db: Session, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
-    ) -> User:
+    async def create_async(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
+        db_obj = self._build_user(obj_in)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    def _apply_password_change(self, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]) -> Dict[str, Any]:
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
@@ -53,9 +63,20 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             if "current_password" in update_data: # current_password might not be in dict if obj_in is dict
                  del update_data["current_password"]
             db_obj.hashed_password = hashed_password # Set hashed password directly
+        return update_data
 
+    def update(
+        self, db: Session, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> User:
+        update_data = self._apply_password_change(db_obj, obj_in)
         return super().update(db, db_obj=db_obj, obj_in=update_data)
 
+    async def update_async(
+        self, db: AsyncSession, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> User:
+        update_data = self._apply_password_change(db_obj, obj_in)
+        return await super().update_async(db, db_obj=db_obj, obj_in=update_data)
+
     def authenticate(
         self, db: Session, *, email: str, password: str
     ) -> Optional[User]:
@@ -1,5 +1,6 @@
 # app/crud/user_drone_assignments.py
 from typing import List, Optional
+from sqlalchemy import bindparam
 from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
@@ -12,15 +13,14 @@ class CRUDUserDroneAssignment(
     def get_assignment(
         self, db: Session, *, user_id: int, drone_id: int
     ) -> Optional[UserDroneAssignment]:
-        return (
-            db.query(UserDroneAssignment)
-            .filter(
-                UserDroneAssignment.user_id == user_id,
-                UserDroneAssignment.drone_id == drone_id,
-                UserDroneAssignment.deleted_at.is_(None),
-            )
-            .first()
+        stmt = self._cached_statement(
+            "get_assignment",
+            lambda: self._select_active().where(
+                UserDroneAssignment.user_id == bindparam("user_id"),
+                UserDroneAssignment.drone_id == bindparam("drone_id"),
+            ).limit(1),
         )
+        return db.scalars(stmt, {"user_id": user_id, "drone_id": drone_id}).first()
 
     def get_multi(
         self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100
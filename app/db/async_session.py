@@ -0,0 +1,47 @@
+from typing import AsyncGenerator, Dict
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.db.pool_metrics import PoolMetrics
+from app.db.session import _engine_options, pool_metrics
+
+# Async drivers used for the same databases the sync engines talk to
+_ASYNC_DRIVERS: Dict[str, str] = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Rewrite a sync DATABASE_URL (e.g. postgresql://...) for its asyncio driver."""
+    parsed = make_url(url)
+    drivername = _ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def _create_async_engine(url: str):
+    return create_async_engine(to_async_url(url), pool_pre_ping=True, **_engine_options(url, is_async=True))
+
+
+# Async twins of the sync engines; both stacks coexist while endpoints migrate to async def.
+async_engine = _create_async_engine(settings.DATABASE_URL)
+# expire_on_commit=False: attribute access after commit would otherwise need implicit (sync) IO
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+async_replica_engine = _create_async_engine(settings.DATABASE_REPLICA_URL) if settings.DATABASE_REPLICA_URL else None
+AsyncReadSessionLocal = (
+    async_sessionmaker(async_replica_engine, expire_on_commit=False, autoflush=False)
+    if async_replica_engine is not None
+    else AsyncSessionLocal
+)
+
+pool_metrics["primary_async"] = PoolMetrics("primary_async").instrument(async_engine.sync_engine)
+if async_replica_engine is not None:
+    pool_metrics["replica_async"] = PoolMetrics("replica_async").instrument(async_replica_engine.sync_engine)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -16,3 +16,9 @@ class Base:
     created_at = Column(DateTime(timezone=True), default=func.now())
     updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
     deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)
+
+
+# High-volume append-only tables (telemetry): same registry and metadata as Base,
+# so foreign keys and Alembic see them, but no audit columns. Rows are written
+# with Core inserts and read as plain rows; they are never updated or soft-deleted.
+AppendOnlyBase = Base.registry.generate_base()
@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Checkout latency and connection counters for one engine's pool."""
+
+    def __init__(self, name: str, sample_size: int = 2048):
+        self.name = name
+        self.engine: Optional[Engine] = None
+        self._lock = threading.Lock()
+        self._checkout_waits_ms: Deque[float] = deque(maxlen=sample_size)  # Sliding window for percentiles
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+
+    def instrument(self, engine: Engine) -> "PoolMetrics":
+        self.engine = engine
+        if isinstance(engine.pool, _CheckoutTimingMixin):
+            engine.pool.metrics = self
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        return self
+
+    def record_checkout_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._checkout_waits_ms.append(seconds * 1000.0)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            if self.in_use > self.peak_in_use:
+                self.peak_in_use = self.in_use
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.checkins += 1
+            self.in_use = max(self.in_use - 1, 0)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._checkout_waits_ms)
+            data: Dict[str, Any] = {
+                "name": self.name,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+            }
+
+        pool = self.engine.pool if self.engine is not None else None
+        data["pool_class"] = type(pool).__name__ if pool is not None else None
+        if isinstance(pool, QueuePool):
+            data["pool_size"] = pool.size()
+            data["idle"] = pool.checkedin()
+            data["overflow"] = max(pool.overflow(), 0)  # Negative until the base pool is filled
+            data["max_overflow"] = pool._max_overflow
+        else:
+            data["pool_size"] = data["idle"] = data["overflow"] = data["max_overflow"] = None
+
+        data["checkout_wait_samples"] = len(waits)
+        data["checkout_wait_ms_avg"] = sum(waits) / len(waits) if waits else None
+        data["checkout_wait_ms_p50"] = _percentile(waits, 0.50)
+        data["checkout_wait_ms_p95"] = _percentile(waits, 0.95)
+        data["checkout_wait_ms_p99"] = _percentile(waits, 0.99)
+        data["checkout_wait_ms_max"] = waits[-1] if waits else None
+        return data
+
+
+class _CheckoutTimingMixin:
+    """Times how long callers wait for a connection from the pool."""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout()
+            raise
+        if self.metrics is not None:
+            self.metrics.record_checkout_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep reporting into the same metrics.
+        new_pool = super().recreate()
+        new_pool.metrics = self.metrics
+        return new_pool
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _percentile(sorted_values, fraction: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
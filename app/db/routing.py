@@ -0,0 +1,34 @@
+import threading
+import time
+from typing import Dict
+
+from app.core.config import settings
+
+
+class RecentWriteTracker:
+    """
+    Remembers when each user last mutated data, so that their follow-up reads
+    can be served by the primary instead of a replica that may still be lagging.
+    """
+
+    _PRUNE_THRESHOLD = 10_000
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._last_write: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark_write(self, user_key: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._last_write[user_key] = now
+            if len(self._last_write) > self._PRUNE_THRESHOLD:
+                cutoff = now - self.window_seconds
+                self._last_write = {k: ts for k, ts in self._last_write.items() if ts >= cutoff}
+
+    def wrote_recently(self, user_key: str) -> bool:
+        last_write = self._last_write.get(user_key)
+        return last_write is not None and time.monotonic() - last_write < self.window_seconds
+
+
+recent_writes = RecentWriteTracker(settings.READ_YOUR_WRITES_WINDOW_SECONDS)
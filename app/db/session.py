@@ -1,15 +1,63 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import Any, Dict, Generator
 
 from app.core.config import settings
+from app.db.pool_metrics import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool, PoolMetrics
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+
+def _engine_options(url: str, *, is_async: bool = False) -> Dict[str, Any]:
+    options: Dict[str, Any] = {"query_cache_size": settings.DB_QUERY_CACHE_SIZE}
+    # SQLite (local/dev) keeps SQLAlchemy's default pool; pool sizing only applies to server databases.
+    if make_url(url).get_backend_name() == "sqlite":
+        return options
+    options.update(
+        poolclass=InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    )
+    connect_args: Dict[str, Any] = {}
+    if is_async:
+        # asyncpg prepares each statement server-side and reuses it per connection;
+        # psycopg2 has no server-side prepares, so the sync engine relies on the compiled cache alone.
+        connect_args["prepared_statement_cache_size"] = settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        if is_async: # asyncpg takes server settings directly instead of a libpq options string
+            connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+        else:
+            connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True, **_engine_options(settings.DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional read replica. Without one, read-only endpoints simply share the primary.
+replica_engine = (
+    create_engine(settings.DATABASE_REPLICA_URL, pool_pre_ping=True, **_engine_options(settings.DATABASE_REPLICA_URL))
+    if settings.DATABASE_REPLICA_URL
+    else None
+)
+ReadSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    if replica_engine is not None
+    else SessionLocal
+)
+
+# Exposed through /metrics/db-pool, keyed by engine role
+pool_metrics: Dict[str, PoolMetrics] = {
+    "primary": PoolMetrics("primary").instrument(engine),
+}
+if replica_engine is not None:
+    pool_metrics["replica"] = PoolMetrics("replica").instrument(replica_engine)
+
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -1,14 +1,165 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
 
 from app.api.v1 import api_router as api_v1_router
 from app.api.routers import telemetry
 from app.core.config import settings
 from app.db.session import SessionLocal
+from app.services.service_registry import ServiceRegistry, service_registry
+
+
+def _init_db() -> None:
+    from app.db.init_db import init_db # Import here to avoid circular imports
+    db = SessionLocal()
+    try:
+        init_db(db)
+        print("Initial database setup complete.")
+    finally:
+        db.close()
+
+
+def _ping_db() -> None:
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT 1"))
+    finally:
+        db.close()
+
+
+async def _dispose_engines() -> None:
+    from app.db.async_session import async_engine, async_replica_engine
+    from app.db.session import engine, replica_engine
+    for async_db_engine in (async_engine, async_replica_engine):
+        if async_db_engine is not None:
+            await async_db_engine.dispose()
+    for db_engine in (engine, replica_engine):
+        if db_engine is not None:
+            db_engine.dispose()
+
+
+def _warm_nfz_caches() -> None:
+    from app.services.nfz_map_service import nfz_map_service
+    from app.services.nfz_schedule_index import zone_schedule_index
+    db = SessionLocal()
+    try:
+        zone_schedule_index.rebuild(db)
+        nfz_map_service.geojson(db) # Full map payload; tiles render on demand
+    finally:
+        db.close()
+
+
+def _warm_deconfliction_index() -> None:
+    from app.services.deconfliction_service import deconfliction_service
+    db = SessionLocal()
+    try:
+        deconfliction_service.rebuild(db)
+    finally:
+        db.close()
+
+
+def _resume_simulations() -> None:
+    from app.services.telemetry_service import telemetry_service
+    telemetry_service.suspending = False
+    if settings.SIMULATION_RESUME_ON_STARTUP:
+        telemetry_service.start_resumer()
+
+
+def register_services(registry: ServiceRegistry) -> None:
+    """Background services in start order (stopped in reverse)."""
+    from app.services.conflict_detection_service import conflict_detection_service
+    from app.services.telemetry_archive_service import telemetry_archive_service
+    from app.services.telemetry_replay_service import telemetry_replay_service
+    from app.services.telemetry_service import connection_manager, telemetry_service
+    from app.services.telemetry_spool import telemetry_spool
+
+    def _not_running(is_running: bool) -> str | None:
+        return None if is_running else "not running"
+
+    registry.register(
+        "database",
+        start=lambda: asyncio.to_thread(_init_db),
+        stop=_dispose_engines,
+        check=_ping_db,
+    )
+    registry.register(
+        "broadcast_hub", # WebSocket fan-out; simulations started from sync endpoints post to this loop
+        start=lambda: telemetry_service.attach_loop(asyncio.get_running_loop()),
+        stop=connection_manager.close_all,
+        details=lambda: {"connections": len(connection_manager.active_connections)},
+    )
+    registry.register(
+        "telemetry_writer", # Replays whatever a previous run left behind; stopping drains what it can
+        start=lambda: asyncio.to_thread(telemetry_spool.start),
+        stop=lambda: asyncio.to_thread(telemetry_spool.stop),
+        check=lambda: _not_running(telemetry_spool.is_running),
+        details=lambda: {key: value for key, value in telemetry_spool.stats().items() if key in (
+            "pending_points", "lag_seconds", "drain_failures", "dead_lettered_total", "last_error",
+        )},
+        enabled=settings.TELEMETRY_SPOOL_ENABLED,
+    )
+    registry.register(
+        "nfz_caches", # Built lazily anyway; warming only spares the first requests
+        start=lambda: asyncio.to_thread(_warm_nfz_caches),
+        required=False,
+    )
+    registry.register(
+        "deconfliction_index",
+        start=lambda: asyncio.to_thread(_warm_deconfliction_index),
+        required=False,
+    )
+    registry.register(
+        "live_state", # Tactical conflict detection over the latest position of every airborne drone
+        start=lambda: conflict_detection_service.start(connection_manager.broadcast),
+        stop=conflict_detection_service.stop,
+        check=lambda: _not_running(conflict_detection_service.is_running),
+        details=lambda: {"drones": len(conflict_detection_service.positions())},
+    )
+    registry.register(
+        "telemetry_archive",
+        start=telemetry_archive_service.start,
+        stop=telemetry_archive_service.stop,
+        check=lambda: _not_running(telemetry_archive_service.is_running),
+        required=False,
+        enabled=settings.TELEMETRY_ARCHIVE_ENABLED,
+    )
+    registry.register(
+        "flight_simulations", # Stopping checkpoints them and releases their leases; the next process resumes them
+        start=_resume_simulations,
+        stop=telemetry_service.suspend_simulations,
+        details=lambda: {"active": len(telemetry_service.active_simulations)},
+    )
+    registry.register(
+        "telemetry_replays",
+        stop=telemetry_replay_service.stop_all,
+        details=lambda: {"running": sum(1 for replay in telemetry_replay_service.replays() if replay.state == "RUNNING")},
+    )
+
+
+register_services(service_registry)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    print("Application startup...")
+    await service_registry.start_all()
+    service_registry.drain_on_sigterm()
+    print("UTM API started successfully.")
+    try:
+        yield
+    finally:
+        await service_registry.stop_all()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 # CORS setup
@@ -24,22 +175,12 @@ if hasattr(settings, 'BACKEND_CORS_ORIGINS') and settings.BACKEND_CORS_ORIGINS:
 app.include_router(api_v1_router, prefix=settings.API_V1_STR)
 app.include_router(telemetry.router)
 
-@app.on_event("startup")
-async def startup_event():
-    print("Application startup...")
-    # Import here to avoid circular imports
-    from app.db.init_db import init_db
-    
-    db = SessionLocal()
-    try:
-        init_db(db)
-        print("Initial database setup complete.")
-    except Exception as e:
-        print(f"Error during initial DB setup: {e}")
-    finally:
-        db.close()
-    print("UTM API started successfully.")
-
 @app.get(f"{settings.API_V1_STR}/health", tags=["Health"])
 def health_check():
-    return {"status": "healthy", "message": f"Welcome to {settings.PROJECT_NAME}!"}
\ No newline at end of file
+    return {"status": "healthy", "message": f"Welcome to {settings.PROJECT_NAME}!"}
+
+@app.get(f"{settings.API_V1_STR}/health/ready", tags=["Health"])
+def readiness_check():
+    """Readiness for load balancers: 503 while starting, draining or with a required service down."""
+    ready, report = service_registry.status()
+    return JSONResponse(jsonable_encoder(report), status_code=200 if ready else 503)
@@ -5,6 +5,8 @@ from .user_drone_assignment import UserDroneAssignment
 from .flight_plan import FlightPlan, FlightPlanStatus # Enum
 from .waypoint import Waypoint
 from .telemetry_log import TelemetryLog
+from .telemetry_archive import TelemetryArchive
+from .simulation_checkpoint import SimulationCheckpoint
 from .restricted_zone import RestrictedZone, NFZGeometryType # Enum
 
 # This helps Alembic find all models
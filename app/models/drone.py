@@ -38,7 +38,6 @@ class Drone(Base):
     assigned_users_through_link = relationship("UserDroneAssignment", back_populates="drone", lazy="selectin")
 
     flight_plans = relationship("FlightPlan", back_populates="drone", lazy="selectin")
-    telemetry_logs = relationship("TelemetryLog", back_populates="drone", foreign_keys="[TelemetryLog.drone_id]", lazy="selectin") # All logs for this drone
 
     # Relationship for last_telemetry_id if you want to load the object
     # last_telemetry_point = relationship("TelemetryLog", foreign_keys=[last_telemetry_id])
\ No newline at end of file
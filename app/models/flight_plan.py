@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum as SAEnum, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum as SAEnum, Text, Float, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
@@ -34,6 +34,18 @@ class FlightPlan(Base):
     approved_by_organization_admin_id = Column(Integer, ForeignKey("users.id", name="fk_flight_plan_org_admin_id"), nullable=True)
     approved_by_authority_admin_id = Column(Integer, ForeignKey("users.id", name="fk_flight_plan_auth_admin_id"), nullable=True)
     approved_at = Column(DateTime(timezone=True), nullable=True) # Final approval time
+
+    # Route summary computed once at submission (list views never need the waypoints)
+    route_length_m = Column(Float, nullable=True)
+    bbox_min_lat = Column(Float, nullable=True)
+    bbox_min_lon = Column(Float, nullable=True)
+    bbox_max_lat = Column(Float, nullable=True)
+    bbox_max_lon = Column(Float, nullable=True)
+    min_altitude_m = Column(Float, nullable=True)
+    max_altitude_m = Column(Float, nullable=True)
+    nearest_nfz_id = Column(Integer, ForeignKey("restricted_zones.id", name="fk_flight_plan_nearest_nfz_id", ondelete="SET NULL"), nullable=True)
+    nearest_nfz_distance_m = Column(Float, nullable=True) # 0 when the route enters the zone
+    overlap_count = Column(Integer, nullable=True) # Pending plans overlapping in 4D
     # created_at, updated_at, deleted_at from Base
 
     # Relationships
@@ -45,4 +57,9 @@ class FlightPlan(Base):
     authority_approver = relationship("User", foreign_keys=[approved_by_authority_admin_id], back_populates="authority_approved_flight_plans")
     
     waypoints = relationship("Waypoint", back_populates="flight_plan", cascade="all, delete-orphan", lazy="selectin")
-    telemetry_logs = relationship("TelemetryLog", back_populates="flight_plan", cascade="all, delete-orphan", lazy="selectin") # Or set null on delete
\ No newline at end of file
+
+    __table_args__ = (
+        # Area / time-window searches (route summary bbox + schedule)
+        Index("ix_flight_plan_bbox", "bbox_min_lat", "bbox_max_lat", "bbox_min_lon", "bbox_max_lon"),
+        Index("ix_flight_plan_schedule", "planned_departure_time", "planned_arrival_time"),
+    )
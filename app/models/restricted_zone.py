@@ -18,6 +18,18 @@ class RestrictedZone(Base):
     min_altitude_m = Column(Float, nullable=True)
     max_altitude_m = Column(Float, nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
+    # Optional activation window and recurring UTC schedule, narrowing is_active
+    effective_from = Column(DateTime(timezone=True), nullable=True)
+    effective_to = Column(DateTime(timezone=True), nullable=True, index=True)
+    schedule_json = Column(JSON, nullable=True) # [{"days_of_week": [0-6], "start_time": "HH:MM", "end_time": "HH:MM"}]
+    # Precomputed at ingest from the normalized definition (see nfz_geometry)
+    bbox_min_lat = Column(Float, nullable=True)
+    bbox_min_lon = Column(Float, nullable=True)
+    bbox_max_lat = Column(Float, nullable=True)
+    bbox_max_lon = Column(Float, nullable=True)
+    centroid_lat = Column(Float, nullable=True)
+    centroid_lon = Column(Float, nullable=True)
+    projected_json = Column(JSON, nullable=True) # Polygons: {"ref_lat", "ref_lon", "ring": [[x_m, y_m], ...]}
     created_by_authority_id = Column(Integer, ForeignKey("users.id", name="fk_restricted_zone_creator_id"), nullable=False)
     # created_at, updated_at, deleted_at from Base
 
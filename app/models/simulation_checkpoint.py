@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, String
+from app.db.base_class import Base
+
+class SimulationCheckpoint(Base):
+    __tablename__ = "simulation_checkpoints"
+
+    # Where the simulator of an ACTIVE flight got to, so a restarted process resumes it there
+    flight_plan_id = Column(Integer, ForeignKey("flight_plans.id", name="fk_simulation_checkpoint_flight_plan_id", ondelete="CASCADE"), primary_key=True)
+    waypoint_index = Column(Integer, nullable=False) # Next waypoint (leg) to fly
+    points_emitted = Column(Integer, nullable=False) # Progress: telemetry points sent so far
+    last_emitted_at = Column(DateTime(timezone=True), nullable=True) # Time of the last point sent
+    # Process simulating the flight; others leave it alone until the lease lapses
+    owner = Column(String(32), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    # created_at, updated_at from Base
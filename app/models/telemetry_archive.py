@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, LargeBinary, SmallInteger
+from app.db.base_class import Base
+
+class TelemetryArchive(Base):
+    __tablename__ = "telemetry_archives"
+
+    # Telemetry of a finished flight, compressed into one blob (app/services/telemetry_codec.py)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    flight_plan_id = Column(Integer, ForeignKey("flight_plans.id", name="fk_telemetry_archive_flight_plan_id", ondelete="CASCADE"), nullable=False, unique=True)
+    drone_id = Column(Integer, ForeignKey("drones.id", name="fk_telemetry_archive_drone_id", ondelete="CASCADE"), nullable=False, index=True)
+    start_time = Column(DateTime(timezone=True), nullable=False, index=True) # First point
+    end_time = Column(DateTime(timezone=True), nullable=False, index=True) # Last point
+    point_count = Column(Integer, nullable=False)
+    encoding_version = Column(SmallInteger, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    # created_at, updated_at from Base
@@ -46,22 +46,41 @@ from .flight_plan import (
     FlightPlanStatus, # Re-export
     FlightPlanStatusUpdate,
     FlightPlanCancel,
+    FlightPlanQueueItem,
+    FlightPlanDecision,
+    FlightPlanBatchStatusUpdate,
+    FlightPlanDecisionResult,
+    FlightPlanAreaSearch,
     FlightPlanHistory,
 )
 from .telemetry import (
     TelemetryLogBase,
     TelemetryLogCreate,
     TelemetryLogRead,
+    TelemetryIngestRejection,
+    TelemetryIngestResult,
+    TelemetryReplayCreate,
+    TelemetryReplayRead,
     LiveTelemetryMessage, # For WebSocket
+    ConflictAlertMessage, # For WebSocket
+    ConformanceAlertMessage, # For WebSocket
+    NFZImpactAlertMessage, # For WebSocket
 )
 from .restricted_zone import (
+    NFZScheduleRule,
     RestrictedZoneBase,
     RestrictedZoneCreate,
     RestrictedZoneUpdate,
     RestrictedZoneRead,
+    NFZImpactedFlight,
+    NFZImpactReport,
     NFZGeometryType, # Re-export
 )
 from .utility import (
     WeatherInfo,
     RemoteIdBroadcast,
-)
\ No newline at end of file
+)
+from .metrics import (
+    DBPoolStats,
+    TelemetrySpoolStats,
+)
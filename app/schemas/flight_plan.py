@@ -41,6 +41,17 @@ class FlightPlanRead(FlightPlanBase):
     created_at: datetime
     updated_at: datetime
     drone: Optional[DroneRead] = None
+    # Route summary (None for plans submitted before summaries existed)
+    route_length_m: Optional[float] = None
+    bbox_min_lat: Optional[float] = None
+    bbox_min_lon: Optional[float] = None
+    bbox_max_lat: Optional[float] = None
+    bbox_max_lon: Optional[float] = None
+    min_altitude_m: Optional[float] = None
+    max_altitude_m: Optional[float] = None
+    nearest_nfz_id: Optional[int] = None
+    nearest_nfz_distance_m: Optional[float] = None
+    overlap_count: Optional[int] = None
     
     class Config:
         from_attributes = True
@@ -57,6 +68,32 @@ class FlightPlanStatusUpdate(BaseModel):
 class FlightPlanCancel(BaseModel):
     reason: Optional[str] = None
 
+# Approval work queue / batched decisions
+class FlightPlanQueueItem(FlightPlanRead):
+    conflicting_flight_plan_ids: List[int] = [] # APPROVED/ACTIVE plans overlapping in 4D
+    nfz_violations: List[str] = [] # Names of active NFZs the route enters
+
+class FlightPlanDecision(BaseModel):
+    flight_plan_id: int
+    status: FlightPlanStatus
+    rejection_reason: Optional[str] = None
+
+class FlightPlanBatchStatusUpdate(BaseModel):
+    decisions: List[FlightPlanDecision] = Field(..., min_length=1, max_length=500)
+
+class FlightPlanDecisionResult(BaseModel):
+    flight_plan_id: int
+    success: bool
+    status: Optional[FlightPlanStatus] = None # Status after the batch (unchanged on failure)
+    error: Optional[str] = None
+
+# Area / time-window search
+class FlightPlanAreaSearch(BaseModel):
+    polygon: List[List[float]] = Field(..., min_length=3, max_length=1000) # GeoJSON ring of [lon, lat]
+    start_time: datetime
+    end_time: datetime
+    statuses: Optional[List[FlightPlanStatus]] = None # All statuses when omitted
+
 class FlightPlanHistory(BaseModel):
     flight_plan_details: FlightPlanReadWithWaypoints
     # planned_waypoints: List[WaypointRead] # Already in FlightPlanReadWithWaypoints
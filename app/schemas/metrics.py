@@ -0,0 +1,40 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class DBPoolStats(BaseModel):
+    name: str # Engine role, e.g. "primary"
+    pool_class: Optional[str] = None
+    pool_size: Optional[int] = None # Configured base pool size
+    max_overflow: Optional[int] = None
+    in_use: int # Connections currently checked out
+    idle: Optional[int] = None # Connections sitting in the pool
+    overflow: Optional[int] = None # Connections opened beyond pool_size
+    peak_in_use: int
+    checkouts: int
+    checkins: int
+    connects: int # New DBAPI connections opened
+    invalidations: int
+    timeouts: int # Checkouts that gave up after DB_POOL_TIMEOUT_SECONDS
+    checkout_wait_samples: int
+    checkout_wait_ms_avg: Optional[float] = None
+    checkout_wait_ms_p50: Optional[float] = None
+    checkout_wait_ms_p95: Optional[float] = None
+    checkout_wait_ms_p99: Optional[float] = None
+    checkout_wait_ms_max: Optional[float] = None
+
+class TelemetrySpoolStats(BaseModel):
+    enabled: bool # False: telemetry goes straight to the database
+    slot_dir: Optional[str] = None
+    segments: int
+    bytes: int # Disk used by spool segments
+    max_bytes: int
+    pending_points: int # Spooled but not yet in telemetry_logs
+    lag_seconds: float # Age of the oldest pending point
+    appended_total: int
+    drained_total: int
+    direct_writes: int # Batches written around the spool (closed or full)
+    drain_failures: int
+    dead_lettered_total: int # Points the database kept rejecting, moved to the slot's dead-letter.jsonl
+    last_drain_at: Optional[datetime] = None
+    last_error: Optional[str] = None
@@ -1,7 +1,14 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Any, Dict
+from typing import Annotated, Optional, Any, Dict, List
 from datetime import datetime
 from app.models.restricted_zone import NFZGeometryType # Import enum
+from app.models.flight_plan import FlightPlanStatus
+
+# One recurring activation rule, in UTC; end_time <= start_time runs past midnight
+class NFZScheduleRule(BaseModel):
+    days_of_week: List[Annotated[int, Field(ge=0, le=6)]] = Field(..., min_length=1) # 0 = Monday ... 6 = Sunday
+    start_time: str = Field(..., pattern=r"^([01]\d|2[0-3]):[0-5]\d$") # "HH:MM"
+    end_time: str = Field(..., pattern=r"^([01]\d|2[0-3]):[0-5]\d$")
 
 # Shared properties
 class RestrictedZoneBase(BaseModel):
@@ -11,6 +18,9 @@ class RestrictedZoneBase(BaseModel):
     definition_json: Dict[str, Any] # e.g., {"center_lat": ..., "radius_m": ...} or {"coordinates": ...}
     min_altitude_m: Optional[float] = Field(default=None, ge=0)
     max_altitude_m: Optional[float] = Field(default=None, ge=0) # Could be validated against min_alt
+    effective_from: Optional[datetime] = None # Unbounded when omitted
+    effective_to: Optional[datetime] = None
+    schedule_json: Optional[List[NFZScheduleRule]] = None # Recurring windows within effective_from/to
 
 # Properties to receive via API on creation
 class RestrictedZoneCreate(RestrictedZoneBase):
@@ -24,6 +34,9 @@ class RestrictedZoneUpdate(BaseModel):
     definition_json: Optional[Dict[str, Any]] = None
     min_altitude_m: Optional[float] = None
     max_altitude_m: Optional[float] = None
+    effective_from: Optional[datetime] = None
+    effective_to: Optional[datetime] = None
+    schedule_json: Optional[List[NFZScheduleRule]] = None
     is_active: Optional[bool] = None
 
 # Properties to return to client
@@ -33,6 +46,27 @@ class RestrictedZoneRead(RestrictedZoneBase):
     created_by_authority_id: int
     created_at: datetime
     updated_at: datetime
+    # Computed when the geometry is normalized
+    bbox_min_lat: Optional[float] = None
+    bbox_min_lon: Optional[float] = None
+    bbox_max_lat: Optional[float] = None
+    bbox_max_lon: Optional[float] = None
+    centroid_lat: Optional[float] = None
+    centroid_lon: Optional[float] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Impact of a zone on planned and live flights
+class NFZImpactedFlight(BaseModel):
+    flight_plan_id: Optional[int] = None # None for a live drone without a known plan
+    drone_id: Optional[int] = None
+    status: Optional[FlightPlanStatus] = None
+    reason: str # ROUTE_INTERSECTS / DRONE_INSIDE
+
+class NFZImpactReport(BaseModel):
+    zone_id: int
+    zone_name: str
+    computed_at: datetime
+    candidate_count: int # Plans whose stored bbox/altitude range overlapped the zone
+    affected_flights: List[NFZImpactedFlight] = []
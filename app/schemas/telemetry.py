@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 
 # Shared properties for DB log
@@ -22,14 +22,42 @@ class TelemetryLogRead(TelemetryLogBase):
     id: int # BigInt in DB, int here is fine for Pydantic
     flight_plan_id: Optional[int] = None
     drone_id: int
-    created_at: datetime # from Base
+
+    class Config:
+        from_attributes = True
+
+# Result of an ingested telemetry batch (HTTP response / uplink WebSocket ack)
+class TelemetryIngestRejection(BaseModel):
+    index: int # Position of the point in the batch
+    detail: str
+
+class TelemetryIngestResult(BaseModel):
+    accepted: int # Stored now or already stored by an earlier (retried) batch
+    late: int = 0 # Accepted but older than the drone's live state; history only
+    duplicates: int = 0 # Repeated within the batch
+    rejected: List[TelemetryIngestRejection] = []
+
+# Replay of a recorded flight to WebSocket clients
+class TelemetryReplayCreate(BaseModel):
+    flight_plan_id: int
+    speed: float = Field(default=1.0, gt=0) # 1, 10, 100... times the recorded pace
+
+class TelemetryReplayRead(BaseModel):
+    id: str # Also the replay_id of every message it sends
+    flight_plan_id: int
+    speed: float
+    source: Optional[str] = None # "archive" or "telemetry_logs"
+    state: str # RUNNING, COMPLETED, STOPPED, EXPIRED (nobody connected), FAILED
+    points_sent: int
+    position: Optional[datetime] = None # Recorded time of the last point sent
+    started_at: datetime
 
     class Config:
         from_attributes = True
 
 # Message format for WebSocket broadcast
 class LiveTelemetryMessage(BaseModel):
-    flight_id: int # flight_plan_id
+    flight_id: Optional[int] = None # flight_plan_id; None for ingested points of a drone without an active plan
     drone_id: int
     lat: float
     lon: float
@@ -38,4 +66,44 @@ class LiveTelemetryMessage(BaseModel):
     speed: Optional[float] = None # speed_mps
     heading: Optional[float] = None # heading_degrees
     # status: str # e.g., "ON_SCHEDULE/ALERT_NFZ/SIGNAL_LOST" -> from TelemetryLog.status_message
-    status_message: Optional[str] = None
\ No newline at end of file
+    status_message: Optional[str] = None
+    replay_id: Optional[str] = None # Set on recorded points re-sent by a replay, never on live ones
+
+# Tactical conflict between two live drones, broadcast on the telemetry WebSocket
+class ConflictAlertMessage(BaseModel):
+    message_type: Literal["CONFLICT_ALERT"] = "CONFLICT_ALERT"
+    severity: str # "LOSS_OF_SEPARATION" (already inside minima) or "PREDICTED"
+    drone_id_a: int
+    drone_id_b: int
+    flight_id_a: Optional[int] = None
+    flight_id_b: Optional[int] = None
+    horizontal_distance_m: float # Now
+    vertical_distance_m: float
+    cpa_distance_m: float # Horizontal distance at closest point of approach
+    time_to_cpa_s: float
+    timestamp: datetime
+
+# Drone leaving its approved route corridor, broadcast on the telemetry WebSocket
+class ConformanceAlertMessage(BaseModel):
+    message_type: Literal["CONFORMANCE_ALERT"] = "CONFORMANCE_ALERT"
+    alert_type: str # ROUTE_DEVIATION / ALTITUDE_DEVIATION / SCHEDULE_DEVIATION
+    flight_id: int
+    drone_id: int
+    leg_index: int # Leg the drone is being tracked against (0-based)
+    lateral_deviation_m: float
+    vertical_deviation_m: float
+    schedule_deviation_s: float # Positive when behind schedule
+    lat: float
+    lon: float
+    alt: float
+    timestamp: datetime
+
+class NFZImpactAlertMessage(BaseModel):
+    message_type: Literal["NFZ_IMPACT_ALERT"] = "NFZ_IMPACT_ALERT"
+    reason: str # ROUTE_INTERSECTS / DRONE_INSIDE
+    zone_id: int
+    zone_name: str
+    flight_id: Optional[int] = None
+    drone_id: Optional[int] = None
+    flight_status: Optional[str] = None
+    timestamp: datetime
@@ -1,6 +1,7 @@
 # This file can be empty or used to import services for easier access
 from .flight_service import FlightService
 from .nfz_service import NFZService
+from .deconfliction_service import DeconflictionService, deconfliction_service
 from .telemetry_service import TelemetryService, ConnectionManager
 
 flight_service = FlightService()
@@ -0,0 +1,204 @@
+# app/services/conflict_detection_service.py
+import asyncio
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.geo import METERS_PER_DEG_LAT, LocalProjection, meters_per_deg_lon
+from app.schemas.telemetry import ConflictAlertMessage
+from app.services.deconfliction_service import to_epoch
+
+
+class DroneState:
+    """Latest reported position and velocity of one airborne drone."""
+
+    __slots__ = ("drone_id", "flight_id", "lat", "lon", "alt", "speed", "heading", "epoch")
+
+    def __init__(self, drone_id: int, flight_id: Optional[int], lat: float, lon: float, alt: float,
+                 speed: Optional[float], heading: Optional[float], epoch: float):
+        self.drone_id = drone_id
+        self.flight_id = flight_id
+        self.lat, self.lon, self.alt = lat, lon, alt
+        self.speed = speed or 0.0
+        self.heading = heading or 0.0
+        self.epoch = epoch
+
+    def velocity(self) -> Tuple[float, float]:
+        # Heading is degrees clockwise from north
+        rad = math.radians(self.heading)
+        return self.speed * math.sin(rad), self.speed * math.cos(rad)
+
+
+def closest_point_of_approach(dx: float, dy: float, dvx: float, dvy: float, horizon_s: float) -> Tuple[float, float]:
+    """(time, horizontal distance) of the closest approach within [0, horizon_s] for linear relative motion."""
+    speed_sq = dvx * dvx + dvy * dvy
+    t = 0.0 if speed_sq == 0.0 else max(0.0, min(horizon_s, -(dx * dvx + dy * dvy) / speed_sq))
+    return t, math.hypot(dx + dvx * t, dy + dvy * t)
+
+
+class ConflictDetectionService:
+    """
+    Tactical conflict detection between live drones. Telemetry updates the
+    latest state per drone; every tick the states are dead-reckoned to the tick
+    time and bucketed into a uniform grid whose cells are as wide as the
+    distance two drones can close within the look-ahead, so each drone is only
+    compared with drones in its own and the 8 neighbouring cells. Cells are
+    sized for at most TACTICAL_MAX_SPEED_MPS; drones reporting more are
+    compared with every drone instead. Ticks run in a worker thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states: Dict[int, DroneState] = {}
+        self._active_pairs: Set[Tuple[int, int]] = set()
+        self._stop_event: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def update(self, *, drone_id: int, flight_plan_id: Optional[int], latitude: float, longitude: float,
+               altitude_m: float, speed_mps: Optional[float], heading_degrees: Optional[float],
+               timestamp: datetime) -> None:
+        state = DroneState(drone_id, flight_plan_id, latitude, longitude, altitude_m,
+                           speed_mps, heading_degrees, to_epoch(timestamp))
+        with self._lock:
+            current = self._states.get(drone_id)
+            if current is None or current.epoch <= state.epoch: # Ignore late points
+                self._states[drone_id] = state
+
+    def forget(self, drone_id: int) -> None:
+        with self._lock:
+            self._states.pop(drone_id, None)
+
+    def positions(self) -> List[DroneState]:
+        """Snapshot of the latest state of every tracked drone."""
+        with self._lock:
+            return list(self._states.values())
+
+    def detect(self, now: Optional[float] = None) -> List[ConflictAlertMessage]:
+        """One tick: every pair newly in conflict (already alerted pairs stay quiet until they separate)."""
+        now = time.time() if now is None else now
+        horizontal = settings.TACTICAL_HORIZONTAL_SEPARATION_M
+        vertical = settings.TACTICAL_VERTICAL_SEPARATION_M
+        horizon = settings.TACTICAL_LOOKAHEAD_SECONDS
+        stale_after = settings.TACTICAL_STALE_AFTER_SECONDS
+
+        with self._lock:
+            for drone_id in [d for d, s in self._states.items() if now - s.epoch > stale_after]:
+                del self._states[drone_id]
+            states = list(self._states.values())
+        if len(states) < 2:
+            self._active_pairs = set()
+            return []
+
+        # Dead-reckon to the tick time so every drone is compared at the same instant
+        positions = []
+        fast: List[int] = [] # Faster than the cells are sized for: kept out of the grid, compared with every drone
+        max_speed = 0.0
+        max_abs_lat = 0.0
+        for i, s in enumerate(states):
+            vx, vy = s.velocity()
+            dt = max(0.0, now - s.epoch)
+            lat = s.lat + vy * dt / METERS_PER_DEG_LAT
+            lon = s.lon + vx * dt / meters_per_deg_lon(s.lat)
+            positions.append((s, lat, lon, vx, vy))
+            if s.speed > settings.TACTICAL_MAX_SPEED_MPS:
+                fast.append(i)
+            else:
+                max_speed = max(max_speed, s.speed)
+            max_abs_lat = max(max_abs_lat, abs(lat))
+
+        # Two drones within their own speeds of each other can only conflict if they are
+        # less than a cell apart, so the 8 neighbouring cells hold every candidate
+        reach_m = horizontal + 2 * max_speed * horizon
+        cell_lat = reach_m / METERS_PER_DEG_LAT
+        cell_lon = reach_m / meters_per_deg_lon(max_abs_lat) # Widest cells at the highest latitude
+        grid: Dict[Tuple[int, int], List[int]] = {}
+        for i, (s, lat, lon, _, _) in enumerate(positions):
+            if s.speed <= settings.TACTICAL_MAX_SPEED_MPS:
+                grid.setdefault((math.floor(lat / cell_lat), math.floor(lon / cell_lon)), []).append(i)
+
+        def candidates():
+            # Each unordered pair once: (drone, later drones it could conflict with)
+            for (ci, cj), members in grid.items():
+                neighbours = [
+                    j
+                    for di in (-1, 0, 1)
+                    for dj in (-1, 0, 1)
+                    for j in grid.get((ci + di, cj + dj), ())
+                ]
+                for i in members:
+                    yield i, [j for j in neighbours if j > i]
+            fast_set = set(fast)
+            for i in fast:
+                yield i, [j for j in range(len(positions)) if j != i and (j not in fast_set or j > i)]
+
+        pairs: Set[Tuple[int, int]] = set()
+        alerts: List[ConflictAlertMessage] = []
+        tick_time = datetime.fromtimestamp(now, tz=timezone.utc)
+        for i, others in candidates():
+            a, lat_a, lon_a, vx_a, vy_a = positions[i]
+            proj = LocalProjection(lat_a, lon_a)
+            for j in others:
+                b, lat_b, lon_b, vx_b, vy_b = positions[j]
+                dz = abs(a.alt - b.alt) # No vertical rate in telemetry; altitude is held
+                if dz >= vertical:
+                    continue
+                dx, dy = proj.to_xy(lat_b, lon_b)
+                t_cpa, d_cpa = closest_point_of_approach(dx, dy, vx_b - vx_a, vy_b - vy_a, horizon)
+                if d_cpa >= horizontal:
+                    continue
+                key = (min(a.drone_id, b.drone_id), max(a.drone_id, b.drone_id))
+                pairs.add(key)
+                if key in self._active_pairs:
+                    continue
+                distance = math.hypot(dx, dy)
+                first, second = (a, b) if a.drone_id == key[0] else (b, a)
+                alerts.append(ConflictAlertMessage(
+                    severity="LOSS_OF_SEPARATION" if distance < horizontal else "PREDICTED",
+                    drone_id_a=first.drone_id,
+                    drone_id_b=second.drone_id,
+                    flight_id_a=first.flight_id,
+                    flight_id_b=second.flight_id,
+                    horizontal_distance_m=round(distance, 1),
+                    vertical_distance_m=round(dz, 1),
+                    cpa_distance_m=round(d_cpa, 1),
+                    time_to_cpa_s=round(t_cpa, 1),
+                    timestamp=tick_time,
+                ))
+        self._active_pairs = pairs
+        return alerts
+
+    async def run(self, broadcast) -> None:
+        """Tick loop; `broadcast` is an async callable taking the JSON-ready alert dict."""
+        self._stop_event = asyncio.Event()
+        while not self._stop_event.is_set():
+            try:
+                # Off the event loop: a tick over thousands of drones takes tens of milliseconds
+                for alert in await asyncio.to_thread(self.detect):
+                    await broadcast(alert.model_dump(mode="json"))
+            except Exception as e:
+                print(f"Conflict detection tick failed: {e}")
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=settings.TACTICAL_TICK_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, broadcast) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(broadcast))
+
+    async def stop(self) -> None:
+        if self._stop_event is not None:
+            self._stop_event.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+
+conflict_detection_service = ConflictDetectionService()
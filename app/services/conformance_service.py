@@ -0,0 +1,151 @@
+# app/services/conformance_service.py
+import math
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.geo import LocalProjection
+from app.models.flight_plan import FlightPlan
+from app.schemas.telemetry import ConformanceAlertMessage
+from app.services.deconfliction_service import to_epoch
+
+
+class RouteCorridor:
+    """
+    An ACTIVE plan's route projected to local meters once at flight start,
+    with the planned schedule shifted to the actual departure time.
+    """
+
+    def __init__(self, flight_plan_id: int, drone_id: int, waypoints, departure_epoch: float, duration_s: float):
+        points = sorted(waypoints, key=lambda w: w.sequence_order)
+        self.flight_plan_id = flight_plan_id
+        self.drone_id = drone_id
+        self.projection = LocalProjection(points[0].latitude, points[0].longitude)
+        self.xy = [self.projection.to_xy(p.latitude, p.longitude) for p in points]
+        self.alt = [p.altitude_m for p in points]
+        self.lengths = [math.dist(a, b) for a, b in zip(self.xy, self.xy[1:])]
+        self.cumulative = [0.0]
+        for length in self.lengths:
+            self.cumulative.append(self.cumulative[-1] + length)
+        self.total_length = self.cumulative[-1]
+        self.departure_epoch = departure_epoch
+        self.duration_s = duration_s
+        # Tracking state
+        self.leg_index = 0
+        self.active_alerts: Set[str] = set()
+
+    @property
+    def leg_count(self) -> int:
+        return max(len(self.lengths), 1)
+
+    def _leg_param(self, leg: int, x: float, y: float) -> Tuple[float, float]:
+        """(unclamped position along leg 0..1, lateral distance to the leg segment)."""
+        if not self.lengths: # Single-waypoint plan: hover point
+            ax, ay = self.xy[0]
+            return 0.0, math.hypot(x - ax, y - ay)
+        (ax, ay), (bx, by) = self.xy[leg], self.xy[leg + 1]
+        length = self.lengths[leg]
+        if length == 0.0:
+            return 1.0, math.hypot(x - ax, y - ay)
+        t = ((x - ax) * (bx - ax) + (y - ay) * (by - ay)) / (length * length)
+        tc = max(0.0, min(1.0, t))
+        return t, math.hypot(x - (ax + tc * (bx - ax)), y - (ay + tc * (by - ay)))
+
+    def locate(self, x: float, y: float) -> Tuple[int, float, float]:
+        """
+        Advance the current leg while the drone is past its end and the next leg
+        fits at least as well. The index only moves forward, so this is O(1) amortized.
+        """
+        leg = self.leg_index
+        t, lateral = self._leg_param(leg, x, y)
+        while leg + 1 < self.leg_count and t > 1.0:
+            next_t, next_lateral = self._leg_param(leg + 1, x, y)
+            if next_lateral > lateral:
+                break
+            leg, t, lateral = leg + 1, next_t, next_lateral
+        self.leg_index = leg
+        return leg, max(0.0, min(1.0, t)), lateral
+
+
+class ConformanceService:
+    """Checks each telemetry point of an ACTIVE flight against its precomputed route corridor."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._corridors: Dict[int, RouteCorridor] = {}
+
+    def start_monitoring(self, flight_plan: FlightPlan) -> None:
+        if not flight_plan.waypoints:
+            return
+        planned_departure = to_epoch(flight_plan.planned_departure_time)
+        duration = max(to_epoch(flight_plan.planned_arrival_time) - planned_departure, 0.0)
+        departure = to_epoch(flight_plan.actual_departure_time) if flight_plan.actual_departure_time else planned_departure
+        corridor = RouteCorridor(flight_plan.id, flight_plan.drone_id, flight_plan.waypoints, departure, duration)
+        with self._lock:
+            self._corridors[flight_plan.id] = corridor
+
+    def stop_monitoring(self, flight_plan_id: int) -> None:
+        with self._lock:
+            self._corridors.pop(flight_plan_id, None)
+
+    def is_monitoring(self, flight_plan_id: int) -> bool:
+        return flight_plan_id in self._corridors
+
+    def check(
+        self, flight_plan_id: int, *, latitude: float, longitude: float, altitude_m: float, timestamp: datetime
+    ) -> Tuple[Optional[str], List[ConformanceAlertMessage]]:
+        """
+        Returns (status message describing every current deviation, alerts that
+        just started). Unknown flights are not monitored and return (None, []).
+        """
+        corridor = self._corridors.get(flight_plan_id)
+        if corridor is None:
+            return None, []
+
+        x, y = corridor.projection.to_xy(latitude, longitude)
+        leg, t, lateral = corridor.locate(x, y)
+        if corridor.lengths:
+            expected_alt = corridor.alt[leg] + t * (corridor.alt[leg + 1] - corridor.alt[leg])
+            flown = corridor.cumulative[leg] + t * corridor.lengths[leg]
+        else:
+            expected_alt, flown = corridor.alt[0], 0.0
+        vertical = altitude_m - expected_alt
+        fraction = flown / corridor.total_length if corridor.total_length else 0.0
+        expected_epoch = corridor.departure_epoch + corridor.duration_s * fraction
+        schedule = to_epoch(timestamp) - expected_epoch # > 0: behind schedule
+
+        deviations: Dict[str, str] = {}
+        if lateral > settings.CONFORMANCE_LATERAL_TOLERANCE_M:
+            deviations["ROUTE_DEVIATION"] = f"{lateral:.0f} m off leg {leg + 1}"
+        if abs(vertical) > settings.CONFORMANCE_VERTICAL_TOLERANCE_M:
+            deviations["ALTITUDE_DEVIATION"] = f"{vertical:+.0f} m from planned altitude"
+        tolerance = settings.CONFORMANCE_SCHEDULE_TOLERANCE_SECONDS
+        if tolerance is not None and abs(schedule) > tolerance:
+            deviations["SCHEDULE_DEVIATION"] = f"{abs(schedule):.0f} s {'behind' if schedule > 0 else 'ahead of'} schedule"
+
+        new_alerts = [
+            ConformanceAlertMessage(
+                alert_type=alert_type,
+                flight_id=flight_plan_id,
+                drone_id=corridor.drone_id,
+                leg_index=leg,
+                lateral_deviation_m=round(lateral, 1),
+                vertical_deviation_m=round(vertical, 1),
+                schedule_deviation_s=round(schedule, 1),
+                lat=latitude,
+                lon=longitude,
+                alt=altitude_m,
+                timestamp=timestamp,
+            )
+            for alert_type in deviations
+            if alert_type not in corridor.active_alerts
+        ]
+        corridor.active_alerts = set(deviations)
+
+        if not deviations:
+            return None, new_alerts
+        return "; ".join(f"ALERT_{kind}: {detail}" for kind, detail in deviations.items()), new_alerts
+
+
+conformance_service = ConformanceService()
@@ -0,0 +1,286 @@
+# app/services/deconfliction_service.py
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.geo import LocalProjection, buffer_deg, haversine_m, segment_segment_distance
+from app.crud import flight_plan as crud_flight_plan
+from app.models.flight_plan import FlightPlan, FlightPlanStatus
+
+# Plans whose 4D volumes are reserved airspace
+DECONFLICTED_STATUSES = [FlightPlanStatus.APPROVED, FlightPlanStatus.ACTIVE]
+
+CellKey = Tuple[int, int, int]
+
+
+def to_epoch(value: datetime) -> float:
+    # Naive datetimes (e.g. from SQLite) are treated as UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class Leg:
+    """
+    One waypoint-to-waypoint segment of a plan as a 4D volume: the segment
+    buffered by the horizontal separation, during its scheduled time window
+    widened by the time buffer.
+    """
+
+    __slots__ = (
+        "plan_id", "lat0", "lon0", "alt0", "lat1", "lon1", "alt1",
+        "t_start", "t_end", "min_lat", "max_lat", "min_lon", "max_lon",
+    )
+
+    def __init__(self, plan_id: int, lat0: float, lon0: float, alt0: float, lat1: float, lon1: float, alt1: float,
+                 t_start: float, t_end: float, buffer_m: float):
+        self.plan_id = plan_id
+        self.lat0, self.lon0, self.alt0 = lat0, lon0, alt0
+        self.lat1, self.lon1, self.alt1 = lat1, lon1, alt1
+        self.t_start, self.t_end = t_start, t_end
+        dlat, dlon = buffer_deg(max(abs(lat0), abs(lat1)), buffer_m)
+        self.min_lat, self.max_lat = min(lat0, lat1) - dlat, max(lat0, lat1) + dlat
+        self.min_lon, self.max_lon = min(lon0, lon1) - dlon, max(lon0, lon1) + dlon
+
+    @property
+    def min_alt(self) -> float:
+        return min(self.alt0, self.alt1)
+
+    @property
+    def max_alt(self) -> float:
+        return max(self.alt0, self.alt1)
+
+
+def build_legs(plan_id: int, waypoints: Iterable, departure: datetime, arrival: datetime,
+               *, buffer_m: float, time_buffer_s: float) -> List[Leg]:
+    """
+    Split a route into legs timed by distance flown: the drone is assumed to
+    cover the route at constant ground speed between planned departure and arrival.
+    """
+    points = sorted(waypoints, key=lambda w: w.sequence_order)
+    if not points:
+        return []
+    t_dep = to_epoch(departure)
+    t_arr = max(to_epoch(arrival), t_dep)
+    if len(points) == 1:
+        p = points[0]
+        return [Leg(plan_id, p.latitude, p.longitude, p.altitude_m, p.latitude, p.longitude, p.altitude_m,
+                    t_dep - time_buffer_s, t_arr + time_buffer_s, buffer_m)]
+
+    lengths = [
+        haversine_m(a.latitude, a.longitude, b.latitude, b.longitude)
+        for a, b in zip(points, points[1:])
+    ]
+    total = sum(lengths)
+    duration = t_arr - t_dep
+    legs: List[Leg] = []
+    flown = 0.0
+    for (a, b), length in zip(zip(points, points[1:]), lengths):
+        if total > 0:
+            t0 = t_dep + duration * flown / total
+            t1 = t_dep + duration * (flown + length) / total
+        else: # Hover-only route: every leg spans the whole window
+            t0, t1 = t_dep, t_arr
+        flown += length
+        legs.append(Leg(plan_id, a.latitude, a.longitude, a.altitude_m, b.latitude, b.longitude, b.altitude_m,
+                        t0 - time_buffer_s, t1 + time_buffer_s, buffer_m))
+    return legs
+
+
+def legs_conflict(a: Leg, b: Leg, horizontal_sep_m: float, vertical_sep_m: float) -> bool:
+    """Exact check: overlapping time windows, altitude bands and horizontal separation."""
+    if a.t_end < b.t_start or b.t_end < a.t_start:
+        return False
+    if max(a.min_alt - b.max_alt, b.min_alt - a.max_alt) >= vertical_sep_m:
+        return False
+    if a.max_lat < b.min_lat or b.max_lat < a.min_lat or a.max_lon < b.min_lon or b.max_lon < a.min_lon:
+        return False
+    proj = LocalProjection((a.lat0 + b.lat0) / 2, (a.lon0 + b.lon0) / 2)
+    ax, ay = proj.to_xy(a.lat0, a.lon0)
+    bx, by = proj.to_xy(a.lat1, a.lon1)
+    cx, cy = proj.to_xy(b.lat0, b.lon0)
+    dx, dy = proj.to_xy(b.lat1, b.lon1)
+    return segment_segment_distance(ax, ay, bx, by, cx, cy, dx, dy) < horizontal_sep_m
+
+
+class SpatioTemporalIndex:
+    """
+    Uniform grid over lat/lon cells x time buckets. Each leg is registered in
+    every cell its buffered bounding box and time window touch, so a query only
+    looks at legs sharing at least one cell.
+    """
+
+    def __init__(self, cell_deg: float, time_bucket_s: float):
+        self.cell_deg = cell_deg
+        self.time_bucket_s = time_bucket_s
+        self._cells: Dict[CellKey, List[int]] = {}
+        self._legs: Dict[int, Leg] = {}
+        self._plan_legs: Dict[int, List[int]] = {}
+        self._plan_end: Dict[int, float] = {}
+        self._next_leg_id = 0
+
+    def __len__(self) -> int:
+        return len(self._plan_legs)
+
+    def _cell_keys(self, leg: Leg) -> Iterator[CellKey]:
+        size = self.cell_deg
+        bucket = self.time_bucket_s
+        for i in range(math.floor(leg.min_lat / size), math.floor(leg.max_lat / size) + 1):
+            for j in range(math.floor(leg.min_lon / size), math.floor(leg.max_lon / size) + 1):
+                for k in range(math.floor(leg.t_start / bucket), math.floor(leg.t_end / bucket) + 1):
+                    yield i, j, k
+
+    def insert(self, plan_id: int, legs: List[Leg]) -> None:
+        self.remove(plan_id)
+        if not legs:
+            return
+        leg_ids = []
+        for leg in legs:
+            leg_id = self._next_leg_id
+            self._next_leg_id += 1
+            self._legs[leg_id] = leg
+            leg_ids.append(leg_id)
+            for key in self._cell_keys(leg):
+                self._cells.setdefault(key, []).append(leg_id)
+        self._plan_legs[plan_id] = leg_ids
+        self._plan_end[plan_id] = max(leg.t_end for leg in legs)
+
+    def remove(self, plan_id: int) -> None:
+        leg_ids = self._plan_legs.pop(plan_id, None)
+        if not leg_ids:
+            return
+        self._plan_end.pop(plan_id, None)
+        for leg_id in leg_ids:
+            leg = self._legs.pop(leg_id)
+            for key in self._cell_keys(leg):
+                bucket = self._cells.get(key)
+                if bucket is not None:
+                    bucket.remove(leg_id)
+                    if not bucket:
+                        del self._cells[key]
+
+    def purge_ended_before(self, epoch: float) -> int:
+        expired = [plan_id for plan_id, end in self._plan_end.items() if end < epoch]
+        for plan_id in expired:
+            self.remove(plan_id)
+        return len(expired)
+
+    def candidates(self, leg: Leg) -> Iterator[Leg]:
+        seen = set()
+        for key in self._cell_keys(leg):
+            for leg_id in self._cells.get(key, ()):
+                if leg_id not in seen:
+                    seen.add(leg_id)
+                    yield self._legs[leg_id]
+
+
+class DeconflictionService:
+    """
+    Strategic deconfliction of flight plans against the 4D volumes of every
+    APPROVED/ACTIVE plan. The index is built lazily from the database on first
+    use and then kept current by FlightService / TelemetryService hooks.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._index: Optional[SpatioTemporalIndex] = None
+        self._built_at = 0.0
+        self._purged_at = 0.0
+
+    def _legs(self, plan_id: int, waypoints: Iterable, departure: datetime, arrival: datetime) -> List[Leg]:
+        return build_legs(
+            plan_id, waypoints, departure, arrival,
+            buffer_m=settings.DECONFLICTION_HORIZONTAL_SEPARATION_M,
+            time_buffer_s=settings.DECONFLICTION_TIME_BUFFER_SECONDS,
+        )
+
+    def rebuild(self, db: Session) -> SpatioTemporalIndex:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.DECONFLICTION_TIME_BUFFER_SECONDS)
+        plans = crud_flight_plan.get_with_waypoints_by_status(db, statuses=DECONFLICTED_STATUSES, arriving_after=cutoff)
+        index = SpatioTemporalIndex(settings.DECONFLICTION_GRID_CELL_DEG, settings.DECONFLICTION_TIME_BUCKET_SECONDS)
+        for plan in plans:
+            index.insert(plan.id, self._legs(plan.id, plan.waypoints, plan.planned_departure_time, plan.planned_arrival_time))
+        with self._lock:
+            self._index = index
+            self._built_at = self._purged_at = time.monotonic()
+        return index
+
+    def _ensure_index(self, db: Session) -> SpatioTemporalIndex:
+        refresh = settings.DECONFLICTION_INDEX_REFRESH_SECONDS
+        now = time.monotonic()
+        if self._index is None or (refresh and now - self._built_at > refresh):
+            return self.rebuild(db)
+        if now - self._purged_at > settings.DECONFLICTION_TIME_BUCKET_SECONDS:
+            self._index.purge_ended_before(time.time())
+            self._purged_at = now
+        return self._index
+
+    def find_conflicts(
+        self,
+        db: Session,
+        *,
+        waypoints: Iterable,
+        planned_departure_time: datetime,
+        planned_arrival_time: datetime,
+        exclude_plan_id: Optional[int] = None,
+    ) -> List[int]:
+        """
+        IDs of APPROVED/ACTIVE plans whose 4D volume overlaps the given route.
+        `waypoints` may be Waypoint rows or WaypointCreate schemas.
+        """
+        if not settings.DECONFLICTION_ENABLED:
+            return []
+        legs = self._legs(-1, waypoints, planned_departure_time, planned_arrival_time)
+        horizontal = settings.DECONFLICTION_HORIZONTAL_SEPARATION_M
+        vertical = settings.DECONFLICTION_VERTICAL_SEPARATION_M
+        conflicts = set()
+        with self._lock:
+            index = self._ensure_index(db)
+            for leg in legs:
+                for other in index.candidates(leg):
+                    if other.plan_id in conflicts or other.plan_id == exclude_plan_id:
+                        continue
+                    if legs_conflict(leg, other, horizontal, vertical):
+                        conflicts.add(other.plan_id)
+        return sorted(conflicts)
+
+    def find_conflicts_among(
+        self,
+        *,
+        waypoints: Iterable,
+        planned_departure_time: datetime,
+        planned_arrival_time: datetime,
+        plans: Iterable[FlightPlan],
+    ) -> List[int]:
+        """IDs of the given (not indexed) plans whose 4D volume overlaps the route, e.g. other pending plans."""
+        legs = self._legs(-1, waypoints, planned_departure_time, planned_arrival_time)
+        horizontal = settings.DECONFLICTION_HORIZONTAL_SEPARATION_M
+        vertical = settings.DECONFLICTION_VERTICAL_SEPARATION_M
+        conflicts = []
+        for plan in plans:
+            other_legs = self._legs(plan.id, plan.waypoints, plan.planned_departure_time, plan.planned_arrival_time)
+            if any(legs_conflict(leg, other, horizontal, vertical) for leg in legs for other in other_legs):
+                conflicts.append(plan.id)
+        return sorted(conflicts)
+
+    def add_plan(self, flight_plan: FlightPlan) -> None:
+        # Before the first build there is nothing to update; the build reads the committed plan.
+        if self._index is None:
+            return
+        legs = self._legs(flight_plan.id, flight_plan.waypoints, flight_plan.planned_departure_time, flight_plan.planned_arrival_time)
+        with self._lock:
+            self._index.insert(flight_plan.id, legs)
+
+    def remove_plan(self, flight_plan_id: int) -> None:
+        if self._index is None:
+            return
+        with self._lock:
+            self._index.remove(flight_plan_id)
+
+
+deconfliction_service = DeconflictionService()
@@ -1,17 +1,123 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
 from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.geo import LocalProjection, buffer_deg, haversine_m, polyline_polygon_distance
 from app.models.user import User, UserRole
 from app.models.flight_plan import FlightPlan, FlightPlanStatus
 from app.models.drone import Drone, DroneStatus
-from app.schemas.flight_plan import FlightPlanCreate
+from app.schemas.flight_plan import FlightPlanCreate, FlightPlanDecision, FlightPlanDecisionResult
 from app.crud import flight_plan as crud_flight_plan
 from app.crud import drone as crud_drone
 from app.services.nfz_service import NFZService # For NFZ checks
+from app.services.deconfliction_service import DeconflictionService, deconfliction_service
 from app.services.telemetry_service import telemetry_service # To start simulation
+from app.services.conformance_service import conformance_service
 from app.models.drone import DroneStatus
 
+# Plans still awaiting a decision; overlaps between them are counted, not rejected
+PENDING_STATUSES = [FlightPlanStatus.PENDING_ORG_APPROVAL, FlightPlanStatus.PENDING_AUTHORITY_APPROVAL]
+
 class FlightService:
-    def __init__(self, nfz_service: NFZService = NFZService()): # Allow injecting for tests
+    def __init__(
+        self,
+        nfz_service: NFZService = NFZService(), # Allow injecting for tests
+        deconfliction_service: DeconflictionService = deconfliction_service, # Shared index of approved plans
+    ):
         self.nfz_service = nfz_service
+        self.deconfliction_service = deconfliction_service
+
+    def _route_summary(self, db: Session, flight_plan_in: FlightPlanCreate) -> Tuple[Dict[str, Any], List[int]]:
+        """
+        Summary columns stored with a new plan, and the IDs of pending plans
+        that overlap it in 4D (their overlap_count goes up by one as well).
+        """
+        points = sorted(flight_plan_in.waypoints, key=lambda w: w.sequence_order)
+        if not points:
+            return {}, []
+        lats = [p.latitude for p in points]
+        lons = [p.longitude for p in points]
+        summary: Dict[str, Any] = {
+            "route_length_m": sum(
+                haversine_m(a.latitude, a.longitude, b.latitude, b.longitude) for a, b in zip(points, points[1:])
+            ),
+            "bbox_min_lat": min(lats),
+            "bbox_min_lon": min(lons),
+            "bbox_max_lat": max(lats),
+            "bbox_max_lon": max(lons),
+            "min_altitude_m": min(p.altitude_m for p in points),
+            "max_altitude_m": max(p.altitude_m for p in points),
+        }
+
+        zones = self.nfz_service.active_zones_during(db, flight_plan_in.planned_departure_time, flight_plan_in.planned_arrival_time)
+        nearest_nfz, distance = self.nfz_service.nearest_zone(points, zones)
+        summary["nearest_nfz_id"] = nearest_nfz.id if nearest_nfz else None
+        summary["nearest_nfz_distance_m"] = distance
+
+        overlapping_ids = self._pending_overlaps(
+            db,
+            points=points,
+            bbox=(summary["bbox_min_lat"], summary["bbox_min_lon"], summary["bbox_max_lat"], summary["bbox_max_lon"]),
+            planned_departure_time=flight_plan_in.planned_departure_time,
+            planned_arrival_time=flight_plan_in.planned_arrival_time,
+        )
+        summary["overlap_count"] = len(overlapping_ids)
+        return summary, overlapping_ids
+
+    def _pending_overlaps(
+        self,
+        db: Session,
+        *,
+        points: List[Any],
+        bbox: Tuple[float, float, float, float],
+        planned_departure_time: datetime,
+        planned_arrival_time: datetime,
+        exclude_plan_id: Optional[int] = None,
+    ) -> List[int]:
+        """IDs of pending plans overlapping the route in 4D."""
+        # Stored bboxes narrow the candidates; the leg-by-leg check decides
+        min_lat, min_lon, max_lat, max_lon = bbox
+        dlat, dlon = buffer_deg(max(abs(min_lat), abs(max_lat)), settings.DECONFLICTION_HORIZONTAL_SEPARATION_M)
+        slack = timedelta(seconds=2 * settings.DECONFLICTION_TIME_BUFFER_SECONDS)
+        candidates = crud_flight_plan.get_overlap_candidates(
+            db,
+            statuses=PENDING_STATUSES,
+            min_lat=min_lat - dlat,
+            min_lon=min_lon - dlon,
+            max_lat=max_lat + dlat,
+            max_lon=max_lon + dlon,
+            departs_before=planned_arrival_time + slack,
+            arrives_after=planned_departure_time - slack,
+        )
+        # Plans already decided earlier in the same (uncommitted) batch still read as pending
+        candidates = [plan for plan in candidates if plan.id != exclude_plan_id and plan.status in PENDING_STATUSES]
+        return self.deconfliction_service.find_conflicts_among(
+            waypoints=points,
+            planned_departure_time=planned_departure_time,
+            planned_arrival_time=planned_arrival_time,
+            plans=candidates,
+        )
+
+    def _release_overlaps(self, db: Session, db_flight_plan: FlightPlan, *, new_status: FlightPlanStatus) -> None:
+        """
+        A plan leaving the pending statuses (approved, rejected, cancelled) stops
+        counting towards the overlap_count of the pending plans it overlaps.
+        Call before the status changes; staged only.
+        """
+        if db_flight_plan.status not in PENDING_STATUSES or new_status in PENDING_STATUSES:
+            return
+        if db_flight_plan.bbox_min_lat is None: # Submitted without a summary
+            return
+        overlapping_ids = self._pending_overlaps(
+            db,
+            points=sorted(db_flight_plan.waypoints, key=lambda w: w.sequence_order),
+            bbox=(db_flight_plan.bbox_min_lat, db_flight_plan.bbox_min_lon, db_flight_plan.bbox_max_lat, db_flight_plan.bbox_max_lon),
+            planned_departure_time=db_flight_plan.planned_departure_time,
+            planned_arrival_time=db_flight_plan.planned_arrival_time,
+            exclude_plan_id=db_flight_plan.id,
+        )
+        crud_flight_plan.decrement_overlap_count(db, ids=overlapping_ids)
 
     def submit_flight_plan(
         self, 
@@ -43,16 +149,29 @@ class FlightService:
         else:
             raise ValueError("Invalid user role for submitting flight plans.")
 
-        # 2. Perform NFZ Pre-check (Simplified)
-        # This would involve checking waypoints against RestrictedZone geometries
-        # For now, a placeholder
-        nfz_violations = self.nfz_service.check_flight_plan_against_nfzs(db, flight_plan_in.waypoints)
+        # 2. NFZ pre-check against the zones in effect during the plan's time envelope
+        nfz_violations = self.nfz_service.check_flight_plan_against_nfzs(
+            db,
+            flight_plan_in.waypoints,
+            planned_departure_time=flight_plan_in.planned_departure_time,
+            planned_arrival_time=flight_plan_in.planned_arrival_time,
+        )
         if nfz_violations:
             # For MVP, we might just raise an error or log it.
             # A real system might allow submission with warnings or require modification.
             raise ValueError(f"Flight plan intersects with No-Fly Zones: {', '.join(nfz_violations)}")
 
-        # 3. Determine initial status
+        # 3. Strategic deconfliction against APPROVED/ACTIVE plans
+        conflicting_ids = self.deconfliction_service.find_conflicts(
+            db,
+            waypoints=flight_plan_in.waypoints,
+            planned_departure_time=flight_plan_in.planned_departure_time,
+            planned_arrival_time=flight_plan_in.planned_arrival_time,
+        )
+        if conflicting_ids:
+            raise ValueError(f"Flight plan conflicts with approved flight plans: {', '.join(map(str, conflicting_ids))}")
+
+        # 4. Determine initial status
         initial_status: FlightPlanStatus
         if submitter.role == UserRole.SOLO_PILOT:
             initial_status = FlightPlanStatus.PENDING_AUTHORITY_APPROVAL
@@ -62,29 +181,33 @@ class FlightService:
         else: # Should not happen due to earlier check
             raise ValueError("Cannot determine initial flight plan status for user role.")
 
-        # 4. Create Flight Plan
+        # 5. Route summary, persisted so reviewers and list views never re-derive it
+        summary, overlapping_ids = self._route_summary(db, flight_plan_in)
+        crud_flight_plan.increment_overlap_count(db, ids=overlapping_ids)
+
+        # 6. Create Flight Plan (commits the overlap counts too)
         created_flight_plan = crud_flight_plan.create_with_waypoints(
             db, 
             obj_in=flight_plan_in, 
             user_id=submitter.id,
             organization_id=organization_id,
-            initial_status=initial_status
+            initial_status=initial_status,
+            summary=summary,
         )
         return created_flight_plan
 
-    def update_flight_plan_status(
+    def _check_status_transition(
         self,
-        db: Session,
+        db_flight_plan: FlightPlan,
         *,
-        flight_plan_id: int,
         new_status: FlightPlanStatus,
-        actor: User, # User performing the action
+        actor: User,
         rejection_reason: str | None = None,
-    ) -> FlightPlan:
-        db_flight_plan = crud_flight_plan.get(db, id=flight_plan_id)
-        if not db_flight_plan:
-            raise ValueError("Flight plan not found.")
-
+    ) -> bool:
+        """
+        Raises ValueError if `actor` may not move the plan to `new_status`.
+        Returns True when this is the organization approval step.
+        """
         current_status = db_flight_plan.status
         is_org_approval_step = False
 
@@ -125,7 +248,41 @@ class FlightService:
         else:
             raise ValueError("User role not authorized to update flight plan status.")
 
-        return crud_flight_plan.update_status(
+        return is_org_approval_step
+
+    def _check_approval_conflicts(self, db: Session, db_flight_plan: FlightPlan) -> None:
+        # Other plans may have been approved since submission
+        conflicting_ids = self.deconfliction_service.find_conflicts(
+            db,
+            waypoints=db_flight_plan.waypoints,
+            planned_departure_time=db_flight_plan.planned_departure_time,
+            planned_arrival_time=db_flight_plan.planned_arrival_time,
+            exclude_plan_id=db_flight_plan.id,
+        )
+        if conflicting_ids:
+            raise ValueError(f"Flight plan conflicts with approved flight plans: {', '.join(map(str, conflicting_ids))}")
+
+    def update_flight_plan_status(
+        self,
+        db: Session,
+        *,
+        flight_plan_id: int,
+        new_status: FlightPlanStatus,
+        actor: User, # User performing the action
+        rejection_reason: str | None = None,
+    ) -> FlightPlan:
+        db_flight_plan = crud_flight_plan.get(db, id=flight_plan_id)
+        if not db_flight_plan:
+            raise ValueError("Flight plan not found.")
+
+        is_org_approval_step = self._check_status_transition(
+            db_flight_plan, new_status=new_status, actor=actor, rejection_reason=rejection_reason
+        )
+        if new_status == FlightPlanStatus.APPROVED:
+            self._check_approval_conflicts(db, db_flight_plan)
+        self._release_overlaps(db, db_flight_plan, new_status=new_status)
+
+        updated_flight_plan = crud_flight_plan.update_status(
             db, 
             db_obj=db_flight_plan, 
             new_status=new_status, 
@@ -133,6 +290,138 @@ class FlightService:
             approver_id=actor.id,
             is_org_approval=is_org_approval_step
         )
+        if updated_flight_plan.status == FlightPlanStatus.APPROVED:
+            self.deconfliction_service.add_plan(updated_flight_plan)
+        return updated_flight_plan
+
+    def batch_update_flight_plan_status(
+        self,
+        db: Session,
+        *,
+        decisions: List[FlightPlanDecision],
+        actor: User,
+    ) -> List[FlightPlanDecisionResult]:
+        """
+        Apply many status decisions with the same rules as update_flight_plan_status:
+        one query loads every plan, each decision is validated in memory, and all
+        valid ones are committed together. Invalid decisions are reported per item
+        and leave their plan untouched.
+        """
+        plans = {fp.id: fp for fp in crud_flight_plan.get_multi_by_ids(db, ids=[d.flight_plan_id for d in decisions])}
+        results: List[FlightPlanDecisionResult] = []
+        approved_ids: List[int] = []
+        for decision in decisions:
+            db_flight_plan = plans.get(decision.flight_plan_id)
+            try:
+                if not db_flight_plan:
+                    raise ValueError("Flight plan not found.")
+                is_org_approval_step = self._check_status_transition(
+                    db_flight_plan, new_status=decision.status, actor=actor, rejection_reason=decision.rejection_reason
+                )
+                if decision.status == FlightPlanStatus.APPROVED:
+                    self._check_approval_conflicts(db, db_flight_plan)
+                self._release_overlaps(db, db_flight_plan, new_status=decision.status)
+                crud_flight_plan.update_status(
+                    db,
+                    db_obj=db_flight_plan,
+                    new_status=decision.status,
+                    rejection_reason=decision.rejection_reason,
+                    approver_id=actor.id,
+                    is_org_approval=is_org_approval_step,
+                    commit=False,
+                )
+                if decision.status == FlightPlanStatus.APPROVED:
+                    # Indexed right away so later decisions in the batch are checked against it
+                    self.deconfliction_service.add_plan(db_flight_plan)
+                    approved_ids.append(db_flight_plan.id)
+                results.append(FlightPlanDecisionResult(flight_plan_id=decision.flight_plan_id, success=True, status=decision.status))
+            except ValueError as e:
+                results.append(FlightPlanDecisionResult(
+                    flight_plan_id=decision.flight_plan_id,
+                    success=False,
+                    status=db_flight_plan.status if db_flight_plan else None,
+                    error=str(e),
+                ))
+
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            for flight_plan_id in approved_ids:
+                self.deconfliction_service.remove_plan(flight_plan_id)
+            raise
+        return results
+
+    def get_approval_queue(
+        self, db: Session, *, skip: int = 0, limit: int = 100
+    ) -> List[Tuple[FlightPlan, List[int], List[str]]]:
+        """PENDING_AUTHORITY_APPROVAL plans with their current 4D conflicts and NFZ violations."""
+        plans = crud_flight_plan.get_queue(
+            db, statuses=[FlightPlanStatus.PENDING_AUTHORITY_APPROVAL], skip=skip, limit=limit
+        )
+        queue = []
+        for db_flight_plan in plans:
+            conflicting_ids = self.deconfliction_service.find_conflicts(
+                db,
+                waypoints=db_flight_plan.waypoints,
+                planned_departure_time=db_flight_plan.planned_departure_time,
+                planned_arrival_time=db_flight_plan.planned_arrival_time,
+                exclude_plan_id=db_flight_plan.id,
+            )
+            nfz_violations = self.nfz_service.check_flight_plan_against_nfzs(
+                db,
+                db_flight_plan.waypoints,
+                planned_departure_time=db_flight_plan.planned_departure_time,
+                planned_arrival_time=db_flight_plan.planned_arrival_time,
+            )
+            queue.append((db_flight_plan, conflicting_ids, nfz_violations))
+        return queue
+
+    def search_by_area(
+        self,
+        db: Session,
+        *,
+        polygon: List[List[float]],
+        start_time: datetime,
+        end_time: datetime,
+        statuses: Optional[List[FlightPlanStatus]] = None,
+        skip: int = 0,
+        limit: int = 100,
+        batch_size: int = 500,
+    ) -> List[FlightPlan]:
+        """
+        Plans scheduled within [start_time, end_time] whose route crosses or lies
+        inside `polygon` (GeoJSON [lon, lat] ring), ordered by id. Stored bounding
+        boxes narrow the candidates in SQL; routes are then checked exactly, so
+        skip/limit apply to the exact matches.
+        """
+        if end_time < start_time:
+            raise ValueError("end_time must not be before start_time.")
+        if any(len(vertex) < 2 for vertex in polygon):
+            raise ValueError("Polygon vertices must be [longitude, latitude] pairs.")
+        lons = [vertex[0] for vertex in polygon]
+        lats = [vertex[1] for vertex in polygon]
+        projection = LocalProjection((min(lats) + max(lats)) / 2, (min(lons) + max(lons)) / 2)
+        ring = [projection.to_xy(lat, lon) for lon, lat, *_ in polygon]
+
+        matches: List[FlightPlan] = []
+        after_id = 0
+        while len(matches) < skip + limit:
+            candidates = crud_flight_plan.get_area_candidates(
+                db,
+                min_lat=min(lats), min_lon=min(lons), max_lat=max(lats), max_lon=max(lons),
+                start_time=start_time, end_time=end_time, statuses=statuses,
+                after_id=after_id, limit=batch_size,
+            )
+            for db_flight_plan in candidates:
+                points = sorted(db_flight_plan.waypoints, key=lambda w: w.sequence_order)
+                route = [projection.to_xy(p.latitude, p.longitude) for p in points]
+                if route and polyline_polygon_distance(route, ring) == 0.0:
+                    matches.append(db_flight_plan)
+            if len(candidates) < batch_size:
+                break
+            after_id = candidates[-1].id
+        return matches[skip:skip + limit]
 
     def start_flight(self, db: Session, *, flight_plan_id: int, pilot: User) -> FlightPlan:
         db_flight_plan = crud_flight_plan.get(db, id=flight_plan_id)
@@ -144,6 +433,8 @@ class FlightService:
             raise ValueError(f"Flight plan must be APPROVED to start. Current status: {db_flight_plan.status}")
 
         started_flight = crud_flight_plan.start_flight(db, db_obj=db_flight_plan)
+        # Route corridor is fixed at departure; telemetry is checked against it from here on
+        conformance_service.start_monitoring(started_flight)
         
         # Start telemetry simulation for this flight
         telemetry_service.start_flight_simulation(db, flight_plan=started_flight)
@@ -193,6 +484,10 @@ class FlightService:
                 crud_drone.update(db, db_obj=db_drone, obj_in={"current_status": DroneStatus.IDLE})
 
 
-        return crud_flight_plan.cancel_flight(db, db_obj=db_flight_plan, cancelled_by_role=cancelled_by_role_type, reason=reason)
+        self._release_overlaps(db, db_flight_plan, new_status=FlightPlanStatus.CANCELLED_BY_ADMIN)
+        cancelled_flight = crud_flight_plan.cancel_flight(db, db_obj=db_flight_plan, cancelled_by_role=cancelled_by_role_type, reason=reason)
+        self.deconfliction_service.remove_plan(flight_plan_id) # Release the reserved airspace
+        conformance_service.stop_monitoring(flight_plan_id)
+        return cancelled_flight
 
 flight_service = FlightService() # Singleton instance
\ No newline at end of file
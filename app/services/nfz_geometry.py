@@ -0,0 +1,123 @@
+# app/services/nfz_geometry.py
+import math
+from typing import Any, Dict, List, Tuple
+
+from app.core.config import settings
+from app.core.geo import LocalProjection, buffer_deg, ring_self_intersects, ring_signed_area, simplify_line
+from app.models.restricted_zone import NFZGeometryType
+
+
+def _coordinate(value: Any, low: float, high: float, name: str) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number.")
+    if not math.isfinite(number) or not low <= number <= high:
+        raise ValueError(f"{name} must be between {low} and {high}.")
+    return number
+
+
+def _normalize_circle(definition: Dict[str, Any]) -> Dict[str, Any]:
+    for key in ("center_lat", "center_lon", "radius_m"):
+        if key not in definition:
+            raise ValueError(f"Circle definition requires {key}.")
+    lat = _coordinate(definition["center_lat"], -90.0, 90.0, "center_lat")
+    lon = _coordinate(definition["center_lon"], -180.0, 180.0, "center_lon")
+    radius = _coordinate(definition["radius_m"], 0.0, settings.NFZ_MAX_RADIUS_M, "radius_m")
+    if radius == 0.0:
+        raise ValueError("radius_m must be positive.")
+    dlat, dlon = buffer_deg(lat, radius)
+    return {
+        "definition_json": {"center_lat": lat, "center_lon": lon, "radius_m": radius},
+        "bbox_min_lat": lat - dlat,
+        "bbox_min_lon": lon - dlon,
+        "bbox_max_lat": lat + dlat,
+        "bbox_max_lon": lon + dlon,
+        "centroid_lat": lat,
+        "centroid_lon": lon,
+        "projected_json": None, # Circles are checked against center and radius directly
+    }
+
+
+def _normalize_polygon(definition: Dict[str, Any]) -> Dict[str, Any]:
+    rings = definition.get("coordinates")
+    if not isinstance(rings, list) or not rings or not isinstance(rings[0], list):
+        raise ValueError("Polygon definition requires coordinates: [[[lon, lat], ...]].")
+    if len(rings) > 1:
+        raise ValueError("Polygon holes are not supported; provide only the outer ring.")
+
+    ring: List[Tuple[float, float]] = []
+    for vertex in rings[0]:
+        if not isinstance(vertex, (list, tuple)) or len(vertex) < 2:
+            raise ValueError("Polygon vertices must be [lon, lat] pairs.")
+        point = (_coordinate(vertex[0], -180.0, 180.0, "longitude"), _coordinate(vertex[1], -90.0, 90.0, "latitude"))
+        if not ring or point != ring[-1]: # Drop repeated vertices
+            ring.append(point)
+    if len(ring) > 1 and ring[0] == ring[-1]:
+        ring.pop()
+    if len(ring) < 3:
+        raise ValueError("Polygon needs at least 3 distinct vertices.")
+    ring.append(ring[0]) # Closed
+
+    # Validate, orient and simplify in local meters
+    lons = [p[0] for p in ring]
+    lats = [p[1] for p in ring]
+    projection = LocalProjection((min(lats) + max(lats)) / 2, (min(lons) + max(lons)) / 2)
+    xy = [projection.to_xy(lat, lon) for lon, lat in ring]
+    budget = settings.NFZ_MAX_POLYGON_VERTICES
+    original, tolerance = xy, 1.0
+    while len(xy) - 1 > budget:
+        simplified = simplify_line(original, tolerance)
+        if len(simplified) < 4: # Would collapse; keep the last valid ring
+            break
+        xy = simplified
+        tolerance *= 2
+    if ring_self_intersects(xy):
+        raise ValueError("Polygon edges must not cross each other.")
+    area = ring_signed_area(xy)
+    if abs(area) < 1.0:
+        raise ValueError("Polygon has no area.")
+    if area < 0: # RFC 7946: exterior rings are counter-clockwise
+        xy.reverse()
+        area = -area
+
+    # Area centroid of the ring
+    cx = cy = 0.0
+    for (ax, ay), (bx, by) in zip(xy, xy[1:]):
+        cross = ax * by - bx * ay
+        cx += (ax + bx) * cross
+        cy += (ay + by) * cross
+    centroid_lat, centroid_lon = projection.to_latlon(cx / (6 * area), cy / (6 * area))
+
+    lonlat = [projection.to_latlon(x, y)[::-1] for x, y in xy]
+    # Stored projection is centered on the centroid for the runtime checks
+    local = LocalProjection(centroid_lat, centroid_lon)
+    return {
+        "definition_json": {"coordinates": [[[round(lon, 7), round(lat, 7)] for lon, lat in lonlat]]},
+        "bbox_min_lat": min(p[1] for p in lonlat),
+        "bbox_min_lon": min(p[0] for p in lonlat),
+        "bbox_max_lat": max(p[1] for p in lonlat),
+        "bbox_max_lon": max(p[0] for p in lonlat),
+        "centroid_lat": centroid_lat,
+        "centroid_lon": centroid_lon,
+        "projected_json": {
+            "ref_lat": centroid_lat,
+            "ref_lon": centroid_lon,
+            "ring": [[round(x, 2), round(y, 2)] for x, y in (local.to_xy(lat, lon) for lon, lat in lonlat)],
+        },
+    }
+
+
+def normalize_zone_geometry(geometry_type: NFZGeometryType, definition: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validated, normalized zone geometry as RestrictedZone column values:
+    definition_json, bbox, centroid and (polygons) the ring in local meters.
+    Raises ValueError for malformed definitions.
+    """
+    if not isinstance(definition, dict):
+        raise ValueError("definition_json must be an object.")
+    if geometry_type == NFZGeometryType.CIRCLE:
+        return _normalize_circle(definition)
+    if geometry_type == NFZGeometryType.POLYGON:
+        return _normalize_polygon(definition)
+    raise ValueError(f"Unsupported geometry type: {geometry_type}")
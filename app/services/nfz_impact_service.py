@@ -0,0 +1,122 @@
+# app/services/nfz_impact_service.py
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+from typing import List
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import flight_plan as crud_flight_plan
+from app.crud import restricted_zone as crud_restricted_zone
+from app.db.session import SessionLocal
+from app.models.flight_plan import FlightPlanStatus
+from app.models.restricted_zone import RestrictedZone
+from app.schemas.restricted_zone import NFZImpactedFlight, NFZImpactReport
+from app.schemas.telemetry import NFZImpactAlertMessage
+from app.services.conflict_detection_service import ConflictDetectionService, conflict_detection_service
+from app.services.nfz_schedule_index import zone_active_during
+from app.services.nfz_service import NFZService, nfz_service
+from app.services.telemetry_service import telemetry_service
+
+# Plans a newly active zone can still affect
+IMPACTED_STATUSES = [
+    FlightPlanStatus.PENDING_ORG_APPROVAL,
+    FlightPlanStatus.PENDING_AUTHORITY_APPROVAL,
+    FlightPlanStatus.APPROVED,
+    FlightPlanStatus.ACTIVE,
+]
+
+
+class NFZImpactService:
+    """
+    Which unfinished flight plans and live drones a zone affects. Plans are
+    narrowed by the indexed route-summary bbox/altitude columns and then checked
+    exactly against the zone geometry during the zone's activation windows; live
+    drones come from the tactical detector's in-memory positions.
+    """
+
+    def __init__(
+        self,
+        nfz_service: NFZService = nfz_service,
+        conflict_detection_service: ConflictDetectionService = conflict_detection_service,
+    ):
+        self.nfz_service = nfz_service
+        self.conflict_detection_service = conflict_detection_service
+
+    def analyze(self, db: Session, nfz: RestrictedZone) -> NFZImpactReport:
+        now = datetime.now(timezone.utc)
+        report = NFZImpactReport(zone_id=nfz.id, zone_name=nfz.name, computed_at=now, candidate_count=0)
+        bounds = self.nfz_service.zone_bounds(nfz)
+        if bounds is None:
+            return report
+        min_lat, min_lon, max_lat, max_lon = bounds
+
+        rows = crud_flight_plan.get_zone_impact_waypoints(
+            db,
+            statuses=IMPACTED_STATUSES,
+            min_lat=min_lat, min_lon=min_lon, max_lat=max_lat, max_lon=max_lon,
+            arriving_after=now - timedelta(seconds=settings.DECONFLICTION_TIME_BUFFER_SECONDS),
+            min_altitude_m=nfz.min_altitude_m,
+            max_altitude_m=nfz.max_altitude_m,
+        )
+        affected: List[NFZImpactedFlight] = []
+        for flight_plan_id, plan_rows in groupby(rows, key=lambda row: row.flight_plan_id):
+            waypoints = list(plan_rows) # Already in sequence order
+            first = waypoints[0]
+            if not zone_active_during(nfz, first.planned_departure_time, first.planned_arrival_time):
+                continue # Zone not in effect while this plan flies
+            report.candidate_count += 1
+            if self.nfz_service.route_distance_to_zone(waypoints, nfz) == 0.0:
+                affected.append(NFZImpactedFlight(
+                    flight_plan_id=flight_plan_id,
+                    drone_id=first.drone_id,
+                    status=first.status,
+                    reason="ROUTE_INTERSECTS",
+                ))
+
+        live_states = self.conflict_detection_service.positions() if zone_active_during(nfz, now, now) else []
+        for state in live_states:
+            if not (min_lat <= state.lat <= max_lat and min_lon <= state.lon <= max_lon):
+                continue
+            if self.nfz_service.point_in_zone(state.lat, state.lon, state.alt, nfz):
+                affected.append(NFZImpactedFlight(
+                    flight_plan_id=state.flight_id,
+                    drone_id=state.drone_id,
+                    status=FlightPlanStatus.ACTIVE if state.flight_id else None,
+                    reason="DRONE_INSIDE",
+                ))
+        report.affected_flights = affected
+        return report
+
+    def alerts(self, report: NFZImpactReport) -> List[NFZImpactAlertMessage]:
+        return [
+            NFZImpactAlertMessage(
+                reason=flight.reason,
+                zone_id=report.zone_id,
+                zone_name=report.zone_name,
+                flight_id=flight.flight_plan_id,
+                drone_id=flight.drone_id,
+                flight_status=flight.status.value if flight.status else None,
+                timestamp=report.computed_at,
+            )
+            for flight in report.affected_flights
+        ]
+
+    def run_impact_job(self, zone_id: int) -> None:
+        """Background task after a zone is created or (re)activated: analyze and push alerts."""
+        db = SessionLocal()
+        try:
+            nfz = crud_restricted_zone.get(db, id=zone_id)
+            if not nfz or not nfz.is_active:
+                return
+            report = self.analyze(db, nfz)
+            for alert in self.alerts(report):
+                telemetry_service.broadcast_threadsafe(alert.model_dump(mode="json"))
+            print(f"NFZ {zone_id} impact: {len(report.affected_flights)} affected of {report.candidate_count} candidate plans")
+        except Exception as e:
+            print(f"NFZ impact job for zone {zone_id} failed: {e}")
+        finally:
+            db.close()
+
+
+nfz_impact_service = NFZImpactService()
@@ -0,0 +1,184 @@
+# app/services/nfz_map_service.py
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.geo import LocalProjection, clip_polygon_to_box, simplify_line
+from app.crud import restricted_zone as crud_restricted_zone
+from app.models.restricted_zone import NFZGeometryType
+from app.services.nfz_schedule_index import ZoneSnapshot, zone_schedule_index
+
+MAX_ZOOM = 22
+
+# (body, strong ETag)
+RenderedMap = Tuple[bytes, str]
+
+
+def _render(payload: Dict[str, Any]) -> RenderedMap:
+    body = orjson.dumps(payload)
+    return body, '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """(min_lon, min_lat, max_lon, max_lat) of a Web Mercator z/x/y tile."""
+    n = 2 ** z
+    lon_min, lon_max = x / n * 360.0 - 180.0, (x + 1) / n * 360.0 - 180.0
+    lat_max = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    lat_min = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    return lon_min, lat_min, lon_max, lat_max
+
+
+def zone_ring(zone: ZoneSnapshot) -> Optional[List[Tuple[float, float]]]:
+    """Closed [lon, lat] outer ring; circles are approximated by NFZ_MAP_CIRCLE_SEGMENTS vertices."""
+    definition = zone.definition_json or {}
+    try:
+        if zone.geometry_type == NFZGeometryType.CIRCLE:
+            lat, lon, radius = float(definition["center_lat"]), float(definition["center_lon"]), float(definition["radius_m"])
+            projection = LocalProjection(lat, lon)
+            segments = settings.NFZ_MAP_CIRCLE_SEGMENTS
+            ring = []
+            for i in range(segments):
+                angle = 2 * math.pi * i / segments
+                point_lat, point_lon = projection.to_latlon(radius * math.sin(angle), radius * math.cos(angle))
+                ring.append((point_lon, point_lat))
+        else:
+            ring = [(float(v[0]), float(v[1])) for v in definition["coordinates"][0]]
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+    if len(ring) < 3:
+        return None
+    if ring[0] != ring[-1]:
+        ring.append(ring[0])
+    return ring
+
+
+class _MapFeature:
+    __slots__ = ("ring", "properties", "min_lon", "min_lat", "max_lon", "max_lat")
+
+    def __init__(self, ring: List[Tuple[float, float]], properties: Dict[str, Any]):
+        self.ring = ring
+        self.properties = properties
+        self.min_lon = min(p[0] for p in ring)
+        self.max_lon = max(p[0] for p in ring)
+        self.min_lat = min(p[1] for p in ring)
+        self.max_lat = max(p[1] for p in ring)
+
+
+class NFZMapService:
+    """
+    Map payloads for active zones, rendered once per zone snapshot: the full
+    GeoJSON FeatureCollection, and per-zoom z/x/y GeoJSON tiles with geometry
+    simplified to the tile resolution and clipped to the tile.
+
+    The endpoints read from the replica, so the map loads its own snapshot of
+    the zones instead of building the shared schedule index (which flight and
+    in-flight NFZ checks rely on) from a session that may lag. Any zone write
+    bumps the index version, which makes the next request reload; as a read
+    right after a write may still miss it on the replica, the snapshot is
+    also reloaded once older than NFZ_MAP_MAX_AGE_SECONDS. Cached tiles are
+    kept when a reload renders the same map.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = -1 # zone_schedule_index version the snapshot was loaded at
+        self._loaded_at = 0.0
+        self._features: List[_MapFeature] = []
+        self._full: Optional[RenderedMap] = None
+        self._tiles: "OrderedDict[Tuple[int, int, int], RenderedMap]" = OrderedDict()
+
+    def _ensure(self, db: Session) -> None:
+        version = zone_schedule_index.version # Read before loading: a write meanwhile triggers another load
+        if version == self._version and time.monotonic() - self._loaded_at < settings.NFZ_MAP_MAX_AGE_SECONDS:
+            return
+        zones = [ZoneSnapshot(zone) for zone in crud_restricted_zone.get_all_active_zones(db)]
+        features = []
+        for zone in sorted(zones, key=lambda z: z.id):
+            ring = zone_ring(zone)
+            if ring is None:
+                continue
+            features.append(_MapFeature(ring, {
+                "id": zone.id,
+                "name": zone.name,
+                "description": zone.description,
+                "geometry_type": zone.geometry_type.value,
+                "min_altitude_m": zone.min_altitude_m,
+                "max_altitude_m": zone.max_altitude_m,
+                "effective_from": zone.effective_from.isoformat() if zone.effective_from else None,
+                "effective_to": zone.effective_to.isoformat() if zone.effective_to else None,
+                "schedule": zone.schedule_json,
+            }))
+        full = _render({
+            "type": "FeatureCollection",
+            "features": [self._feature(f.ring, f.properties) for f in features],
+        })
+        with self._lock:
+            if self._full is None or full[1] != self._full[1]:
+                self._features = features
+                self._full = full
+                self._tiles = OrderedDict()
+            self._version = version
+            self._loaded_at = time.monotonic()
+
+    @staticmethod
+    def _feature(ring, properties: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "type": "Feature",
+            "id": properties["id"],
+            "geometry": {"type": "Polygon", "coordinates": [[list(p) for p in ring]]},
+            "properties": properties,
+        }
+
+    def geojson(self, db: Session) -> RenderedMap:
+        self._ensure(db)
+        return self._full
+
+    def tile(self, db: Session, z: int, x: int, y: int) -> RenderedMap:
+        if not 0 <= z <= MAX_ZOOM or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+            raise ValueError("Tile coordinates out of range.")
+        self._ensure(db)
+        key = (z, x, y)
+        with self._lock:
+            cached = self._tiles.get(key)
+            if cached is not None:
+                self._tiles.move_to_end(key)
+                return cached
+            features = self._features
+
+        min_lon, min_lat, max_lon, max_lat = tile_bounds(z, x, y)
+        pixel_deg = (max_lon - min_lon) / 256
+        tolerance = pixel_deg * settings.NFZ_MAP_SIMPLIFY_PIXELS
+        margin = pixel_deg * 4 # Clip just outside the tile so no edge is drawn on the border
+        tile_features = []
+        for feature in features:
+            if feature.max_lon < min_lon or feature.min_lon > max_lon or feature.max_lat < min_lat or feature.min_lat > max_lat:
+                continue
+            ring = simplify_line(feature.ring, tolerance)
+            if len(ring) < 4: # Smaller than a few pixels at this zoom: draw its bounding box
+                ring = [
+                    (feature.min_lon, feature.min_lat), (feature.max_lon, feature.min_lat),
+                    (feature.max_lon, feature.max_lat), (feature.min_lon, feature.max_lat),
+                ]
+            ring = clip_polygon_to_box(ring, min_lon - margin, min_lat - margin, max_lon + margin, max_lat + margin)
+            if len(ring) < 3:
+                continue
+            ring.append(ring[0])
+            tile_features.append(self._feature(ring, feature.properties))
+        rendered = _render({"type": "FeatureCollection", "features": tile_features})
+
+        with self._lock:
+            if self._features is features: # Not invalidated meanwhile
+                self._tiles[key] = rendered
+                while len(self._tiles) > settings.NFZ_MAP_TILE_CACHE_SIZE:
+                    self._tiles.popitem(last=False)
+        return rendered
+
+
+nfz_map_service = NFZMapService()
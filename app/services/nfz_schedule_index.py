@@ -0,0 +1,160 @@
+# app/services/nfz_schedule_index.py
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import restricted_zone as crud_restricted_zone
+from app.models.restricted_zone import RestrictedZone
+from app.services.deconfliction_service import to_epoch
+
+DAY_SECONDS = 24 * 3600
+
+
+class ZoneSnapshot:
+    """
+    Read-only copy of an active zone, so cached zones never touch a closed or
+    committed session. Duck-types RestrictedZone for the geometry helpers.
+    """
+
+    __slots__ = (
+        "id", "name", "description", "geometry_type", "definition_json", "min_altitude_m", "max_altitude_m",
+        "effective_from", "effective_to", "schedule_json",
+        "bbox_min_lat", "bbox_min_lon", "bbox_max_lat", "bbox_max_lon", "centroid_lat", "centroid_lon", "projected_json",
+    )
+
+    def __init__(self, zone: RestrictedZone):
+        for field in self.__slots__:
+            setattr(self, field, getattr(zone, field))
+
+
+def _minutes(value: str) -> int:
+    hours, minutes = value.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def zone_intervals(zone, start_epoch: float, end_epoch: float) -> List[Tuple[float, float]]:
+    """
+    Concrete [start, end] epoch intervals during which `zone` is in effect,
+    clipped to [start_epoch, end_epoch]. Recurring rules are expanded day by
+    day in UTC; a rule whose end_time is not after start_time runs overnight.
+    """
+    lo = start_epoch if zone.effective_from is None else max(start_epoch, to_epoch(zone.effective_from))
+    hi = end_epoch if zone.effective_to is None else min(end_epoch, to_epoch(zone.effective_to))
+    if lo > hi:
+        return []
+    if not zone.schedule_json:
+        return [(lo, hi)]
+
+    intervals = []
+    first_day = math.floor(lo / DAY_SECONDS) - 1 # Overnight rules from the previous day
+    last_day = math.floor(hi / DAY_SECONDS)
+    for day in range(first_day, last_day + 1):
+        day_start = day * DAY_SECONDS
+        weekday = datetime.fromtimestamp(day_start, tz=timezone.utc).weekday()
+        for rule in zone.schedule_json:
+            if weekday not in rule["days_of_week"]:
+                continue
+            rule_start, rule_end = _minutes(rule["start_time"]), _minutes(rule["end_time"])
+            if rule_end <= rule_start:
+                rule_end += 24 * 60
+            s = max(lo, day_start + rule_start * 60)
+            e = min(hi, day_start + rule_end * 60)
+            if s <= e:
+                intervals.append((s, e))
+    return intervals
+
+
+def zone_active_during(zone, start: datetime, end: datetime) -> bool:
+    """Exact check without the index (single zones, windows beyond the index horizon)."""
+    return bool(zone_intervals(zone, to_epoch(start), max(to_epoch(end), to_epoch(start))))
+
+
+class ZoneScheduleIndex:
+    """
+    Time-bucketed interval index over every active zone. Each schedule is
+    expanded once for the horizon (from a day back to NFZ_SCHEDULE_HORIZON_DAYS
+    ahead) into fixed time buckets. Zones without a window or schedule are kept
+    apart as always active. Writes only bump a version counter; the next query
+    rebuilds, so one toggle no longer costs a zone reload per check.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = 0
+        self._built_version = -1
+        self._built_at = 0.0
+        self._generation = 0 # Bumped on every rebuild; caches derived from the zones key on it
+        # (zones by id, always-active ids, bucket -> [(start, end, zone_id)], horizon); swapped as one
+        self._state: Tuple[Dict[int, ZoneSnapshot], List[int], Dict[int, List[Tuple[float, float, int]]], Tuple[float, float]] = (
+            {}, [], {}, (0.0, 0.0)
+        )
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+
+    def rebuild(self, db: Session) -> None:
+        version = self._version # Writes during the build trigger another one
+        zones = [ZoneSnapshot(zone) for zone in crud_restricted_zone.get_all_active_zones(db)]
+        bucket_s = settings.NFZ_SCHEDULE_BUCKET_SECONDS
+        now = time.time()
+        horizon = (now - DAY_SECONDS, now + settings.NFZ_SCHEDULE_HORIZON_DAYS * DAY_SECONDS)
+        always, buckets = [], {}
+        for zone in zones:
+            if zone.effective_from is None and zone.effective_to is None and not zone.schedule_json:
+                always.append(zone.id)
+                continue
+            for start, end in zone_intervals(zone, *horizon):
+                for bucket in range(math.floor(start / bucket_s), math.floor(end / bucket_s) + 1):
+                    buckets.setdefault(bucket, []).append((start, end, zone.id))
+        with self._lock:
+            self._state = ({zone.id: zone for zone in zones}, always, buckets, horizon)
+            self._built_at = time.monotonic()
+            self._built_version = version
+            self._generation += 1
+
+    def _ensure(self, db: Session) -> None:
+        refresh = settings.NFZ_SCHEDULE_REFRESH_SECONDS
+        stale = self._built_version != self._version
+        stale = stale or time.time() > self._state[3][1] - DAY_SECONDS # Keep at least a day of look-ahead
+        stale = stale or bool(refresh and time.monotonic() - self._built_at > refresh)
+        if stale:
+            self.rebuild(db)
+
+    def zones(self, db: Session) -> Tuple[int, List[ZoneSnapshot]]:
+        """(generation, every active zone regardless of schedule)."""
+        self._ensure(db)
+        return self._generation, list(self._state[0].values())
+
+    def active_during(self, db: Session, start: datetime, end: datetime) -> List[ZoneSnapshot]:
+        """Zones in effect at any moment of [start, end]."""
+        self._ensure(db)
+        t1 = to_epoch(start)
+        t2 = max(to_epoch(end), t1)
+        zones, always, buckets, horizon = self._state
+        if t1 < horizon[0] or t2 > horizon[1]:
+            return [zone for zone in zones.values() if zone_intervals(zone, t1, t2)]
+
+        bucket_s = settings.NFZ_SCHEDULE_BUCKET_SECONDS
+        found: Set[int] = set(always)
+        for bucket in range(math.floor(t1 / bucket_s), math.floor(t2 / bucket_s) + 1):
+            for s, e, zone_id in buckets.get(bucket, ()):
+                if s <= t2 and e >= t1:
+                    found.add(zone_id)
+        return [zones[zone_id] for zone_id in sorted(found)]
+
+    def active_at(self, db: Session, at: Optional[datetime] = None) -> List[ZoneSnapshot]:
+        at = at or datetime.now(timezone.utc)
+        return self.active_during(db, at, at)
+
+
+zone_schedule_index = ZoneScheduleIndex()
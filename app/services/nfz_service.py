@@ -1,43 +1,65 @@
 # app/services/nfz_service.py
-from typing import List, Dict, Any
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy.orm import Session
-from app.crud import restricted_zone as crud_restricted_zone
+from app.core.geo import LocalProjection, buffer_deg, point_in_polygon, point_segment_distance, polyline_polygon_distance
+from app.models.restricted_zone import RestrictedZone, NFZGeometryType
 from app.schemas.waypoint import WaypointCreate
+from app.services.deconfliction_service import to_epoch
+from app.services.nfz_schedule_index import ZoneSnapshot, zone_schedule_index
 
 class NFZService:
-    def check_flight_plan_against_nfzs(self, db: Session, waypoints: List[WaypointCreate]) -> List[str]:
+    def active_zones_during(self, db: Session, start: datetime, end: datetime) -> List[ZoneSnapshot]:
+        """Active zones whose activation window / schedule overlaps [start, end] (cached interval index)."""
+        return zone_schedule_index.active_during(db, start, end)
+
+    def active_zones_at(self, db: Session, at: Optional[datetime] = None) -> List[ZoneSnapshot]:
+        return zone_schedule_index.active_at(db, at)
+
+    def validate_activation_window(self, effective_from: Optional[datetime], effective_to: Optional[datetime]) -> None:
+        if effective_from is not None and effective_to is not None and to_epoch(effective_to) <= to_epoch(effective_from):
+            raise ValueError("effective_to must be after effective_from.")
+
+    def invalidate_zones(self) -> None:
+        """Call after any zone write; the index is rebuilt on the next check."""
+        zone_schedule_index.invalidate()
+
+    def check_flight_plan_against_nfzs(
+        self,
+        db: Session,
+        waypoints: List[WaypointCreate],
+        active_nfzs: Optional[List[RestrictedZone]] = None,
+        *,
+        planned_departure_time: Optional[datetime] = None,
+        planned_arrival_time: Optional[datetime] = None,
+    ) -> List[str]:
         """
-        Check if flight plan waypoints intersect with No-Fly Zones.
+        Check if the flight plan route enters No-Fly Zones in effect during its
+        time envelope (zones active now when no times are given).
         Returns list of NFZ names that are violated.
         """
-        # For MVP, this is a placeholder implementation
-        # In a real system, you'd check waypoint coordinates against NFZ geometries
-        
-        # Get all active NFZs
-        active_nfzs = crud_restricted_zone.get_all_active_zones(db)
-        
+        if active_nfzs is None:
+            if planned_departure_time is not None:
+                active_nfzs = self.active_zones_during(db, planned_departure_time, planned_arrival_time or planned_departure_time)
+            else:
+                active_nfzs = self.active_zones_at(db)
+
         violations = []
-        
-        # Placeholder logic - you'd implement proper geometric intersection here
-        for waypoint in waypoints:
-            for nfz in active_nfzs:
-                # Simple placeholder check - in reality you'd use proper geometry libraries
-                # like Shapely to check if point is inside polygon/circle
-                if self._simple_point_in_nfz_check(waypoint, nfz):
-                    violations.append(nfz.name)
-        
-        return list(set(violations))  # Remove duplicates
+        for nfz in active_nfzs:
+            if self.route_distance_to_zone(waypoints, nfz) == 0.0:
+                violations.append(nfz.name)
+        return sorted(set(violations))  # Remove duplicates
     
-    def check_point_against_nfzs(self, db: Session, lat: float, lon: float, alt: float) -> List[Dict[str, Any]]:
+    def check_point_against_nfzs(
+        self, db: Session, lat: float, lon: float, alt: float, at: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Check if a single point intersects with No-Fly Zones.
+        Check if a single point is inside No-Fly Zones in effect at `at` (now by default).
         Returns list of NFZ details that are breached.
         """
-        active_nfzs = crud_restricted_zone.get_all_active_zones(db)
-        
         breaches = []
-        for nfz in active_nfzs:
-            if self._point_in_nfz(lat, lon, alt, nfz):
+        for nfz in self.active_zones_at(db, at):
+            if self.point_in_zone(lat, lon, alt, nfz):
                 breaches.append({
                     'name': nfz.name,
                     'id': nfz.id,
@@ -46,31 +68,98 @@ class NFZService:
         
         return breaches
     
-    def _simple_point_in_nfz_check(self, waypoint: WaypointCreate, nfz) -> bool:
+    def route_distance_to_zone(self, waypoints, nfz: RestrictedZone) -> Optional[float]:
         """
-        Placeholder for geometric intersection check.
-        In a real implementation, you'd use proper geometric calculations.
+        Horizontal distance in meters from the route polyline to the zone
+        boundary (0 when the route enters it). None if the zone's altitude band
+        does not overlap the route's altitude range or its definition is unusable.
         """
-        # This is a very basic placeholder - always returns False for now
-        # Real implementation would:
-        # 1. Parse nfz.definition_json based on nfz.geometry_type
-        # 2. Use geometric libraries to check intersection
-        # 3. Consider altitude constraints (min_altitude_m, max_altitude_m)
-        return False
-    
-    def _point_in_nfz(self, lat: float, lon: float, alt: float, nfz) -> bool:
-        """
-        Check if a point is inside an NFZ.
-        Placeholder implementation.
-        """
-        # Check altitude constraints first
-        if nfz.min_altitude_m is not None and alt < nfz.min_altitude_m:
+        points = sorted(waypoints, key=lambda w: w.sequence_order)
+        if not points:
+            return None
+        low = min(p.altitude_m for p in points)
+        high = max(p.altitude_m for p in points)
+        if nfz.min_altitude_m is not None and high < nfz.min_altitude_m:
+            return None
+        if nfz.max_altitude_m is not None and low > nfz.max_altitude_m:
+            return None
+
+        definition = nfz.definition_json or {}
+        projected = getattr(nfz, "projected_json", None)
+        if nfz.geometry_type == NFZGeometryType.POLYGON and projected:
+            # Normalized at ingest: route goes into the zone's own frame, ring is reused as-is
+            projection = LocalProjection(projected["ref_lat"], projected["ref_lon"])
+            route = [projection.to_xy(p.latitude, p.longitude) for p in points]
+            return polyline_polygon_distance(route, projected["ring"])
+
+        projection = LocalProjection(points[0].latitude, points[0].longitude)
+        route = [projection.to_xy(p.latitude, p.longitude) for p in points]
+        legs = list(zip(route, route[1:])) or [(route[0], route[0])]
+        try:
+            if nfz.geometry_type == NFZGeometryType.CIRCLE:
+                cx, cy = projection.to_xy(float(definition["center_lat"]), float(definition["center_lon"]))
+                nearest = min(point_segment_distance(cx, cy, ax, ay, bx, by) for (ax, ay), (bx, by) in legs)
+                return max(nearest - float(definition["radius_m"]), 0.0)
+            # GeoJSON polygon: outer ring of [lon, lat] pairs
+            ring = [projection.to_xy(float(lat), float(lon)) for lon, lat in definition["coordinates"][0]]
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
+        if len(ring) < 3:
+            return None
+        return polyline_polygon_distance(route, ring)
+
+    def zone_bounds(self, nfz: RestrictedZone) -> Optional[Tuple[float, float, float, float]]:
+        """(min_lat, min_lon, max_lat, max_lon) of the zone, or None if its definition is unusable."""
+        if getattr(nfz, "bbox_min_lat", None) is not None:
+            return nfz.bbox_min_lat, nfz.bbox_min_lon, nfz.bbox_max_lat, nfz.bbox_max_lon
+        definition = nfz.definition_json or {}
+        try:
+            if nfz.geometry_type == NFZGeometryType.CIRCLE:
+                lat, lon = float(definition["center_lat"]), float(definition["center_lon"])
+                dlat, dlon = buffer_deg(lat, float(definition["radius_m"]))
+                return lat - dlat, lon - dlon, lat + dlat, lon + dlon
+            lons = [float(vertex[0]) for vertex in definition["coordinates"][0]]
+            lats = [float(vertex[1]) for vertex in definition["coordinates"][0]]
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
+        if not lats:
+            return None
+        return min(lats), min(lons), max(lats), max(lons)
+
+    def point_in_zone(self, lat: float, lon: float, alt: Optional[float], nfz: RestrictedZone) -> bool:
+        """Exact containment check against the zone geometry and altitude band."""
+        if alt is not None:
+            if nfz.min_altitude_m is not None and alt < nfz.min_altitude_m:
+                return False
+            if nfz.max_altitude_m is not None and alt > nfz.max_altitude_m:
+                return False
+        if getattr(nfz, "bbox_min_lat", None) is not None and not (
+            nfz.bbox_min_lat <= lat <= nfz.bbox_max_lat and nfz.bbox_min_lon <= lon <= nfz.bbox_max_lon
+        ):
             return False
-        if nfz.max_altitude_m is not None and alt > nfz.max_altitude_m:
+        projected = getattr(nfz, "projected_json", None)
+        if nfz.geometry_type == NFZGeometryType.POLYGON and projected:
+            x, y = LocalProjection(projected["ref_lat"], projected["ref_lon"]).to_xy(lat, lon)
+            return point_in_polygon(x, y, projected["ring"])
+
+        definition = nfz.definition_json or {}
+        projection = LocalProjection(lat, lon)
+        try:
+            if nfz.geometry_type == NFZGeometryType.CIRCLE:
+                cx, cy = projection.to_xy(float(definition["center_lat"]), float(definition["center_lon"]))
+                return cx * cx + cy * cy <= float(definition["radius_m"]) ** 2
+            ring = [projection.to_xy(float(v[1]), float(v[0])) for v in definition["coordinates"][0]]
+        except (KeyError, IndexError, TypeError, ValueError):
             return False
-        
-        # Placeholder for geometric check
-        # Real implementation would check if lat/lon is inside the NFZ geometry
-        return False
+        return len(ring) >= 3 and point_in_polygon(0.0, 0.0, ring)
+
+    def nearest_zone(self, waypoints, active_nfzs: List[RestrictedZone]) -> Tuple[Optional[RestrictedZone], Optional[float]]:
+        """(zone, distance in meters) of the active NFZ closest to the route, or (None, None)."""
+        nearest, nearest_distance = None, None
+        for nfz in active_nfzs:
+            distance = self.route_distance_to_zone(waypoints, nfz)
+            if distance is not None and (nearest_distance is None or distance < nearest_distance):
+                nearest, nearest_distance = nfz, distance
+        return nearest, nearest_distance
 
 nfz_service = NFZService()
\ No newline at end of file
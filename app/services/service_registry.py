@@ -0,0 +1,171 @@
+# app/services/service_registry.py
+import asyncio
+import inspect
+import signal
+import threading
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from app.core.config import settings
+
+Hook = Callable[[], Union[None, Awaitable[None]]]
+
+
+class ManagedService:
+    __slots__ = ("name", "start", "stop", "check", "details", "required", "state", "error", "started_at")
+
+    def __init__(
+        self, name: str, *, start: Optional[Hook], stop: Optional[Hook],
+        check: Optional[Callable[[], Optional[str]]], details: Optional[Callable[[], Dict[str, Any]]], required: bool,
+    ):
+        self.name = name
+        self.start = start
+        self.stop = stop
+        self.check = check # Returns a problem description, None when healthy
+        self.details = details
+        self.required = required # A required service that is down makes the app not ready
+        self.state = "STOPPED" # STARTING, RUNNING, FAILED, STOPPING, STOPPED
+        self.error: Optional[str] = None
+        self.started_at: Optional[datetime] = None
+
+
+async def _call(hook: Hook) -> None:
+    result = hook()
+    if inspect.isawaitable(result):
+        await result
+
+
+class ServiceRegistry:
+    """
+    Background services of the app (telemetry writer, caches, live state,
+    broadcast hub, ...), started in registration order by the app lifespan
+    and stopped in reverse order, so every service starts after and stops
+    before the ones it depends on. Hooks may be sync (run on the event loop;
+    wrap blocking work in asyncio.to_thread) or async. A service that fails
+    to start is marked FAILED and startup carries on. The app is ready once
+    everything started and every required service is RUNNING and passes its
+    check; it stops being ready as soon as draining begins, which on
+    SIGTERM is SERVICE_DRAIN_GRACE_SECONDS before the server stops accepting
+    connections (see drain_on_sigterm).
+    """
+
+    def __init__(self):
+        self._services: List[ManagedService] = []
+        self.started = False
+        self.draining = False
+
+    def register(
+        self, name: str, *, start: Optional[Hook] = None, stop: Optional[Hook] = None,
+        check: Optional[Callable[[], Optional[str]]] = None, details: Optional[Callable[[], Dict[str, Any]]] = None,
+        required: bool = True, enabled: bool = True,
+    ) -> None:
+        if any(service.name == name for service in self._services):
+            raise ValueError(f"Service '{name}' is already registered.")
+        if enabled:
+            self._services.append(ManagedService(
+                name, start=start, stop=stop, check=check, details=details, required=required,
+            ))
+
+    def begin_drain(self) -> None:
+        """Stop reporting ready so load balancers take the instance out; requests are still served."""
+        self.draining = True
+
+    def drain_on_sigterm(self) -> None:
+        """
+        Wrap the server's SIGTERM handler: the first SIGTERM starts draining
+        and reaches the server (which then stops listening and runs the
+        shutdown) only SERVICE_DRAIN_GRACE_SECONDS later; another SIGTERM in
+        the meantime goes through at once. Needs the main thread and a server
+        that handles SIGTERM itself, so it does nothing under TestClient.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+        server_handler = signal.getsignal(signal.SIGTERM)
+        if not callable(server_handler):
+            return
+        loop = asyncio.get_running_loop()
+
+        def handle(signum, frame) -> None:
+            if self.draining:
+                server_handler(signum, frame)
+                return
+            self.begin_drain()
+            print(f"SIGTERM: draining for {settings.SERVICE_DRAIN_GRACE_SECONDS:g}s before shutting down.")
+            loop.call_soon_threadsafe(loop.call_later, settings.SERVICE_DRAIN_GRACE_SECONDS, server_handler, signum, frame)
+
+        signal.signal(signal.SIGTERM, handle)
+
+    async def start_all(self) -> None:
+        self.draining = False
+        for service in self._services:
+            service.state, service.error = "STARTING", None
+            try:
+                if service.start is not None:
+                    await _call(service.start)
+            except Exception as e:
+                service.state, service.error = "FAILED", str(e)[:500]
+                print(f"Service {service.name} failed to start: {e}")
+                continue
+            service.state, service.started_at = "RUNNING", datetime.now(timezone.utc)
+        self.started = True
+
+    async def stop_all(self) -> None:
+        """Stop in reverse order; each stop hook gets SERVICE_STOP_TIMEOUT_SECONDS."""
+        self.begin_drain()
+        for service in reversed(self._services):
+            if service.state == "STOPPED":
+                continue
+            service.state = "STOPPING"
+            try:
+                if service.stop is not None:
+                    await asyncio.wait_for(_call(service.stop), timeout=settings.SERVICE_STOP_TIMEOUT_SECONDS)
+                service.state = "STOPPED"
+            except Exception as e:
+                service.state, service.error = "FAILED", str(e)[:500] or type(e).__name__
+                print(f"Service {service.name} failed to stop cleanly: {service.error}")
+        self.started = False
+
+    def _problem(self, service: ManagedService) -> Optional[str]:
+        if service.state != "RUNNING":
+            return service.error or service.state
+        if service.check is None:
+            return None
+        try:
+            return service.check()
+        except Exception as e:
+            return str(e)[:500]
+
+    def status(self) -> Tuple[bool, Dict[str, Any]]:
+        """(ready, report); runs the checks, some of which touch the database."""
+        services = []
+        ready = self.started and not self.draining
+        for service in self._services:
+            problem = self._problem(service)
+            if problem is not None and service.required:
+                ready = False
+            entry: Dict[str, Any] = {
+                "name": service.name,
+                "state": service.state,
+                "healthy": problem is None,
+                "required": service.required,
+                "problem": problem,
+                "started_at": service.started_at,
+            }
+            if service.details is not None:
+                try:
+                    entry["details"] = service.details()
+                except Exception as e:
+                    entry["details"] = {"error": str(e)[:500]}
+            services.append(entry)
+        if ready:
+            status = "ready"
+        elif self.draining:
+            status = "draining"
+        elif not self.started:
+            status = "starting"
+        else:
+            status = "not_ready"
+        return ready, {"status": status, "services": services}
+
+
+service_registry = ServiceRegistry()
@@ -0,0 +1,121 @@
+# app/services/telemetry_archive_service.py
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import telemetry_archive as crud_telemetry_archive
+from app.crud import telemetry_log as crud_telemetry_log
+from app.db.session import SessionLocal
+from app.services.telemetry_codec import VERSION, decode_track, encode_track
+
+
+def _key(timestamp: datetime) -> datetime:
+    return timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=timezone.utc)
+
+
+def merge_points(archived: Iterable[Any], hot: Iterable[Any]) -> List[Any]:
+    """
+    One flight's points in timestamp order: archived ones (dicts) plus any
+    still in telemetry_logs (dicts or rows). A point in both is taken from
+    the table.
+    """
+    points = {}
+    for point in archived:
+        points[_key(point["timestamp"])] = point
+    for point in hot:
+        timestamp = point["timestamp"] if isinstance(point, dict) else point.timestamp
+        points[_key(timestamp)] = point
+    return [points[timestamp] for timestamp in sorted(points)]
+
+
+class TelemetryArchiveService:
+    """
+    Moves the telemetry of finished flights out of telemetry_logs into one
+    compressed blob per flight (telemetry_archives), so the hot table only
+    holds flights in progress (and points reported without a flight plan).
+    A flight is archived TELEMETRY_ARCHIVE_DELAY_SECONDS after it finished,
+    giving late points time to arrive; anything arriving later is merged into
+    the archive on the next sweep. Readers combine both with merge_points().
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self.archived_flights = 0
+        self.archived_points = 0
+
+    def archive_flight(self, db: Session, *, flight_plan_id: int) -> Dict[str, int]:
+        """Fold the flight's points from telemetry_logs into its archive; commits. Returns point and byte counts."""
+        hot = crud_telemetry_log.get_rows_for_flight(db, flight_plan_id=flight_plan_id)
+        if not hot:
+            return {"points": 0, "archived_points": 0, "bytes": 0}
+        existing = crud_telemetry_archive.get_by_flight(db, flight_plan_id=flight_plan_id)
+        archived = decode_track(existing.data, flight_plan_id) if existing is not None else []
+        points = merge_points(archived, hot)
+        data = encode_track(points)
+        crud_telemetry_archive.save(db, flight_plan_id=flight_plan_id, values={
+            "drone_id": points[-1]["drone_id"],
+            "start_time": points[0]["timestamp"],
+            "end_time": points[-1]["timestamp"],
+            "point_count": len(points),
+            "encoding_version": VERSION,
+            "data": data,
+        })
+        crud_telemetry_log.delete_by_ids(db, ids=[row["id"] for row in hot])
+        db.commit()
+        self.archived_flights += 1
+        self.archived_points += len(hot)
+        return {"points": len(points), "archived_points": len(hot), "bytes": len(data)}
+
+    def archive_due(self, db: Session) -> int:
+        """Archive the next TELEMETRY_ARCHIVE_BATCH_FLIGHTS finished flights; returns how many were archived."""
+        finished_before = datetime.now(timezone.utc) - timedelta(seconds=settings.TELEMETRY_ARCHIVE_DELAY_SECONDS)
+        flight_ids = crud_telemetry_log.get_archivable_flight_ids(
+            db, finished_before=finished_before, limit=settings.TELEMETRY_ARCHIVE_BATCH_FLIGHTS,
+        )
+        for flight_plan_id in flight_ids:
+            self.archive_flight(db, flight_plan_id=flight_plan_id)
+        return len(flight_ids)
+
+    def _sweep(self) -> int:
+        db = SessionLocal()
+        try:
+            return self.archive_due(db)
+        finally:
+            db.close()
+
+    async def run(self) -> None:
+        self._stop_event = asyncio.Event()
+        while not self._stop_event.is_set():
+            try:
+                archived = await asyncio.to_thread(self._sweep)
+            except Exception as e:
+                print(f"Telemetry archive sweep failed: {e}")
+                archived = 0
+            if archived >= settings.TELEMETRY_ARCHIVE_BATCH_FLIGHTS:
+                continue # Backlog: keep going
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=settings.TELEMETRY_ARCHIVE_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._stop_event is not None:
+            self._stop_event.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+
+telemetry_archive_service = TelemetryArchiveService()
@@ -0,0 +1,167 @@
+# app/services/telemetry_codec.py
+import struct
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import orjson
+
+VERSION = 1
+HEADER = struct.Struct("<BI") # version, point count
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+# (column, scale to integer units, nullable); value * scale is rounded, so decoding is exact to that unit
+COLUMNS: Tuple[Tuple[str, int, bool], ...] = (
+    ("id", 1, False),
+    ("drone_id", 1, False),
+    ("latitude", 10_000_000, False), # 1e-7 deg, ~1 cm
+    ("longitude", 10_000_000, False),
+    ("altitude_m", 100, False), # cm
+    ("speed_mps", 100, True), # cm/s
+    ("heading_degrees", 100, True), # 0.01 deg
+)
+
+
+def _put_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _zigzag(value: int) -> int:
+    return -2 * value - 1 if value < 0 else 2 * value
+
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+def _varints(data: bytes) -> List[int]:
+    values, value, shift = [], 0, 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values
+
+
+def _encode_deltas(values: Sequence[Optional[int]], nullable: bool) -> bytearray:
+    """Zigzag deltas against the previous value; nullable columns shift by one so 0 marks None."""
+    out, previous = bytearray(), 0
+    for value in values:
+        if value is None:
+            out.append(0)
+            continue
+        delta = _zigzag(value - previous)
+        _put_varint(out, delta + 1 if nullable else delta)
+        previous = value
+    return out
+
+
+def _decode_deltas(data: bytes, nullable: bool) -> List[Optional[int]]:
+    values: List[Optional[int]] = []
+    previous = 0
+    for raw in _varints(data):
+        if nullable:
+            if raw == 0:
+                values.append(None)
+                continue
+            raw -= 1
+        previous += _unzigzag(raw)
+        values.append(previous)
+    return values
+
+
+def _encode_timestamps(epoch_us: Sequence[int]) -> bytearray:
+    """Gorilla-style delta of deltas: a steady reporting rate costs one byte per point."""
+    out, previous, previous_delta = bytearray(), 0, 0
+    for value in epoch_us:
+        delta = value - previous
+        _put_varint(out, _zigzag(delta - previous_delta))
+        previous, previous_delta = value, delta
+    return out
+
+
+def _decode_timestamps(data: bytes) -> List[int]:
+    values, previous, delta = [], 0, 0
+    for raw in _varints(data):
+        delta += _unzigzag(raw)
+        previous += delta
+        values.append(previous)
+    return values
+
+
+def _epoch_us(timestamp: datetime) -> int:
+    if timestamp.tzinfo is None: # SQLite hands back naive UTC
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return (timestamp - EPOCH) // MICROSECOND # Exact: timestamps are the (drone_id, timestamp) key
+
+
+def encode_track(rows: Sequence[Dict[str, Any]]) -> bytes:
+    """
+    Compress telemetry points (dicts with the telemetry_logs columns, in
+    timestamp order) into one blob. Columns are stored one after another as
+    varint streams: timestamps (exact, in microseconds) as delta of deltas,
+    numbers as deltas in fixed units (see COLUMNS), status messages as
+    indexes into a dictionary. The result is zlib-compressed. flight_plan_id
+    is not stored; the blob belongs to one flight.
+    """
+    statuses: Dict[Optional[str], int] = {None: 0}
+    status_ids = bytearray()
+    for row in rows:
+        _put_varint(status_ids, statuses.setdefault(row["status_message"], len(statuses)))
+
+    streams = [_encode_timestamps([_epoch_us(row["timestamp"]) for row in rows])]
+    for column, scale, nullable in COLUMNS:
+        values = [None if row[column] is None else round(row[column] * scale) for row in rows]
+        streams.append(_encode_deltas(values, nullable))
+    streams.append(status_ids)
+    streams.append(bytearray(orjson.dumps([status for status in statuses if status is not None])))
+
+    body = bytearray()
+    for stream in streams:
+        _put_varint(body, len(stream))
+        body += stream
+    return HEADER.pack(VERSION, len(rows)) + zlib.compress(bytes(body), 6)
+
+
+def decode_track(blob: bytes, flight_plan_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Points of an encode_track() blob as telemetry_logs column dicts, in timestamp order."""
+    version, count = HEADER.unpack_from(blob, 0)
+    if version != VERSION:
+        raise ValueError(f"Unsupported telemetry archive version {version}.")
+    body = zlib.decompress(blob[HEADER.size:])
+    streams, offset = [], 0
+    while offset < len(body):
+        length, shift = 0, 0
+        while True:
+            byte = body[offset]
+            offset += 1
+            length |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                break
+            shift += 7
+        streams.append(body[offset:offset + length])
+        offset += length
+
+    timestamps = _decode_timestamps(streams[0])
+    columns = {}
+    for (column, scale, nullable), stream in zip(COLUMNS, streams[1:]):
+        values = _decode_deltas(stream, nullable)
+        columns[column] = values if scale == 1 else [None if v is None else v / scale for v in values]
+    status_names = [None] + orjson.loads(streams[-1])
+    status_ids = _varints(streams[-2])
+
+    rows = []
+    for i in range(count):
+        row = {column: values[i] for column, values in columns.items()}
+        row["flight_plan_id"] = flight_plan_id
+        row["timestamp"] = EPOCH + timestamps[i] * MICROSECOND
+        row["status_message"] = status_names[status_ids[i]]
+        rows.append(row)
+    return rows
@@ -0,0 +1,183 @@
+# app/services/telemetry_export_service.py
+import io
+import itertools
+from datetime import datetime, timezone
+from typing import Any, BinaryIO, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import telemetry_archive as crud_telemetry_archive
+from app.crud.crud_telemetry_log import ROW_COLUMNS
+from app.db.session import ReadSessionLocal
+from app.models.drone import Drone
+from app.models.telemetry_log import TelemetryLog
+from app.services.telemetry_codec import decode_track
+
+try: # Optional: only needed for exports
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError: # pragma: no cover
+    pa = pq = None
+
+EXPORT_FORMATS = ("parquet", "arrow")
+MEDIA_TYPES = {"parquet": "application/vnd.apache.parquet", "arrow": "application/vnd.apache.arrow.stream"}
+
+EXPORT_FIELDS = tuple(column.key for column in ROW_COLUMNS)
+ARCHIVES_PER_QUERY = 100
+
+
+def _arrow_schema():
+    return pa.schema([
+        ("id", pa.int64()),
+        ("flight_plan_id", pa.int32()),
+        ("drone_id", pa.int32()),
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+        ("latitude", pa.float64()),
+        ("longitude", pa.float64()),
+        ("altitude_m", pa.float64()),
+        ("speed_mps", pa.float64()),
+        ("heading_degrees", pa.float64()),
+        ("status_message", pa.string()),
+    ])
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands out what the Arrow writer produced since the last take()."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def take(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+class TelemetryExportService:
+    """
+    Columnar telemetry exports for analytics. Rows are read from the read
+    replica (when configured) with the time range, drone and organization
+    filters pushed down into SQL, in keyset-paginated chunks of
+    TELEMETRY_EXPORT_CHUNK_ROWS ordered by (timestamp, id), so memory stays
+    bounded whatever the range. Archived flights (telemetry_archives) in the
+    range follow, decoded one archive at a time. Each chunk becomes one
+    Parquet row group (with min/max statistics on timestamp and drone_id for
+    readers to skip on) or one Arrow IPC record batch.
+    """
+
+    @staticmethod
+    def available() -> bool:
+        return pa is not None
+
+    def validate(self, *, start: datetime, end: datetime, fmt: str) -> Tuple[datetime, datetime]:
+        """Check the request; returns (start, end) made timezone-aware (naive means UTC)."""
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{fmt}'; use one of {', '.join(EXPORT_FORMATS)}.")
+        start, end = (t if t.tzinfo else t.replace(tzinfo=timezone.utc) for t in (start, end))
+        if end <= start:
+            raise ValueError("end must be after start.")
+        return start, end
+
+    def _chunks(
+        self, db: Session, *, start: datetime, end: datetime,
+        organization_id: Optional[int], drone_ids: Optional[Sequence[int]],
+    ) -> Iterator[List[Any]]:
+        stmt = select(*ROW_COLUMNS).where(
+            TelemetryLog.timestamp >= start,
+            TelemetryLog.timestamp < end,
+        )
+        if drone_ids:
+            stmt = stmt.where(TelemetryLog.drone_id.in_(list(drone_ids)))
+        if organization_id is not None:
+            stmt = stmt.where(TelemetryLog.drone_id.in_(select(Drone.id).where(Drone.organization_id == organization_id)))
+        stmt = stmt.order_by(TelemetryLog.timestamp, TelemetryLog.id).limit(settings.TELEMETRY_EXPORT_CHUNK_ROWS)
+
+        cursor = None
+        while True:
+            page = stmt if cursor is None else stmt.where(tuple_(TelemetryLog.timestamp, TelemetryLog.id) > cursor)
+            rows = db.execute(page).all()
+            if not rows:
+                return
+            yield rows
+            if len(rows) < settings.TELEMETRY_EXPORT_CHUNK_ROWS:
+                return
+            cursor = tuple_(rows[-1].timestamp, rows[-1].id)
+
+    def _archived_chunks(
+        self, db: Session, *, start: datetime, end: datetime,
+        organization_id: Optional[int], drone_ids: Optional[Sequence[int]],
+    ) -> Iterator[List[Any]]:
+        chunk, after_id = [], 0
+        while True:
+            archives = crud_telemetry_archive.get_overlapping(
+                db, start=start, end=end, organization_id=organization_id,
+                drone_ids=list(drone_ids) if drone_ids else None, after_id=after_id, limit=ARCHIVES_PER_QUERY,
+            )
+            for archive in archives:
+                for point in decode_track(archive.data, archive.flight_plan_id):
+                    if start <= point["timestamp"] < end:
+                        chunk.append(tuple(point[field] for field in EXPORT_FIELDS))
+                if len(chunk) >= settings.TELEMETRY_EXPORT_CHUNK_ROWS:
+                    yield chunk
+                    chunk = []
+            if len(archives) < ARCHIVES_PER_QUERY:
+                break
+            after_id = archives[-1].id
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def _record_batch(rows: List[Any], schema) -> "pa.RecordBatch":
+        columns = list(zip(*rows))
+        return pa.record_batch([pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema)
+
+    def stream(
+        self, *, start: datetime, end: datetime, fmt: str = "parquet",
+        organization_id: Optional[int] = None, drone_ids: Optional[Sequence[int]] = None,
+        db: Optional[Session] = None,
+    ) -> Iterator[bytes]:
+        """Export file as a byte stream, one piece per chunk. Opens its own replica session unless `db` is given."""
+        start, end = self.validate(start=start, end=end, fmt=fmt)
+        if not self.available():
+            raise RuntimeError("Telemetry export requires pyarrow.")
+        schema = _arrow_schema()
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema, compression="zstd") if fmt == "parquet" else pa.ipc.new_stream(sink, schema)
+        session = db or ReadSessionLocal()
+        try:
+            filters = dict(start=start, end=end, organization_id=organization_id, drone_ids=drone_ids)
+            for rows in itertools.chain(self._chunks(session, **filters), self._archived_chunks(session, **filters)):
+                writer.write_batch(self._record_batch(rows, schema))
+                data = sink.take()
+                if data:
+                    yield data
+            writer.close()
+            yield sink.take()
+        finally:
+            if db is None:
+                session.close()
+
+    def export_to(self, out: BinaryIO, **kwargs) -> int:
+        """Write the export to a binary file object; returns the bytes written."""
+        written = 0
+        for data in self.stream(**kwargs):
+            out.write(data)
+            written += len(data)
+        return written
+
+
+telemetry_export_service = TelemetryExportService()
@@ -0,0 +1,227 @@
+# app/services/telemetry_ingest_service.py
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import drone as crud_drone
+from app.crud import flight_plan as crud_flight_plan
+from app.models.user import User
+from app.schemas.telemetry import LiveTelemetryMessage
+from app.services.conflict_detection_service import conflict_detection_service
+from app.services.deconfliction_service import to_epoch
+from app.services.telemetry_service import telemetry_service
+from app.services.telemetry_spool import telemetry_spool
+
+# Columns written to telemetry_logs from a parsed point
+LOG_COLUMNS = (
+    "flight_plan_id", "drone_id", "timestamp", "latitude", "longitude", "altitude_m",
+    "speed_mps", "heading_degrees", "status_message",
+)
+
+
+def _number(point: Dict[str, Any], key: str, low: Optional[float] = None, high: Optional[float] = None,
+            required: bool = True) -> Optional[float]:
+    value = point.get(key)
+    if value is None:
+        if required:
+            raise ValueError(f"{key} is required.")
+        return None
+    if type(value) is not float and type(value) is not int: # Rejects bools and numeric strings
+        raise ValueError(f"{key} must be a number.")
+    if not math.isfinite(value) or (low is not None and value < low) or (high is not None and value > high):
+        raise ValueError(f"{key} is out of range.")
+    return float(value)
+
+
+def _timestamp(value: Any, latest_epoch: float) -> datetime:
+    """ISO 8601 string (naive means UTC) or epoch seconds."""
+    try:
+        if type(value) is str:
+            timestamp = datetime.fromisoformat(value)
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.replace(tzinfo=timezone.utc)
+        elif type(value) is float or type(value) is int:
+            timestamp = datetime.fromtimestamp(value, tz=timezone.utc)
+        else:
+            raise ValueError
+    except (ValueError, OverflowError, OSError):
+        raise ValueError("timestamp must be an ISO 8601 string or epoch seconds.")
+    if timestamp.timestamp() > latest_epoch:
+        raise ValueError("timestamp is too far in the future.")
+    return timestamp
+
+
+def _optional_id(point: Dict[str, Any], key: str) -> Optional[int]:
+    value = point.get(key)
+    if value is not None and (type(value) is not int or value <= 0):
+        raise ValueError(f"{key} must be a positive integer.")
+    return value
+
+
+def parse_points(payload: Any) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Validate a decoded batch: a JSON array of points or {"points": [...]}.
+    Returns (rows, rejections); each row keeps its batch "index". Malformed
+    points are rejected one by one, a malformed batch raises ValueError.
+    """
+    if isinstance(payload, dict):
+        payload = payload.get("points")
+    if not isinstance(payload, list):
+        raise ValueError('Expected a JSON array of telemetry points or {"points": [...]}.')
+    if len(payload) > settings.TELEMETRY_INGEST_MAX_BATCH:
+        raise ValueError(f"At most {settings.TELEMETRY_INGEST_MAX_BATCH} points per batch.")
+
+    latest_epoch = time.time() + settings.TELEMETRY_INGEST_MAX_FUTURE_SECONDS
+    rows, rejected = [], []
+    for index, point in enumerate(payload):
+        try:
+            if not isinstance(point, dict):
+                raise ValueError("Point must be an object.")
+            drone_id = _optional_id(point, "drone_id")
+            if drone_id is None:
+                raise ValueError("drone_id is required.")
+            status_message = point.get("status_message")
+            if status_message is not None and type(status_message) is not str:
+                raise ValueError("status_message must be a string.")
+            rows.append({
+                "index": index,
+                "drone_id": drone_id,
+                "flight_plan_id": _optional_id(point, "flight_plan_id"),
+                "timestamp": _timestamp(point.get("timestamp"), latest_epoch),
+                "latitude": _number(point, "latitude", -90.0, 90.0),
+                "longitude": _number(point, "longitude", -180.0, 180.0),
+                "altitude_m": _number(point, "altitude_m"),
+                "speed_mps": _number(point, "speed_mps", 0.0, required=False),
+                "heading_degrees": _number(point, "heading_degrees", 0.0, 360.0, required=False),
+                "status_message": status_message,
+            })
+        except ValueError as e:
+            rejected.append({"index": index, "detail": str(e)})
+    return rows, rejected
+
+
+class TelemetryIngestService:
+    """
+    Telemetry pushed by physical drones and ground stations. A batch is
+    validated with plain checks (no per-point models), authorized with one
+    query, run through the same NFZ and conformance evaluation as the
+    simulator and handed to the telemetry spool, which bulk-loads it. The
+    latest point of each drone then moves its live state: conflict detection
+    and the telemetry WebSocket.
+
+    Links deliver late, duplicated and reordered packets. A per-drone
+    high-water mark (newest timestamp applied to the live state) splits each
+    batch: newer points are live, older ones are late and only go to history.
+    Points repeating a stored (drone_id, timestamp) are dropped by the unique
+    index on insert, so a retried batch is safe and needs no read first.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._high_water: Dict[int, float] = {} # drone_id -> epoch of the newest live point
+
+    def ingest(self, db: Session, user: User, payload: Any) -> Dict[str, Any]:
+        """
+        {"accepted", "late", "duplicates", "rejected": [{"index", "detail"}]};
+        raises ValueError for a malformed batch. Accepted includes late points
+        and points that were already stored.
+        """
+        rows, rejected = parse_points(payload)
+        result = self._accept(db, user, rows, rejected)
+        rejected.sort(key=lambda r: r["index"])
+        result["rejected"] = rejected
+        return result
+
+    def _accept(self, db: Session, user: User, rows: List[Dict[str, Any]], rejected: List[Dict[str, Any]]) -> Dict[str, Any]:
+        result = {"accepted": 0, "late": 0, "duplicates": 0}
+        if not rows:
+            return result
+        last_seen = crud_drone.get_reportable_last_seen(db, user=user, drone_ids={row["drone_id"] for row in rows})
+        active_plans = crud_flight_plan.get_active_ids_by_drone(db, drone_ids=list(last_seen))
+        plan_drones = crud_flight_plan.get_drone_ids(
+            db, ids=list({row["flight_plan_id"] for row in rows if row["flight_plan_id"] is not None})
+        )
+        with self._lock:
+            high_water = {drone_id: self._high_water.get(drone_id, -math.inf) for drone_id in last_seen}
+        for drone_id, seen_at in last_seen.items():
+            if seen_at is not None: # Known after a restart or from another worker
+                high_water[drone_id] = max(high_water[drone_id], to_epoch(seen_at))
+
+        rows.sort(key=lambda r: r["timestamp"]) # Reordered within the batch: replay in time order
+        accepted, live, alerts, seen = [], {}, [], set()
+        for row in rows:
+            drone_id = row["drone_id"]
+            if drone_id not in last_seen:
+                rejected.append({"index": row["index"], "detail": "Unknown drone or not authorized to report for it."})
+                continue
+            flight_plan_id = row["flight_plan_id"]
+            if flight_plan_id is None:
+                flight_plan_id = row["flight_plan_id"] = active_plans.get(drone_id)
+            elif plan_drones.get(flight_plan_id) != drone_id:
+                rejected.append({"index": row["index"], "detail": "flight_plan_id does not belong to this drone."})
+                continue
+            key = (drone_id, row["timestamp"])
+            if key in seen:
+                result["duplicates"] += 1
+                continue
+            seen.add(key)
+
+            epoch = row["timestamp"].timestamp()
+            is_live = epoch > high_water[drone_id]
+            # Late points skip conformance: the corridor tracks progress along the route
+            row["status_message"], point_alerts = telemetry_service.evaluate_point(
+                db, flight_plan_id if is_live else None, latitude=row["latitude"], longitude=row["longitude"],
+                altitude_m=row["altitude_m"], timestamp=row["timestamp"], status_message=row["status_message"],
+            )
+            accepted.append(row)
+            alerts.extend(point_alerts)
+            if is_live:
+                high_water[drone_id] = epoch
+                live[drone_id] = row
+            else:
+                result["late"] += 1
+        result["accepted"] = len(accepted)
+        if not accepted:
+            return result
+
+        telemetry_spool.write(db, [{key: row[key] for key in LOG_COLUMNS} for row in accepted])
+
+        with self._lock:
+            for drone_id, row in live.items():
+                self._high_water[drone_id] = max(self._high_water.get(drone_id, -math.inf), row["timestamp"].timestamp())
+        for row in live.values():
+            self._publish_live(row)
+        for alert in alerts:
+            telemetry_service.broadcast_threadsafe(alert.model_dump(mode="json"))
+        return result
+
+    def _publish_live(self, row: Dict[str, Any]) -> None:
+        conflict_detection_service.update(
+            drone_id=row["drone_id"],
+            flight_plan_id=row["flight_plan_id"],
+            latitude=row["latitude"],
+            longitude=row["longitude"],
+            altitude_m=row["altitude_m"],
+            speed_mps=row["speed_mps"],
+            heading_degrees=row["heading_degrees"],
+            timestamp=row["timestamp"],
+        )
+        telemetry_service.broadcast_threadsafe(LiveTelemetryMessage(
+            flight_id=row["flight_plan_id"],
+            drone_id=row["drone_id"],
+            lat=row["latitude"],
+            lon=row["longitude"],
+            alt=row["altitude_m"],
+            timestamp=row["timestamp"],
+            speed=row["speed_mps"],
+            heading=row["heading_degrees"],
+            status_message=row["status_message"],
+        ).model_dump(mode="json"))
+
+
+telemetry_ingest_service = TelemetryIngestService()
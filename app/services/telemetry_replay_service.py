@@ -0,0 +1,192 @@
+# app/services/telemetry_replay_service.py
+import asyncio
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import WebSocket
+
+from app.core.config import settings
+from app.crud import telemetry_archive as crud_telemetry_archive
+from app.crud import telemetry_log as crud_telemetry_log
+from app.db.async_session import AsyncReadSessionLocal
+from app.schemas.telemetry import LiveTelemetryMessage
+from app.services.telemetry_archive_service import merge_points
+from app.services.telemetry_codec import decode_track
+from app.services.telemetry_service import connection_manager
+
+
+def _as_dict(point: Any) -> Dict[str, Any]:
+    return point if isinstance(point, dict) else point._asdict()
+
+
+def _aware(timestamp: datetime) -> datetime:
+    return timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=timezone.utc) # SQLite hands back naive UTC
+
+
+class _Replay:
+    __slots__ = (
+        "id", "flight_plan_id", "user_id", "speed", "source", "state", "points_sent", "position",
+        "started_at", "stop_event", "subscribed", "task",
+    )
+
+    def __init__(self, flight_plan_id: int, user_id: int, speed: float):
+        self.id = uuid.uuid4().hex
+        self.flight_plan_id = flight_plan_id
+        self.user_id = user_id # Who started it
+        self.speed = speed
+        self.source: Optional[str] = None # "archive" or "telemetry_logs", known once playing
+        self.state = "RUNNING"
+        self.points_sent = 0
+        self.position: Optional[datetime] = None # Recorded time of the last point sent
+        self.started_at = datetime.now(timezone.utc)
+        self.stop_event = asyncio.Event()
+        self.subscribed = asyncio.Event() # Set when the first viewer connects
+        self.task: Optional[asyncio.Task] = None
+
+
+class TelemetryReplayService:
+    """
+    Replays a recorded flight at a multiple of its recorded pace, keeping the
+    original gaps between points (scaled). Frames go only to the sockets
+    subscribed to the replay (WS_TELEMETRY_REPLAY_PATH), never to the live
+    telemetry broadcast; playback starts once the first one connects and
+    stops when the last one leaves. Messages carry the replay_id.
+
+    Points of a flight still in telemetry_logs are read a window of
+    TELEMETRY_REPLAY_WINDOW_ROWS at a time, each through a server-side cursor
+    with keyset pagination, and the session is closed while the window plays
+    out: memory per replay is bounded and a slow 1x replay does not hold a
+    pool connection, so many can run at once. Archived flights are decoded
+    from their compressed blob (one flight's points).
+    """
+
+    def __init__(self):
+        self._replays: Dict[str, _Replay] = {}
+
+    def start(self, *, flight_plan_id: int, user_id: int, speed: float) -> _Replay:
+        """Start replaying a flight; raises ValueError for a bad speed or when too many replays run."""
+        if not 0 < speed <= settings.TELEMETRY_REPLAY_MAX_SPEED:
+            raise ValueError(f"speed must be above 0 and at most {settings.TELEMETRY_REPLAY_MAX_SPEED:g}.")
+        running = sum(1 for replay in self._replays.values() if replay.state == "RUNNING")
+        if running >= settings.TELEMETRY_REPLAY_MAX_CONCURRENT:
+            raise ValueError(f"At most {settings.TELEMETRY_REPLAY_MAX_CONCURRENT} replays can run at once.")
+        self._prune()
+        replay = _Replay(flight_plan_id, user_id, speed)
+        self._replays[replay.id] = replay
+        replay.task = asyncio.create_task(self._play(replay))
+        return replay
+
+    def get(self, replay_id: str) -> Optional[_Replay]:
+        return self._replays.get(replay_id)
+
+    def replays(self) -> List[_Replay]:
+        return list(self._replays.values())
+
+    def subscribe(self, replay: _Replay, websocket: WebSocket) -> None:
+        connection_manager.subscribe(replay.id, websocket)
+        replay.subscribed.set()
+
+    def unsubscribe(self, replay: _Replay, websocket: WebSocket) -> None:
+        connection_manager.unsubscribe(replay.id, websocket)
+        if replay.id not in connection_manager.scoped_connections: # Nobody left watching
+            replay.stop_event.set()
+
+    def stop(self, replay_id: str) -> Optional[_Replay]:
+        replay = self._replays.get(replay_id)
+        if replay is not None:
+            replay.stop_event.set()
+        return replay
+
+    async def stop_all(self) -> None:
+        tasks = [replay.task for replay in self._replays.values() if replay.task is not None]
+        for replay in self._replays.values():
+            replay.stop_event.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _prune(self) -> None:
+        """Forget finished replays beyond the concurrency limit (oldest first)."""
+        finished = [replay for replay in self._replays.values() if replay.state != "RUNNING"]
+        for replay in finished[: max(0, len(finished) - settings.TELEMETRY_REPLAY_MAX_CONCURRENT)]:
+            del self._replays[replay.id]
+
+    async def _points(self, replay: _Replay) -> AsyncIterator[Dict[str, Any]]:
+        async with AsyncReadSessionLocal() as db:
+            archive = await crud_telemetry_archive.get_by_flight_async(db, flight_plan_id=replay.flight_plan_id)
+            if archive is not None:
+                late = await crud_telemetry_log.get_logs_for_flight_async(db, flight_plan_id=replay.flight_plan_id)
+                archived = decode_track(archive.data, replay.flight_plan_id)
+        if archive is not None:
+            replay.source = "archive"
+            for point in merge_points(archived, late):
+                yield _as_dict(point)
+            return
+
+        replay.source = "telemetry_logs"
+        window: deque = deque()
+        after = None
+        while True:
+            async with AsyncReadSessionLocal() as db:
+                window.extend(await crud_telemetry_log.get_logs_for_flight_page_async(
+                    db, flight_plan_id=replay.flight_plan_id, after=after, limit=settings.TELEMETRY_REPLAY_WINDOW_ROWS,
+                ))
+            if not window:
+                return
+            full = len(window) == settings.TELEMETRY_REPLAY_WINDOW_ROWS
+            after = (window[-1].timestamp, window[-1].id)
+            while window:
+                yield window.popleft()._asdict()
+            if not full:
+                return
+
+    async def _wait_for_viewer(self, replay: _Replay) -> bool:
+        waiters = [asyncio.ensure_future(replay.subscribed.wait()), asyncio.ensure_future(replay.stop_event.wait())]
+        await asyncio.wait(waiters, timeout=settings.TELEMETRY_REPLAY_SUBSCRIBE_TIMEOUT_SECONDS, return_when=asyncio.FIRST_COMPLETED)
+        for waiter in waiters:
+            waiter.cancel()
+        return replay.subscribed.is_set() and not replay.stop_event.is_set()
+
+    async def _play(self, replay: _Replay) -> None:
+        loop = asyncio.get_running_loop()
+        started = first = None
+        try:
+            if not await self._wait_for_viewer(replay):
+                replay.state = "STOPPED" if replay.stop_event.is_set() else "EXPIRED"
+                return
+            async for point in self._points(replay):
+                timestamp = _aware(point["timestamp"])
+                if first is None:
+                    started, first = loop.time(), timestamp
+                delay = (timestamp - first).total_seconds() / replay.speed - (loop.time() - started)
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(replay.stop_event.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                if replay.stop_event.is_set():
+                    replay.state = "STOPPED"
+                    return
+                await connection_manager.broadcast_to(replay.id, LiveTelemetryMessage(
+                    flight_id=point["flight_plan_id"],
+                    drone_id=point["drone_id"],
+                    lat=point["latitude"],
+                    lon=point["longitude"],
+                    alt=point["altitude_m"],
+                    timestamp=timestamp,
+                    speed=point["speed_mps"],
+                    heading=point["heading_degrees"],
+                    status_message=point["status_message"],
+                    replay_id=replay.id,
+                ).model_dump(mode="json"))
+                replay.points_sent += 1
+                replay.position = timestamp
+            replay.state = "STOPPED" if replay.stop_event.is_set() else "COMPLETED"
+        except Exception as e:
+            print(f"Replay {replay.id} of flight {replay.flight_plan_id} failed: {e}")
+            replay.state = "FAILED"
+        finally:
+            await connection_manager.close_scope(replay.id)
+
+
+telemetry_replay_service = TelemetryReplayService()
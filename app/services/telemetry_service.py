@@ -1,27 +1,34 @@
 import asyncio
+import concurrent.futures
 import random
 import time
+import uuid
 from datetime import datetime, timezone
-from typing import List, Dict, Set, Optional
+from typing import Any, List, Dict, Set, Optional, Tuple
 from fastapi import WebSocket, WebSocketDisconnect
 from sqlalchemy.orm import Session
 
 from app.models.flight_plan import FlightPlan, FlightPlanStatus
 from app.models.drone import Drone, DroneStatus
 from app.models.telemetry_log import TelemetryLog
-from app.schemas.telemetry import TelemetryLogCreate, LiveTelemetryMessage
-from app.crud import telemetry_log as crud_telemetry_log
+from app.schemas.telemetry import TelemetryLogCreate, LiveTelemetryMessage, ConformanceAlertMessage
 from app.crud import drone as crud_drone
 from app.crud import flight_plan as crud_flight_plan # For completing flight
+from app.crud import simulation_checkpoint as crud_simulation_checkpoint
+from app.core.config import settings
 from app.db.session import SessionLocal # To create new sessions in async tasks
 from app.services.nfz_service import nfz_service # For in-flight NFZ checks
+from app.services.deconfliction_service import deconfliction_service
+from app.services.conflict_detection_service import conflict_detection_service
+from app.services.conformance_service import conformance_service
+from app.services.telemetry_spool import telemetry_spool
 
 
 class ConnectionManager:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
-        # For targeted messages if needed in future (e.g., per organization_id)
-        # self.scoped_connections: Dict[Any, List[WebSocket]] = {}
+        # Targeted messages (e.g. one replay's frames), kept out of the live broadcast
+        self.scoped_connections: Dict[Any, List[WebSocket]] = {}
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
@@ -52,22 +59,106 @@ class ConnectionManager:
         for ws in disconnected_sockets:
             self.disconnect(ws)
 
+    def subscribe(self, scope: Any, websocket: WebSocket) -> None:
+        """Add an accepted connection to a scope; it receives only broadcast_to(scope) messages."""
+        self.scoped_connections.setdefault(scope, []).append(websocket)
+
+    def unsubscribe(self, scope: Any, websocket: WebSocket) -> None:
+        connections = self.scoped_connections.get(scope, [])
+        if websocket in connections:
+            connections.remove(websocket)
+        if not connections:
+            self.scoped_connections.pop(scope, None)
+
+    async def broadcast_to(self, scope: Any, message_data: dict) -> None:
+        for connection in list(self.scoped_connections.get(scope, [])):
+            try:
+                await connection.send_json(message_data)
+            except (WebSocketDisconnect, RuntimeError):
+                self.unsubscribe(scope, connection)
+
+    async def close_scope(self, scope: Any, code: int = 1000) -> None:
+        for connection in self.scoped_connections.pop(scope, []):
+            try:
+                await connection.close(code=code)
+            except RuntimeError: # Already closing
+                pass
+
+    async def close_all(self, code: int = 1001) -> None:
+        """Close every connection (1001 going away: clients reconnect, to another instance during a deploy)."""
+        for connection in list(self.active_connections):
+            try:
+                await connection.close(code=code)
+            except RuntimeError: # Already closing
+                pass
+            self.disconnect(connection)
+        for scope in list(self.scoped_connections):
+            await self.close_scope(scope, code=code)
+
 
 class TelemetryService:
     def __init__(self):
-        self.active_simulations: Dict[int, asyncio.Task] = {} # flight_plan_id -> Task
+        self.active_simulations: Dict[int, Any] = {} # flight_plan_id -> Task (or Future when scheduled from a thread)
         self.simulation_stop_events: Dict[int, asyncio.Event] = {} # flight_plan_id -> Event
+        self.loop: Optional[asyncio.AbstractEventLoop] = None # Set at startup; sync endpoints run in worker threads
+        self.suspending = False # Shutting down: stopped simulations keep their flight ACTIVE and checkpoint
+        self.instance_id = uuid.uuid4().hex # Owner of this process's simulation leases
+        self._resumer_stop_event: Optional[asyncio.Event] = None
+        self._resumer_task: Optional[asyncio.Task] = None
+
+    def attach_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+
+    def broadcast_threadsafe(self, message_data: dict) -> None:
+        """Broadcast from sync code (worker threads, background tasks); dropped before startup."""
+        if self.loop is None or self.loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(connection_manager.broadcast(message_data), self.loop)
+
+    def evaluate_point(
+        self, db: Session, flight_plan_id: Optional[int], *, latitude: float, longitude: float, altitude_m: float,
+        timestamp: datetime, status_message: Optional[str] = None,
+    ) -> Tuple[str, List[ConformanceAlertMessage]]:
+        """
+        Status message of one telemetry point (NFZ breaches, route conformance)
+        and the conformance alerts it starts. Shared by the simulator and ingest.
+        """
+        status_message = status_message or "ON_SCHEDULE"
+        nfz_breaches = nfz_service.check_point_against_nfzs(db, latitude, longitude, altitude_m, at=timestamp)
+        if nfz_breaches:
+            status_message = f"ALERT_NFZ: Breached {', '.join([b['name'] for b in nfz_breaches])}"
+
+        conformance_alerts: List[ConformanceAlertMessage] = []
+        if flight_plan_id is not None:
+            conformance_status, conformance_alerts = conformance_service.check(
+                flight_plan_id, latitude=latitude, longitude=longitude, altitude_m=altitude_m, timestamp=timestamp
+            )
+            if conformance_status:
+                status_message = conformance_status if status_message == "ON_SCHEDULE" else f"{status_message}; {conformance_status}"
+        return status_message[:255], conformance_alerts # TelemetryLog.status_message is VARCHAR(255)
 
     async def _simulate_flight_telemetry(self, flight_plan_id: int, stop_event: asyncio.Event):
         """Simulates telemetry for a given flight plan."""
         # Create a new DB session for this long-running task
         # This is important because the original request's session will be closed.
         db: Session = SessionLocal()
+        airborne_drone_id: Optional[int] = None # Fed to the conflict detector while flying
         try:
             fp = crud_flight_plan.get_flight_plan_with_details(db, id=flight_plan_id)
             if not fp or not fp.waypoints:
                 print(f"Flight plan {flight_plan_id} not found or no waypoints for simulation.")
                 return
+            airborne_drone_id = fp.drone_id
+
+            # Only the process holding the flight's lease simulates it
+            claimed = crud_simulation_checkpoint.claim(
+                db, flight_plan_id=fp.id, owner=self.instance_id, lease_seconds=settings.SIMULATION_LEASE_SECONDS,
+            )
+            db.commit()
+            if not claimed:
+                print(f"Flight {flight_plan_id} is simulated by another process.")
+                airborne_drone_id = None
+                return
 
             # Update drone status to ACTIVE
             db_drone = crud_drone.get(db, id=fp.drone_id)
@@ -77,8 +168,29 @@ class TelemetryService:
                 db.commit()
                 db.refresh(db_drone)
 
-            current_waypoint_index = 0
+            # Resume where a previous process left off (see suspend_simulations / resume_simulations)
+            checkpoint = crud_simulation_checkpoint.get_by_flight(db, flight_plan_id=fp.id)
+            current_waypoint_index = checkpoint.waypoint_index if checkpoint else 0
+            points_emitted = checkpoint.points_emitted if checkpoint else 0
+            last_emitted_at = checkpoint.last_emitted_at if checkpoint else None
             num_waypoints = len(fp.waypoints)
+            loop = asyncio.get_running_loop()
+            last_checkpoint = last_renewed = loop.time()
+
+            def save_checkpoint():
+                crud_simulation_checkpoint.save(
+                    db, flight_plan_id=fp.id, waypoint_index=current_waypoint_index,
+                    points_emitted=points_emitted, last_emitted_at=last_emitted_at,
+                )
+                db.commit()
+
+            if last_emitted_at is not None:
+                # Keep the reporting interval across the restart
+                if last_emitted_at.tzinfo is None: # SQLite hands back naive UTC
+                    last_emitted_at = last_emitted_at.replace(tzinfo=timezone.utc)
+                elapsed = (datetime.now(timezone.utc) - last_emitted_at).total_seconds()
+                await self._wait(stop_event, settings.SIMULATION_POINT_INTERVAL_SECONDS - elapsed)
+                print(f"Resuming simulation for flight {flight_plan_id} at waypoint {current_waypoint_index}/{num_waypoints}.")
             
             # Simplified: Assume linear interpolation between waypoints
             # A real simulation would be much more complex (speed, turns, ascent/descent rates)
@@ -100,15 +212,13 @@ class TelemetryService:
                 timestamp = datetime.now(timezone.utc)
                 speed_mps = random.uniform(5, 15) # m/s
                 heading_degrees = random.uniform(0, 359.9)
-                status_message = "ON_SCHEDULE"
 
-                # In-flight NFZ check (using the new DB session)
-                nfz_breaches = nfz_service.check_point_against_nfzs(db, lat, lon, alt)
-                if nfz_breaches:
-                    status_message = f"ALERT_NFZ: Breached {', '.join([b['name'] for b in nfz_breaches])}"
-                    # Potentially trigger other alert mechanisms
+                # In-flight NFZ check and conformance with the approved route corridor
+                status_message, conformance_alerts = self.evaluate_point(
+                    db, fp.id, latitude=lat, longitude=lon, altitude_m=alt, timestamp=timestamp
+                )
 
-                # Create and store telemetry log
+                # Store the telemetry log through the spool (also moves the drone's last seen / last telemetry)
                 log_entry = TelemetryLogCreate(
                     flight_plan_id=fp.id,
                     drone_id=fp.drone_id,
@@ -120,14 +230,20 @@ class TelemetryService:
                     heading_degrees=heading_degrees,
                     status_message=status_message,
                 )
-                db_log_entry = crud_telemetry_log.create(db, obj_in=log_entry)
+                telemetry_spool.write(db, [log_entry.model_dump()])
+                points_emitted += 1
+                last_emitted_at = timestamp
 
-                # Update drone's last seen and last telemetry
-                if db_drone:
-                    db_drone.last_seen_at = timestamp
-                    db_drone.last_telemetry_id = db_log_entry.id # type: ignore
-                    db.add(db_drone)
-                    db.commit() # Commit frequently for updates to be visible
+                conflict_detection_service.update(
+                    drone_id=fp.drone_id,
+                    flight_plan_id=fp.id,
+                    latitude=lat,
+                    longitude=lon,
+                    altitude_m=alt,
+                    speed_mps=speed_mps,
+                    heading_degrees=heading_degrees,
+                    timestamp=timestamp,
+                )
 
                 # Broadcast telemetry via WebSocket
                 live_message = LiveTelemetryMessage(
@@ -141,11 +257,25 @@ class TelemetryService:
                     heading=heading_degrees,
                     status_message=status_message,
                 )
-                await connection_manager.broadcast(live_message.model_dump())
+                await connection_manager.broadcast(live_message.model_dump(mode="json"))
+                for alert in conformance_alerts:
+                    await connection_manager.broadcast(alert.model_dump(mode="json"))
                 
                 # Move to next waypoint after a delay
-                await asyncio.sleep(5) # Telemetry update interval
+                await self._wait(stop_event, settings.SIMULATION_POINT_INTERVAL_SECONDS) # Telemetry update interval
                 current_waypoint_index += 1
+                if loop.time() - last_checkpoint >= settings.SIMULATION_CHECKPOINT_INTERVAL_SECONDS:
+                    save_checkpoint()
+                    last_checkpoint = loop.time()
+                if loop.time() - last_renewed >= settings.SIMULATION_LEASE_SECONDS / 3:
+                    renewed = crud_simulation_checkpoint.renew(
+                        db, flight_plan_id=fp.id, owner=self.instance_id, lease_seconds=settings.SIMULATION_LEASE_SECONDS,
+                    )
+                    db.commit()
+                    if not renewed: # Stalled past the lease and another process took over: leave the flight to it
+                        print(f"Simulation for flight {flight_plan_id} lost its lease; stopping here.")
+                        return
+                    last_renewed = loop.time()
 
                 if stop_event.is_set():
                     print(f"Simulation for flight {flight_plan_id} stopped by event.")
@@ -153,6 +283,13 @@ class TelemetryService:
                     # Log one final telemetry point indicating interruption if needed
                     break
             
+            if stop_event.is_set() and self.suspending:
+                # Process shutting down: flight and drone stay ACTIVE, the next process resumes from here
+                crud_simulation_checkpoint.release(db, flight_plan_id=fp.id, owner=self.instance_id)
+                save_checkpoint()
+                print(f"Simulation for flight {flight_plan_id} suspended at waypoint {current_waypoint_index}/{num_waypoints}.")
+                return
+
             # Simulation finished (either completed waypoints or stopped)
             final_status_message = "FLIGHT_COMPLETED"
             if stop_event.is_set() and current_waypoint_index < num_waypoints:
@@ -164,13 +301,15 @@ class TelemetryService:
             db.refresh(fp) # Refresh fp object
             if not stop_event.is_set() and fp.status == FlightPlanStatus.ACTIVE:
                 crud_flight_plan.complete_flight(db, db_obj=fp)
+                deconfliction_service.remove_plan(fp.id)
                 final_status_message = "FLIGHT_COMPLETED"
             
             # Update drone status to IDLE
             if db_drone:
                 db_drone.current_status = DroneStatus.IDLE
                 db.add(db_drone)
-                db.commit()
+            crud_simulation_checkpoint.remove_for_flight(db, flight_plan_id=fp.id)
+            db.commit()
             
             print(f"Simulation for flight {flight_plan_id} ended with status: {final_status_message}.")
 
@@ -183,16 +322,32 @@ class TelemetryService:
                 db.commit()
         finally:
             db.close() # Ensure the session is closed for this task
+            if airborne_drone_id is not None:
+                conflict_detection_service.forget(airborne_drone_id)
+            conformance_service.stop_monitoring(flight_plan_id)
             if flight_plan_id in self.active_simulations:
                 del self.active_simulations[flight_plan_id]
             if flight_plan_id in self.simulation_stop_events:
                 del self.simulation_stop_events[flight_plan_id]
 
 
+    @staticmethod
+    async def _wait(stop_event: asyncio.Event, seconds: float) -> None:
+        """Sleep, cut short by the stop event."""
+        if seconds <= 0:
+            return
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
     def start_flight_simulation(self, db: Session, flight_plan: FlightPlan):
         if flight_plan.id in self.active_simulations:
             print(f"Simulation for flight {flight_plan.id} is already active.")
             return
+        if self.suspending:
+            print(f"Shutting down: simulation for flight {flight_plan.id} will start with the next process.")
+            return
 
         stop_event = asyncio.Event()
         self.simulation_stop_events[flight_plan.id] = stop_event
@@ -200,13 +355,25 @@ class TelemetryService:
         # We pass flight_plan.id instead of the whole object
         # because the object might become stale if the DB session that loaded it closes.
         # The async task will create its own DB session.
-        task = asyncio.create_task(self._simulate_flight_telemetry(flight_plan.id, stop_event))
+        coro = self._simulate_flight_telemetry(flight_plan.id, stop_event)
+        try:
+            task = asyncio.get_running_loop().create_task(coro)
+        except RuntimeError: # Called from a sync endpoint's worker thread
+            if self.loop is None:
+                coro.close()
+                del self.simulation_stop_events[flight_plan.id]
+                raise
+            task = asyncio.run_coroutine_threadsafe(coro, self.loop)
         self.active_simulations[flight_plan.id] = task
         print(f"Started simulation for flight {flight_plan.id}")
 
     def stop_flight_simulation(self, flight_plan_id: int):
         if flight_plan_id in self.simulation_stop_events:
-            self.simulation_stop_events[flight_plan_id].set() # Signal the task to stop
+            stop_event = self.simulation_stop_events[flight_plan_id]
+            if self.loop is not None:
+                self.loop.call_soon_threadsafe(stop_event.set) # Signal the task to stop
+            else:
+                stop_event.set()
             print(f"Stop signal sent for flight simulation {flight_plan_id}")
         else:
             print(f"No active simulation found to stop for flight {flight_plan_id}")
@@ -215,5 +382,77 @@ class TelemetryService:
         # if flight_plan_id in self.active_simulations:
         #     self.active_simulations[flight_plan_id].cancel()
 
+    def resume_simulations(self, db: Session) -> int:
+        """
+        Restart the simulation of every ACTIVE flight no other process holds
+        the lease on, from its checkpoint when there is one, and put the flight
+        back under conformance monitoring. Returns how many were resumed.
+        """
+        crud_simulation_checkpoint.remove_stale(db)
+        db.commit()
+        resumed = 0
+        for fp in crud_flight_plan.get_with_waypoints_by_status(db, statuses=[FlightPlanStatus.ACTIVE]):
+            if fp.id in self.active_simulations:
+                continue
+            claimed = crud_simulation_checkpoint.claim(
+                db, flight_plan_id=fp.id, owner=self.instance_id, lease_seconds=settings.SIMULATION_LEASE_SECONDS,
+            )
+            db.commit()
+            if not claimed:
+                continue
+            if not conformance_service.is_monitoring(fp.id):
+                conformance_service.start_monitoring(fp)
+            self.start_flight_simulation(db, flight_plan=fp)
+            resumed += 1
+        return resumed
+
+    def _resume_once(self) -> int:
+        db = SessionLocal()
+        try:
+            return self.resume_simulations(db)
+        finally:
+            db.close()
+
+    async def run_resumer(self) -> None:
+        """
+        Resume unclaimed ACTIVE flights at startup and then every
+        SIMULATION_LEASE_SECONDS, so flights released by a process shutting
+        down (rolling deploy) or left by one that died are picked up.
+        """
+        self._resumer_stop_event = asyncio.Event()
+        while not self._resumer_stop_event.is_set():
+            try:
+                resumed = await asyncio.to_thread(self._resume_once)
+                if resumed:
+                    print(f"Resumed {resumed} flight simulation(s).")
+            except Exception as e:
+                print(f"Resuming flight simulations failed: {e}")
+            await self._wait(self._resumer_stop_event, settings.SIMULATION_LEASE_SECONDS)
+
+    def start_resumer(self) -> None:
+        if self._resumer_task is None:
+            self._resumer_task = asyncio.create_task(self.run_resumer())
+
+    async def suspend_simulations(self) -> int:
+        """
+        Stop every simulation for shutdown and wait for each to save its
+        checkpoint. Flights and drones stay ACTIVE so the next process resumes
+        them. Returns how many were suspended.
+        """
+        self.suspending = True
+        if self._resumer_task is not None:
+            if self._resumer_stop_event is not None:
+                self._resumer_stop_event.set()
+            await asyncio.gather(self._resumer_task, return_exceptions=True)
+            self._resumer_task = None
+        tasks = [
+            asyncio.wrap_future(task) if isinstance(task, concurrent.futures.Future) else task
+            for task in self.active_simulations.values()
+        ]
+        for stop_event in list(self.simulation_stop_events.values()):
+            stop_event.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return len(tasks)
+
 telemetry_service = TelemetryService() # Singleton instance
 connection_manager = ConnectionManager() # Singleton instance
\ No newline at end of file
@@ -0,0 +1,404 @@
+# app/services/telemetry_spool.py
+import fcntl
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import drone as crud_drone
+from app.crud import telemetry_log as crud_telemetry_log
+from app.db.session import SessionLocal
+
+MAGIC = b"TSP1"
+HEADER = struct.Struct("<4sIQ") # magic, version, drained offset
+RECORD = struct.Struct("<IId") # payload length, crc32 of payload, appended at (epoch)
+DEAD_LETTER = "dead-letter.jsonl"
+
+
+def write_direct(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """Insert telemetry rows and move each drone's last seen to its newest row; commits."""
+    crud_telemetry_log.create_bulk(db, rows=rows)
+    latest: Dict[int, datetime] = {}
+    for row in rows:
+        if row["drone_id"] not in latest or latest[row["drone_id"]] <= row["timestamp"]:
+            latest[row["drone_id"]] = row["timestamp"]
+    crud_drone.update_last_seen_bulk(db, latest=[{"b_id": drone_id, "b_seen": seen} for drone_id, seen in latest.items()])
+    db.commit()
+
+
+class _Segment:
+    """
+    One memory-mapped spool file: a header holding how far it has been drained,
+    then length/CRC-framed records. The file is preallocated (zero-filled), so
+    a zero length marks the end; a torn record fails its CRC on recovery.
+    """
+
+    def __init__(self, path: str, fd: int, size: int):
+        self.path = path
+        self.fd = fd
+        self.size = size
+        self.map = mmap.mmap(fd, size)
+        self.write_offset = HEADER.size
+        self.drained_offset = HEADER.size
+        self.pending = 0 # Records appended but not drained
+        self.oldest_pending_at: Optional[float] = None
+
+    @classmethod
+    def create(cls, path: str, size: int) -> "_Segment":
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+        os.ftruncate(fd, size)
+        segment = cls(path, fd, size)
+        HEADER.pack_into(segment.map, 0, MAGIC, 1, HEADER.size)
+        return segment
+
+    @classmethod
+    def recover(cls, path: str) -> Optional["_Segment"]:
+        fd = os.open(path, os.O_RDWR)
+        size = os.fstat(fd).st_size
+        if size <= HEADER.size:
+            os.close(fd)
+            return None
+        segment = cls(path, fd, size)
+        magic, _, drained = HEADER.unpack_from(segment.map, 0)
+        if magic != MAGIC:
+            segment.close()
+            return None
+        offset = HEADER.size
+        while offset + RECORD.size <= size:
+            length, crc, appended_at = RECORD.unpack_from(segment.map, offset)
+            end = offset + RECORD.size + length
+            if length == 0 or end > size or zlib.crc32(segment.map[offset + RECORD.size:end]) != crc:
+                break
+            if offset >= drained:
+                segment.pending += 1
+                if segment.oldest_pending_at is None:
+                    segment.oldest_pending_at = appended_at
+            offset = end
+        segment.write_offset = offset
+        segment.drained_offset = min(max(drained, HEADER.size), offset)
+        return segment
+
+    def append(self, payload: bytes, now: float) -> bool:
+        end = self.write_offset + RECORD.size + len(payload)
+        if end > self.size:
+            return False
+        self.map[self.write_offset + RECORD.size:end] = payload
+        # Frame last, so a crash mid-write leaves a zero length or a bad CRC
+        RECORD.pack_into(self.map, self.write_offset, len(payload), zlib.crc32(payload), now)
+        self.write_offset = end
+        self.pending += 1
+        if self.oldest_pending_at is None:
+            self.oldest_pending_at = now
+        return True
+
+    def read(self, start: int, end: int, limit: int) -> Tuple[List[Dict[str, Any]], int]:
+        """Up to `limit` rows between offsets start and end; returns (rows, offset after the last one)."""
+        rows, offset = [], start
+        while offset < end and len(rows) < limit:
+            length, _, _ = RECORD.unpack_from(self.map, offset)
+            row = orjson.loads(self.map[offset + RECORD.size:offset + RECORD.size + length])
+            row["timestamp"] = datetime.fromisoformat(row["timestamp"])
+            rows.append(row)
+            offset += RECORD.size + length
+        return rows, offset
+
+    def next_appended_at(self, offset: int) -> Optional[float]:
+        if offset >= self.write_offset:
+            return None
+        return RECORD.unpack_from(self.map, offset)[2]
+
+    def mark_drained(self, offset: int, count: int) -> None:
+        struct.pack_into("<Q", self.map, 8, offset)
+        self.drained_offset = offset
+        self.pending -= count
+        self.oldest_pending_at = self.next_appended_at(offset)
+
+    def flush(self) -> None:
+        self.map.flush()
+
+    def close(self) -> None:
+        self.map.close()
+        os.close(self.fd)
+
+
+class TelemetrySpool:
+    """
+    Local write-ahead spool for telemetry. Points are appended to
+    memory-mapped segment files (no database round trip) and a background
+    thread bulk-loads them into telemetry_logs, oldest first. While the
+    database is slow or down the drainer keeps retrying and the spool grows;
+    nothing is dropped. Replays are idempotent thanks to the unique
+    (drone_id, timestamp) index, so a drain interrupted between commit and
+    marking the segment is harmless.
+
+    A chunk that still fails after TELEMETRY_SPOOL_MAX_ATTEMPTS is retried
+    row by row; rows the database rejects while it is otherwise healthy are
+    moved to dead-letter.jsonl in the slot directory so they stop blocking
+    the points behind them.
+
+    Each worker process claims one slot directory under TELEMETRY_SPOOL_DIR
+    with an exclusive lock and adopts the segments of every other slot that
+    is not locked, so points left by workers that no longer exist are
+    drained too. Until open() is called (or when the spool is full), write()
+    goes straight to the database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._segments: List[_Segment] = [] # Oldest first; the last one takes appends
+        self._slot_dir: Optional[str] = None
+        self._lock_fd: Optional[int] = None
+        self._next_seq = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._wake = threading.Event()
+        self.appended_total = 0
+        self.drained_total = 0
+        self.direct_writes = 0 # Batches written around the spool (not open, or full)
+        self.drain_failures = 0
+        self.dead_lettered_total = 0
+        self._head_failures = 0 # Consecutive failed attempts at the chunk at the head of the spool
+        self.last_drain_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._slot_dir is not None
+
+    def open(self) -> None:
+        """Claim a slot directory and recover its segments."""
+        if self.is_open:
+            return
+        for slot in range(settings.TELEMETRY_SPOOL_SLOTS):
+            slot_dir = os.path.join(settings.TELEMETRY_SPOOL_DIR, f"slot-{slot}")
+            os.makedirs(slot_dir, exist_ok=True)
+            fd = os.open(os.path.join(slot_dir, "lock"), os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            self._lock_fd, self._slot_dir = fd, slot_dir
+            break
+        else:
+            raise RuntimeError(f"All {settings.TELEMETRY_SPOOL_SLOTS} telemetry spool slots are in use.")
+
+        names = sorted(name for name in os.listdir(self._slot_dir) if name.endswith(".seg"))
+        self._next_seq = int(names[-1][:-4]) + 1 if names else 0
+        names += self._adopt_orphans()
+        for name in names:
+            path = os.path.join(self._slot_dir, name)
+            segment = _Segment.recover(path)
+            if segment is None:
+                os.remove(path)
+            elif segment.pending:
+                self._segments.append(segment)
+            else:
+                segment.close()
+                os.remove(path)
+            self._next_seq = max(self._next_seq, int(name[:-4]) + 1)
+        recovered = sum(segment.pending for segment in self._segments)
+        if recovered:
+            print(f"Telemetry spool {self._slot_dir}: {recovered} points to replay.")
+
+    def _adopt_orphans(self) -> List[str]:
+        """
+        Move the segments of every unlocked slot directory (including slots
+        beyond TELEMETRY_SPOOL_SLOTS) into ours; returns their new names.
+        """
+        adopted = []
+        for slot in sorted(os.listdir(settings.TELEMETRY_SPOOL_DIR)):
+            slot_dir = os.path.join(settings.TELEMETRY_SPOOL_DIR, slot)
+            if not slot.startswith("slot-") or slot_dir == self._slot_dir or not os.path.isdir(slot_dir):
+                continue
+            fd = os.open(os.path.join(slot_dir, "lock"), os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError: # Owned by a running worker
+                os.close(fd)
+                continue
+            try:
+                for name in sorted(name for name in os.listdir(slot_dir) if name.endswith(".seg")):
+                    new_name = f"{self._next_seq:012d}.seg"
+                    self._next_seq += 1
+                    os.rename(os.path.join(slot_dir, name), os.path.join(self._slot_dir, new_name))
+                    adopted.append(new_name)
+            finally:
+                os.close(fd)
+        return adopted
+
+    def _roll(self) -> _Segment:
+        path = os.path.join(self._slot_dir, f"{self._next_seq:012d}.seg")
+        self._next_seq += 1
+        segment = _Segment.create(path, settings.TELEMETRY_SPOOL_SEGMENT_BYTES)
+        self._segments.append(segment)
+        return segment
+
+    def append(self, rows: List[Dict[str, Any]]) -> bool:
+        """Spool rows; False (nothing spooled) when the spool is closed or would exceed TELEMETRY_SPOOL_MAX_BYTES."""
+        if not self.is_open:
+            return False
+        payloads = [orjson.dumps(row) for row in rows]
+        needed = sum(RECORD.size + len(payload) for payload in payloads)
+        now = time.time()
+        with self._lock:
+            if len(self._segments) * settings.TELEMETRY_SPOOL_SEGMENT_BYTES + needed > settings.TELEMETRY_SPOOL_MAX_BYTES:
+                return False
+            segment = self._segments[-1] if self._segments else self._roll()
+            for payload in payloads:
+                if not segment.append(payload, now):
+                    segment = self._roll()
+                    if not segment.append(payload, now):
+                        raise ValueError("Telemetry point larger than a spool segment.")
+            if settings.TELEMETRY_SPOOL_FSYNC:
+                segment.flush()
+            self.appended_total += len(rows)
+        self._wake.set()
+        return True
+
+    def write(self, db: Session, rows: List[Dict[str, Any]]) -> None:
+        """Entry point for telemetry writes: spool, or write through when the spool cannot take them."""
+        if not rows:
+            return
+        if not self.append(rows):
+            self.direct_writes += 1
+            write_direct(db, rows)
+
+    def drain_once(self) -> int:
+        """Load the next chunk of the oldest segment into the database; returns the rows drained."""
+        with self._lock:
+            if not self._segments:
+                return 0
+            segment = self._segments[0]
+            end, sealed = segment.write_offset, segment is not self._segments[-1]
+        rows, offset = segment.read(segment.drained_offset, end, settings.TELEMETRY_SPOOL_DRAIN_BATCH)
+        if rows:
+            db = SessionLocal()
+            try:
+                if self._head_failures >= settings.TELEMETRY_SPOOL_MAX_ATTEMPTS:
+                    self._write_isolating(db, rows)
+                else:
+                    try:
+                        write_direct(db, rows)
+                    except Exception:
+                        self._head_failures += 1
+                        raise
+            finally:
+                db.close()
+        with self._lock:
+            self._head_failures = 0
+            segment.mark_drained(offset, len(rows))
+            self.drained_total += len(rows)
+            self.last_drain_at = time.time()
+            if sealed and segment.drained_offset >= segment.write_offset:
+                self._segments.pop(0)
+                segment.close()
+                os.remove(segment.path)
+        return len(rows)
+
+    def _write_isolating(self, db: Session, rows: List[Dict[str, Any]]) -> None:
+        """
+        Write a chunk that keeps failing one row at a time, dead-lettering the
+        rows that fail while the database still answers. Raises (nothing is
+        dead-lettered) when the database itself is unavailable.
+        """
+        try:
+            write_direct(db, rows)
+            return
+        except Exception:
+            db.rollback()
+        for row in rows:
+            try:
+                write_direct(db, [row])
+            except Exception as e:
+                db.rollback()
+                db.execute(text("SELECT 1")) # Raises when the database is down rather than the row bad
+                db.rollback()
+                self._dead_letter(row, str(e)[:500])
+
+    def _dead_letter(self, row: Dict[str, Any], error: str) -> None:
+        with open(os.path.join(self._slot_dir, DEAD_LETTER), "ab") as f:
+            f.write(orjson.dumps({"row": row, "error": error, "dead_lettered_at": time.time()}) + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.dead_lettered_total += 1
+        print(f"Telemetry spool {self._slot_dir}: dead-lettered a point for drone {row.get('drone_id')}: {error.splitlines()[0]}")
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                drained = self.drain_once()
+                self.last_error = None
+            except Exception as e: # Database down or slow: keep the points and retry later
+                self.drain_failures += 1
+                self.last_error = str(e)[:500]
+                self._stop_event.wait(settings.TELEMETRY_SPOOL_RETRY_SECONDS)
+                continue
+            if not drained:
+                self._wake.wait(settings.TELEMETRY_SPOOL_DRAIN_INTERVAL_SECONDS)
+                self._wake.clear()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        self.open()
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="telemetry-spool-drainer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the drainer after a last drain attempt; undrained points stay on disk for the next start."""
+        if self._thread is not None:
+            self._stop_event.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        if not self.is_open:
+            return
+        try:
+            while self.drain_once():
+                pass
+        except Exception as e:
+            self.last_error = str(e)[:500]
+        with self._lock:
+            for segment in self._segments:
+                segment.flush()
+                segment.close()
+            self._segments = []
+            os.close(self._lock_fd)
+            self._lock_fd = self._slot_dir = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            oldest = min((s.oldest_pending_at for s in self._segments if s.oldest_pending_at is not None), default=None)
+            return {
+                "enabled": self.is_open,
+                "slot_dir": self._slot_dir,
+                "segments": len(self._segments),
+                "bytes": len(self._segments) * settings.TELEMETRY_SPOOL_SEGMENT_BYTES,
+                "max_bytes": settings.TELEMETRY_SPOOL_MAX_BYTES,
+                "pending_points": sum(s.pending for s in self._segments),
+                "lag_seconds": round(time.time() - oldest, 3) if oldest is not None else 0.0,
+                "appended_total": self.appended_total,
+                "drained_total": self.drained_total,
+                "direct_writes": self.direct_writes,
+                "drain_failures": self.drain_failures,
+                "dead_lettered_total": self.dead_lettered_total,
+                "last_drain_at": datetime.fromtimestamp(self.last_drain_at, tz=timezone.utc) if self.last_drain_at else None,
+                "last_error": self.last_error,
+            }
+
+
+telemetry_spool = TelemetrySpool()
@@ -0,0 +1,21 @@
+"""
+Benchmark scripts, run as `python -m benchmarks.<name>`.
+
+Fills in the settings the app requires, so the scripts run without a .env.
+"""
+
+import os
+
+for _key, _value in {
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "bench",
+    "POSTGRES_PASSWORD": "bench",
+    "POSTGRES_DB": "bench",
+    "DATABASE_URL": "sqlite://",
+    "SECRET_KEY": "benchmark-secret",
+    "FIRST_SUPERUSER_EMAIL": "admin@example.com",
+    "FIRST_SUPERUSER_PASSWORD": "changethis",
+    "FIRST_SUPERUSER_FULL_NAME": "Authority Admin",
+    "FIRST_SUPERUSER_IIN": "000000000000",
+}.items():
+    os.environ.setdefault(_key, _value)
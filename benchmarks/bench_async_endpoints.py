@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Throughput of the sync (threadpool) vs async (AsyncSession) read paths.
+
+Serves the same "flight plans with waypoints for a pilot" query twice from a
+small FastAPI app, once as a `def` endpoint on the sync Session and once as an
+`async def` endpoint on the AsyncSession, and drives each with concurrent
+requests through httpx's ASGI transport.
+
+Run with: python -m benchmarks.bench_async_endpoints [--database-url URL]
+(defaults to a temporary SQLite file, which needs aiosqlite; pass a
+postgresql:// URL to measure against a real server with asyncpg).
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", default=None, help="sync URL, e.g. postgresql://user:pw@host/db")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--plans", type=int, default=20, help="flight plans seeded for the pilot")
+    return parser.parse_args()
+
+
+args = parse_args()
+if args.database_url is None:
+    args.database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_async.db')}"
+# Must be set before the app's engines are created on import
+os.environ["DATABASE_URL"] = args.database_url
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from benchmarks.common import seed_flight_plan  # noqa: E402
+from app.api import deps  # noqa: E402
+from app.crud import flight_plan as crud_flight_plan  # noqa: E402
+from app.db.async_session import async_engine  # noqa: E402
+from app.db.base_class import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models.flight_plan import FlightPlan  # noqa: E402
+from app.schemas import FlightPlanReadWithWaypoints  # noqa: E402
+
+bench_app = FastAPI()
+
+
+@bench_app.get("/sync/{user_id}", response_model=list[FlightPlanReadWithWaypoints])
+def sync_plans(user_id: int, db: Session = Depends(deps.get_read_db)):
+    return crud_flight_plan.get_multi_for_user_with_details(db, user_id=user_id)
+
+
+@bench_app.get("/async/{user_id}", response_model=list[FlightPlanReadWithWaypoints])
+async def async_plans(user_id: int, db: AsyncSession = Depends(deps.get_async_read_db)):
+    return await crud_flight_plan.get_multi_for_user_with_details_async(db, user_id=user_id)
+
+
+def seed(plans: int) -> int:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        first = seed_flight_plan(db, suffix="async-bench")
+        for _ in range(plans - 1):
+            db.add(FlightPlan(
+                user_id=first.user_id,
+                drone_id=first.drone_id,
+                planned_departure_time=first.planned_departure_time,
+                planned_arrival_time=first.planned_arrival_time,
+                status=first.status,
+            ))
+        db.commit()
+        return first.user_id
+    finally:
+        db.close()
+
+
+async def drive(client: httpx.AsyncClient, path: str, total: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            response = await client.get(path)
+            response.raise_for_status()
+
+    await one()  # warm up
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return total / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    user_id = seed(args.plans)
+    transport = httpx.ASGITransport(app=bench_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{args.requests} requests, concurrency {args.concurrency}, {args.plans} plans/response")
+        print(f"database: {engine.url.render_as_string(hide_password=True)}\n")
+        sync_rps = await drive(client, f"/sync/{user_id}", args.requests, args.concurrency)
+        async_rps = await drive(client, f"/async/{user_id}", args.requests, args.concurrency)
+    await async_engine.dispose()
+    print(f"{'def endpoint + Session (threadpool)':<40} {sync_rps:10.1f} req/s")
+    print(f"{'async def endpoint + AsyncSession':<40} {async_rps:10.1f} req/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the hot primary-key / unique-key lookups.
+
+Compares the previous per-call `db.query(...).filter(...).first()` chains with
+the statements CRUDBase now builds once and executes with bound parameters.
+Models without selectin relationships are used so the numbers show statement
+overhead rather than the eager-load queries Drone/User fan out into.
+
+Run with: python -m benchmarks.bench_crud_get [--iterations N]
+"""
+
+import argparse
+
+from benchmarks.common import make_sqlite_session, per_call_us, report, seed_flight_plan
+from app.crud import restricted_zone as crud_restricted_zone
+from app.crud import user_drone_assignment as crud_assignment
+from app.models.restricted_zone import NFZGeometryType, RestrictedZone
+from app.models.user_drone_assignment import UserDroneAssignment
+
+
+def legacy_get(db, model, id):
+    query = db.query(model)
+    if hasattr(model, "deleted_at"):
+        query = query.filter(model.deleted_at.is_(None))
+    return query.filter(model.id == id).first()
+
+
+def legacy_get_assignment(db, user_id, drone_id):
+    return db.query(UserDroneAssignment).filter(
+        UserDroneAssignment.user_id == user_id,
+        UserDroneAssignment.drone_id == drone_id
+    ).first()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100_000)
+    iterations = parser.parse_args().iterations
+
+    db = make_sqlite_session()
+    fp = seed_flight_plan(db, waypoints=0)
+    zone = RestrictedZone(
+        name="Bench NFZ",
+        geometry_type=NFZGeometryType.CIRCLE,
+        definition_json={"center": [76.85, 43.2], "radius_m": 500},
+        created_by_authority_id=fp.user_id,
+    )
+    db.add_all([zone, UserDroneAssignment(user_id=fp.user_id, drone_id=fp.drone_id)])
+    db.commit()
+    zone_id, user_id, drone_id = zone.id, fp.user_id, fp.drone_id
+
+    print(f"{iterations} calls per case (SQLite in-memory, rows already in the identity map)\n")
+    report(
+        "crud.restricted_zone.get(id)",
+        per_call_us(lambda: legacy_get(db, RestrictedZone, zone_id), iterations),
+        per_call_us(lambda: crud_restricted_zone.get(db, id=zone_id), iterations),
+    )
+    report(
+        "crud.user_drone_assignment.get_assignment",
+        per_call_us(lambda: legacy_get_assignment(db, user_id, drone_id), iterations),
+        per_call_us(lambda: crud_assignment.get_assignment(db, user_id=user_id, drone_id=drone_id), iterations),
+    )
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for CRUDBase.update on the drone status / flight plan paths.
+
+Compares the previous implementation (jsonable_encoder over the whole ORM
+object to discover field names) with the mapper-introspected column set.
+
+Run with: python -m benchmarks.bench_crud_update
+"""
+
+from fastapi.encoders import jsonable_encoder
+
+from benchmarks.common import make_sqlite_session, per_call_us, report, seed_flight_plan
+from app.crud import drone as crud_drone
+from app.crud import flight_plan as crud_flight_plan
+from app.crud.base import mapped_column_keys
+from app.models.drone import DroneStatus
+
+ITERATIONS = 2000
+
+
+def legacy_apply(db_obj, update_data):
+    obj_data = jsonable_encoder(db_obj)
+    for field in obj_data:
+        if field in update_data:
+            setattr(db_obj, field, update_data[field])
+
+
+def current_apply(db_obj, update_data):
+    column_keys = mapped_column_keys(type(db_obj))
+    for field, value in update_data.items():
+        if field in column_keys:
+            setattr(db_obj, field, value)
+
+
+def legacy_update(db, db_obj, update_data):
+    legacy_apply(db_obj, update_data)
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+
+
+def main() -> None:
+    db = make_sqlite_session()
+    fp = seed_flight_plan(db)
+    db_drone = crud_drone.get(db, id=fp.drone_id)
+    db_fp = crud_flight_plan.get(db, id=fp.id)
+    statuses = [DroneStatus.ACTIVE, DroneStatus.IDLE]
+    notes = ["first", "second"]
+
+    print(f"{ITERATIONS} iterations per case\n")
+    print("Field application only (no flush):")
+    report(
+        "Drone current_status",
+        per_call_us(lambda: legacy_apply(db_drone, {"current_status": statuses[0]}), ITERATIONS),
+        per_call_us(lambda: current_apply(db_drone, {"current_status": statuses[0]}), ITERATIONS),
+    )
+    report(
+        "FlightPlan notes",
+        per_call_us(lambda: legacy_apply(db_fp, {"notes": notes[0]}), ITERATIONS),
+        per_call_us(lambda: current_apply(db_fp, {"notes": notes[0]}), ITERATIONS),
+    )
+    db.rollback()
+
+    print("\nFull update() round trip (SQLite in-memory, commit + refresh):")
+    counter = {"i": 0}
+
+    def flip():
+        counter["i"] += 1
+        return counter["i"] % 2
+
+    report(
+        "crud.drone.update(current_status)",
+        per_call_us(lambda: legacy_update(db, db_drone, {"current_status": statuses[flip()]}), ITERATIONS),
+        per_call_us(lambda: crud_drone.update(db, db_obj=db_drone, obj_in={"current_status": statuses[flip()]}), ITERATIONS),
+    )
+    report(
+        "crud.flight_plan.update(notes)",
+        per_call_us(lambda: legacy_update(db, db_fp, {"notes": notes[flip()]}), ITERATIONS),
+        per_call_us(lambda: crud_flight_plan.update(db, db_obj=db_fp, obj_in={"notes": notes[flip()]}), ITERATIONS),
+    )
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Strategic deconfliction with a large number of approved plans.
+
+Builds the spatio-temporal index over N synthetic plans (default 50k, spread
+over a ~100 km square and one week) and times conflict checks for new plans,
+compared with a linear scan over every indexed leg.
+
+Run with: python -m benchmarks.bench_deconfliction [--plans N] [--queries N]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.schemas.waypoint import WaypointCreate
+from app.services.deconfliction_service import (
+    DeconflictionService,
+    SpatioTemporalIndex,
+    build_legs,
+    legs_conflict,
+)
+
+ORIGIN_LAT, ORIGIN_LON = 43.0, 76.5
+START = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+def random_plan(rng: random.Random):
+    lat = ORIGIN_LAT + rng.uniform(0, 1.0)
+    lon = ORIGIN_LON + rng.uniform(0, 1.2)
+    alt = rng.uniform(40, 120)
+    waypoints = []
+    for i in range(rng.randint(3, 6)):
+        waypoints.append(WaypointCreate(latitude=lat, longitude=lon, altitude_m=alt, sequence_order=i))
+        lat += rng.uniform(-0.005, 0.005)
+        lon += rng.uniform(-0.005, 0.005)
+        alt = min(max(alt + rng.uniform(-10, 10), 10), 150)
+    departure = START + timedelta(seconds=rng.uniform(0, 7 * 24 * 3600))
+    arrival = departure + timedelta(minutes=rng.uniform(10, 40))
+    return waypoints, departure, arrival
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(round(fraction * (len(values) - 1))), len(values) - 1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--plans", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--scan-queries", type=int, default=20, help="queries for the linear-scan baseline")
+    args = parser.parse_args()
+    rng = random.Random(7)
+    buffer_m = settings.DECONFLICTION_HORIZONTAL_SEPARATION_M
+    time_buffer_s = settings.DECONFLICTION_TIME_BUFFER_SECONDS
+    horizontal, vertical = buffer_m, settings.DECONFLICTION_VERTICAL_SEPARATION_M
+
+    plans = [random_plan(rng) for _ in range(args.plans)]
+    start = time.perf_counter()
+    index = SpatioTemporalIndex(settings.DECONFLICTION_GRID_CELL_DEG, settings.DECONFLICTION_TIME_BUCKET_SECONDS)
+    all_legs = []
+    for plan_id, (waypoints, departure, arrival) in enumerate(plans, start=1):
+        legs = build_legs(plan_id, waypoints, departure, arrival, buffer_m=buffer_m, time_buffer_s=time_buffer_s)
+        index.insert(plan_id, legs)
+        all_legs.extend(legs)
+    build_s = time.perf_counter() - start
+    print(f"indexed {len(index)} plans / {len(all_legs)} legs in {build_s:.2f} s")
+
+    service = DeconflictionService()
+    service._index = index  # Pre-built above; skips the DB load
+    queries = [random_plan(rng) for _ in range(args.queries)]
+    timings_ms, conflicted = [], 0
+    for waypoints, departure, arrival in queries:
+        t0 = time.perf_counter()
+        found = service.find_conflicts(None, waypoints=waypoints, planned_departure_time=departure, planned_arrival_time=arrival)
+        timings_ms.append((time.perf_counter() - t0) * 1000)
+        conflicted += bool(found)
+
+    scan_ms = []
+    for waypoints, departure, arrival in queries[: args.scan_queries]:
+        t0 = time.perf_counter()
+        legs = build_legs(-1, waypoints, departure, arrival, buffer_m=buffer_m, time_buffer_s=time_buffer_s)
+        {other.plan_id for leg in legs for other in all_legs if legs_conflict(leg, other, horizontal, vertical)}
+        scan_ms.append((time.perf_counter() - t0) * 1000)
+
+    print(f"{args.queries} checks, {conflicted} with conflicts")
+    print(f"grid index   p50 {percentile(timings_ms, 0.5):8.3f} ms   p99 {percentile(timings_ms, 0.99):8.3f} ms")
+    print(f"linear scan  p50 {percentile(scan_ms, 0.5):8.3f} ms   ({args.scan_queries} checks)")
+
+
+if __name__ == "__main__":
+    main()
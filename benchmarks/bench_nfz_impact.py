@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+NFZ impact analysis over a city with tens of thousands of plans.
+
+Seeds N unfinished plans (default 50k, with route summaries) over a ~30 km
+square into in-memory SQLite, then times NFZImpactService.analyze() for a
+city-scale circular zone and a polygon zone, compared with checking every
+plan's route against the zone.
+
+Run with: python -m benchmarks.bench_nfz_impact [--plans N] [--radius-m M]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import selectinload, lazyload
+
+from benchmarks.common import make_sqlite_session, seed_flight_plan
+from app.core.geo import haversine_m
+from app.models.flight_plan import FlightPlan
+from app.models.restricted_zone import NFZGeometryType
+from app.models.waypoint import Waypoint
+from app.services.nfz_impact_service import IMPACTED_STATUSES, NFZImpactService
+from app.services.nfz_service import nfz_service
+
+ORIGIN_LAT, ORIGIN_LON = 43.1, 76.7
+
+
+def seed(db, plans: int, rng: random.Random) -> None:
+    owner = seed_flight_plan(db)
+    now = datetime.now(timezone.utc)
+    statuses = IMPACTED_STATUSES
+    plan_rows, waypoint_rows = [], []
+    for plan_id in range(owner.id + 1, owner.id + 1 + plans):
+        lat = ORIGIN_LAT + rng.uniform(0, 0.27)
+        lon = ORIGIN_LON + rng.uniform(0, 0.37)
+        points = []
+        for i in range(rng.randint(3, 8)):
+            points.append((lat, lon, rng.uniform(30, 120)))
+            lat += rng.uniform(-0.004, 0.004)
+            lon += rng.uniform(-0.004, 0.004)
+        departure = now + timedelta(minutes=rng.uniform(0, 7 * 24 * 60))
+        plan_rows.append(dict(
+            id=plan_id,
+            user_id=owner.user_id,
+            drone_id=owner.drone_id,
+            planned_departure_time=departure,
+            planned_arrival_time=departure + timedelta(minutes=30),
+            status=rng.choice(statuses),
+            route_length_m=sum(haversine_m(a[0], a[1], b[0], b[1]) for a, b in zip(points, points[1:])),
+            bbox_min_lat=min(p[0] for p in points),
+            bbox_min_lon=min(p[1] for p in points),
+            bbox_max_lat=max(p[0] for p in points),
+            bbox_max_lon=max(p[1] for p in points),
+            min_altitude_m=min(p[2] for p in points),
+            max_altitude_m=max(p[2] for p in points),
+        ))
+        waypoint_rows.extend(
+            dict(flight_plan_id=plan_id, latitude=p[0], longitude=p[1], altitude_m=p[2], sequence_order=i)
+            for i, p in enumerate(points)
+        )
+    db.execute(insert(FlightPlan), plan_rows)
+    db.execute(insert(Waypoint), waypoint_rows)
+    db.commit()
+
+
+def full_scan(db, zone) -> int:
+    plans = db.execute(
+        select(FlightPlan).options(lazyload("*"), selectinload(FlightPlan.waypoints))
+        .where(FlightPlan.status.in_(IMPACTED_STATUSES))
+    ).scalars().all()
+    return sum(nfz_service.route_distance_to_zone(p.waypoints, zone) == 0.0 for p in plans)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--plans", type=int, default=50_000)
+    parser.add_argument("--radius-m", type=float, default=3000.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    rng = random.Random(5)
+
+    db = make_sqlite_session()
+    start = time.perf_counter()
+    seed(db, args.plans, rng)
+    print(f"seeded {args.plans} plans in {time.perf_counter() - start:.1f} s")
+
+    center_lat, center_lon = ORIGIN_LAT + 0.135, ORIGIN_LON + 0.185
+    zones = {
+        "circle": SimpleNamespace(
+            id=1, name="Circle", geometry_type=NFZGeometryType.CIRCLE, min_altitude_m=0.0, max_altitude_m=150.0,
+            effective_from=None, effective_to=None, schedule_json=None,
+            definition_json={"center_lat": center_lat, "center_lon": center_lon, "radius_m": args.radius_m},
+        ),
+        "polygon": SimpleNamespace(
+            id=2, name="Polygon", geometry_type=NFZGeometryType.POLYGON, min_altitude_m=0.0, max_altitude_m=150.0,
+            effective_from=None, effective_to=None, schedule_json=None,
+            definition_json={"coordinates": [[
+                [center_lon - 0.03, center_lat - 0.02], [center_lon + 0.03, center_lat - 0.02],
+                [center_lon + 0.01, center_lat + 0.02], [center_lon - 0.03, center_lat + 0.02],
+                [center_lon - 0.03, center_lat - 0.02],
+            ]]},
+        ),
+    }
+
+    service = NFZImpactService()
+    for label, zone in zones.items():
+        service.analyze(db, zone)  # warm up
+        db.expunge_all()
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            report = service.analyze(db, zone)
+            db.expunge_all()
+        indexed_ms = (time.perf_counter() - start) / args.runs * 1000
+
+        start = time.perf_counter()
+        scanned = full_scan(db, zone)
+        db.expunge_all()
+        scan_ms = (time.perf_counter() - start) * 1000
+        print(f"{label:<8} {len(report.affected_flights):6d} affected / {report.candidate_count:6d} candidates "
+              f"(full scan found {scanned})")
+        print(f"         indexed {indexed_ms:8.1f} ms   full scan {scan_ms:8.1f} ms   x{scan_ms / indexed_ms:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
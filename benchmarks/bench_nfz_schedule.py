@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+"Zones active during [t1, t2]" with many scheduled zones.
+
+Seeds N active zones (default 5000) into in-memory SQLite: a third always
+active, a third with one-off windows over the next two weeks and a third with
+recurring weekly schedules. Then times ZoneScheduleIndex.active_during() for
+30-minute plan envelopes, against loading the zones and evaluating every
+schedule per query (what a per-check DB load would cost).
+
+Run with: python -m benchmarks.bench_nfz_schedule [--zones N] [--queries N]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert
+
+from benchmarks.common import make_sqlite_session, seed_flight_plan
+from app.crud import restricted_zone as crud_restricted_zone
+from app.models.restricted_zone import NFZGeometryType, RestrictedZone
+from app.services.nfz_schedule_index import ZoneScheduleIndex, zone_active_during
+
+
+def seed(db, zones: int, rng: random.Random) -> None:
+    owner = seed_flight_plan(db)
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(zones):
+        row = dict(
+            name=f"Zone {i}",
+            geometry_type=NFZGeometryType.CIRCLE,
+            definition_json={"center_lat": 43.2 + rng.uniform(0, 0.3), "center_lon": 76.8 + rng.uniform(0, 0.3), "radius_m": 500},
+            is_active=True,
+            created_by_authority_id=owner.user_id,
+        )
+        if i % 3 == 1:
+            start = now + timedelta(hours=rng.uniform(0, 14 * 24))
+            row.update(effective_from=start, effective_to=start + timedelta(hours=rng.uniform(1, 6)))
+        elif i % 3 == 2:
+            hour = rng.randrange(24)
+            row["schedule_json"] = [{
+                "days_of_week": rng.sample(range(7), rng.randint(1, 3)),
+                "start_time": f"{hour:02d}:00",
+                "end_time": f"{(hour + rng.randint(1, 4)) % 24:02d}:30",
+            }]
+        rows.append(row)
+    db.execute(insert(RestrictedZone), rows)
+    db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--zones", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--scan-queries", type=int, default=20, help="queries for the load-and-evaluate baseline")
+    args = parser.parse_args()
+    rng = random.Random(3)
+
+    db = make_sqlite_session()
+    seed(db, args.zones, rng)
+    now = datetime.now(timezone.utc)
+    envelopes = []
+    for _ in range(args.queries):
+        start = now + timedelta(minutes=rng.uniform(0, 13 * 24 * 60))
+        envelopes.append((start, start + timedelta(minutes=30)))
+
+    index = ZoneScheduleIndex()
+    start = time.perf_counter()
+    index.rebuild(db)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    counts = [len(index.active_during(db, t1, t2)) for t1, t2 in envelopes]
+    indexed_us = (time.perf_counter() - start) / args.queries * 1e6
+
+    start = time.perf_counter()
+    for t1, t2 in envelopes[: args.scan_queries]:
+        zones = crud_restricted_zone.get_all_active_zones(db)
+        [zone for zone in zones if zone_active_during(zone, t1, t2)]
+        db.expunge_all()
+    scan_us = (time.perf_counter() - start) / args.scan_queries * 1e6
+
+    print(f"{args.zones} zones, index built in {build_ms:.0f} ms, avg {sum(counts) / len(counts):.0f} zones in effect per envelope")
+    print(f"interval index       {indexed_us:10.1f} us/query")
+    print(f"load + evaluate      {scan_us:10.1f} us/query   x{scan_us / indexed_us:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Storage of finished flights: telemetry_logs rows against the compressed archive.
+
+Records F flights (default 20) of P points each (default 1800: 30 minutes at
+1 Hz, a drone flying legs between random waypoints with GPS noise) into a
+SQLite file, measures the database size per point, archives every flight and
+measures again. Also times encoding and decoding a track.
+
+Run with: python -m benchmarks.bench_telemetry_archive [--flights N] [--points N]
+"""
+
+import argparse
+import math
+import os
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from benchmarks.common import make_sqlite_session, seed_flight_plan
+from app.crud import telemetry_log as crud_telemetry_log
+from app.models.flight_plan import FlightPlanStatus
+from app.services.telemetry_archive_service import TelemetryArchiveService
+from app.services.telemetry_codec import decode_track, encode_track
+from app.services.telemetry_spool import write_direct
+
+
+def make_track(flight_plan_id: int, drone_id: int, start: datetime, count: int, rng: random.Random):
+    lat, lon, alt = 43.2 + rng.uniform(0, 0.1), 76.8 + rng.uniform(0, 0.1), rng.uniform(60, 120)
+    rows, heading, speed = [], rng.uniform(0, 360), rng.uniform(8, 15)
+    for i in range(count):
+        if i % 300 == 0: # New leg every 5 minutes
+            heading, speed = rng.uniform(0, 360), rng.uniform(8, 15)
+        lat += speed * math.cos(math.radians(heading)) / 111_320
+        lon += speed * math.sin(math.radians(heading)) / (111_320 * math.cos(math.radians(lat)))
+        rows.append({
+            "flight_plan_id": flight_plan_id,
+            "drone_id": drone_id,
+            "timestamp": start + timedelta(seconds=i, milliseconds=rng.randint(-20, 20)),
+            "latitude": lat + rng.gauss(0, 2e-6),
+            "longitude": lon + rng.gauss(0, 2e-6),
+            "altitude_m": alt + rng.gauss(0, 0.3),
+            "speed_mps": round(speed + rng.gauss(0, 0.2), 2),
+            "heading_degrees": round((heading + rng.gauss(0, 1)) % 360, 1),
+            "status_message": "ON_SCHEDULE",
+        })
+    return rows
+
+
+def database_bytes(db) -> int:
+    db.execute(text("VACUUM"))
+    return db.execute(text("PRAGMA page_count")).scalar() * db.execute(text("PRAGMA page_size")).scalar()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--flights", type=int, default=20)
+    parser.add_argument("--points", type=int, default=1800)
+    args = parser.parse_args()
+    rng = random.Random(11)
+
+    directory = tempfile.mkdtemp(prefix="bench_archive_")
+    db = make_sqlite_session(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+    plans = [seed_flight_plan(db, suffix=str(i), waypoints=2) for i in range(args.flights)]
+    start = datetime(2025, 6, 1, tzinfo=timezone.utc)
+    for plan in plans:
+        write_direct(db, make_track(plan.id, plan.drone_id, start, args.points, rng))
+    db.commit()
+    empty_plans = database_bytes(db)
+    total_points = args.flights * args.points
+
+    rows = crud_telemetry_log.get_rows_for_flight(db, flight_plan_id=plans[0].id)
+    started = time.perf_counter()
+    blob = encode_track(rows)
+    encode_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    decode_track(blob, plans[0].id)
+    decode_ms = (time.perf_counter() - started) * 1000
+
+    for plan in plans:
+        plan.status = FlightPlanStatus.COMPLETED
+    db.commit()
+    service = TelemetryArchiveService()
+    started = time.perf_counter()
+    for plan in plans:
+        service.archive_flight(db, flight_plan_id=plan.id)
+    archive_s = time.perf_counter() - started
+    archived = database_bytes(db)
+
+    # Same database without any telemetry: the fixed cost of users, drones and plans
+    baseline_db = make_sqlite_session(f"sqlite:///{os.path.join(directory, 'baseline.db')}")
+    for i in range(args.flights):
+        seed_flight_plan(baseline_db, suffix=str(i), waypoints=2)
+    baseline_db.commit()
+    baseline = database_bytes(baseline_db)
+
+    hot_per_point = (empty_plans - baseline) / total_points
+    archive_per_point = (archived - baseline) / total_points
+    print(f"{args.flights} flights x {args.points} points")
+    print(f"telemetry_logs rows : {hot_per_point:7.1f} bytes/point (table + indexes)")
+    print(f"archive blobs       : {archive_per_point:7.1f} bytes/point on disk, {len(blob) / args.points:.1f} encoded")
+    print(f"compression         : {hot_per_point / archive_per_point:7.1f}x on disk, {hot_per_point / (len(blob) / args.points):.1f}x encoded")
+    print(f"encode / decode     : {encode_ms:.1f} ms / {decode_ms:.1f} ms per {args.points}-point track")
+    print(f"archiving           : {total_points / archive_s:,.0f} points/s")
+    shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
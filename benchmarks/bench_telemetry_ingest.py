@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Telemetry ingest throughput for one worker.
+
+Seeds a fleet of drones with ACTIVE flights into in-memory SQLite, then feeds
+JSON batches through TelemetryIngestService.ingest() (orjson decode, plain
+validation, one multi-row INSERT per batch) and compares with the simulator's
+path: a pydantic TelemetryLogCreate per point, a single-row insert and a
+commit each.
+
+Run with: python -m benchmarks.bench_telemetry_ingest [--drones N] [--batch N] [--batches N]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import orjson
+
+from benchmarks.common import make_sqlite_session
+from app.crud import telemetry_log as crud_telemetry_log
+from app.models.drone import Drone, DroneOwnerType, DroneStatus
+from app.models.flight_plan import FlightPlan, FlightPlanStatus
+from app.models.user import User, UserRole
+from app.schemas.telemetry import TelemetryLogCreate
+from app.services.telemetry_ingest_service import TelemetryIngestService
+
+
+def seed(db, drones: int):
+    pilot = User(full_name="Fleet", email="fleet@example.com", hashed_password="x", role=UserRole.SOLO_PILOT, is_active=True)
+    db.add(pilot)
+    db.flush()
+    now = datetime.now(timezone.utc)
+    for i in range(drones):
+        drone = Drone(brand="B", model="M", serial_number=f"FLEET-{i}", owner_type=DroneOwnerType.SOLO_PILOT,
+                      solo_owner_user_id=pilot.id, current_status=DroneStatus.ACTIVE)
+        db.add(drone)
+        db.flush()
+        db.add(FlightPlan(user_id=pilot.id, drone_id=drone.id, status=FlightPlanStatus.ACTIVE,
+                          planned_departure_time=now, planned_arrival_time=now + timedelta(minutes=30)))
+    db.commit()
+    # Plain caller identity: every commit would otherwise expire and reload the ORM user
+    return SimpleNamespace(id=pilot.id, role=pilot.role, organization_id=None)
+
+
+def make_batches(drones: int, batch: int, batches: int, rng: random.Random):
+    start = time.time() - batches
+    bodies = []
+    for b in range(batches):
+        points = [{
+            "drone_id": rng.randint(1, drones),
+            "timestamp": start + b + i / batch,
+            "latitude": 43.2 + rng.uniform(0, 0.2),
+            "longitude": 76.8 + rng.uniform(0, 0.2),
+            "altitude_m": rng.uniform(30, 120),
+            "speed_mps": rng.uniform(0, 20),
+            "heading_degrees": rng.uniform(0, 359.9),
+        } for i in range(batch)]
+        bodies.append(orjson.dumps(points))
+    return bodies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--drones", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--batches", type=int, default=20)
+    parser.add_argument("--baseline-points", type=int, default=2000, help="points for the per-point baseline")
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    db = make_sqlite_session()
+    pilot = seed(db, args.drones)
+    bodies = make_batches(args.drones, args.batch, args.batches, rng)
+    service = TelemetryIngestService()
+
+    start = time.perf_counter()
+    accepted = sum(service.ingest(db, pilot, orjson.loads(body))["accepted"] for body in bodies)
+    batched_s = time.perf_counter() - start
+
+    points = orjson.loads(bodies[0])[: args.baseline_points]
+    for point in points:
+        point["timestamp"] -= 86400 # Not yet stored (drone_id, timestamp)
+    start = time.perf_counter()
+    for point in points:
+        crud_telemetry_log.create_bulk(db, rows=[TelemetryLogCreate(**point).model_dump()])
+        db.commit()
+    baseline_s = time.perf_counter() - start
+
+    batched_rate = accepted / batched_s
+    baseline_rate = len(points) / baseline_s
+    print(f"{args.drones} drones, {args.batches} batches of {args.batch} points ({accepted} accepted)")
+    print(f"batched ingest       {batched_rate:10.0f} points/s")
+    print(f"per-point + commit   {baseline_rate:10.0f} points/s   x{batched_rate / baseline_rate:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Write throughput and storage per telemetry point, before and after slimming telemetry_logs.
+
+"Before" is the previous table shape: Base audit columns (created_at,
+updated_at with now() defaults, deleted_at) and their index, plus the indexes
+on id and drone_id that duplicated the primary key and the unique
+(drone_id, timestamp) index. It is written both through ORM objects and
+through Core inserts. "After" is the current TelemetryLog written with
+crud.telemetry_log.create_bulk. Each variant gets its own SQLite file; bytes
+per row is the file size after VACUUM divided by the rows.
+
+Run with: python -m benchmarks.bench_telemetry_row [--rows N] [--batch N]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import (
+    BigInteger, Column, DateTime, Float, Index, Integer, MetaData, String, Table, create_engine, func, insert, text,
+)
+from sqlalchemy.orm import Session, registry
+
+from benchmarks.common import make_sqlite_session
+from app.crud import telemetry_log as crud_telemetry_log
+
+legacy_metadata = MetaData()
+legacy_table = Table(
+    "telemetry_logs", legacy_metadata,
+    Column("id", BigInteger, primary_key=True, index=True, autoincrement=True),
+    Column("flight_plan_id", Integer, nullable=True, index=True),
+    Column("drone_id", Integer, nullable=False, index=True),
+    Column("timestamp", DateTime(timezone=True), nullable=False, index=True),
+    Column("latitude", Float, nullable=False),
+    Column("longitude", Float, nullable=False),
+    Column("altitude_m", Float, nullable=False),
+    Column("speed_mps", Float, nullable=True),
+    Column("heading_degrees", Float, nullable=True),
+    Column("status_message", String(255), nullable=True),
+    Column("created_at", DateTime(timezone=True), default=func.now()),
+    Column("updated_at", DateTime(timezone=True), default=func.now(), onupdate=func.now()),
+    Column("deleted_at", DateTime(timezone=True), nullable=True, index=True),
+    Index("uq_legacy_drone_timestamp", "drone_id", "timestamp", unique=True),
+)
+
+
+class LegacyTelemetryLog:
+    pass
+
+
+registry().map_imperatively(LegacyTelemetryLog, legacy_table)
+
+
+def make_rows(count: int, rng: random.Random):
+    start = datetime(2025, 6, 1, tzinfo=timezone.utc)
+    return [{
+        "flight_plan_id": 1 + i % 50,
+        "drone_id": 1 + i % 50,
+        "timestamp": start + timedelta(seconds=i // 50, microseconds=i % 50),
+        "latitude": 43.2 + rng.uniform(0, 0.1),
+        "longitude": 76.8 + rng.uniform(0, 0.1),
+        "altitude_m": rng.uniform(30, 120),
+        "speed_mps": rng.uniform(0, 20),
+        "heading_degrees": rng.uniform(0, 359),
+        "status_message": "ON_SCHEDULE",
+    } for i in range(count)]
+
+
+def file_bytes(db: Session) -> int:
+    db.execute(text("VACUUM"))
+    return db.execute(text("PRAGMA page_count")).scalar() * db.execute(text("PRAGMA page_size")).scalar()
+
+
+def run(name: str, db: Session, write, rows, batch: int, empty_bytes: int) -> None:
+    started = time.perf_counter()
+    for i in range(0, len(rows), batch):
+        write(db, rows[i:i + batch])
+        db.commit()
+    elapsed = time.perf_counter() - started
+    per_row = (file_bytes(db) - empty_bytes) / len(rows)
+    print(f"{name:<32} {len(rows) / elapsed:>10,.0f} rows/s {per_row:>8.1f} bytes/row")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+    rows = make_rows(args.rows, random.Random(5))
+    directory = tempfile.mkdtemp(prefix="bench_row_")
+
+    def legacy_session(name: str) -> Session:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, name)}")
+        legacy_metadata.create_all(engine)
+        return Session(engine)
+
+    db = legacy_session("legacy_orm.db")
+    run("before: ORM objects", db, lambda s, b: s.add_all([LegacyTelemetryLog(**row) for row in b]), rows, args.batch, file_bytes(db))
+    db = legacy_session("legacy_core.db")
+    run("before: Core insert", db, lambda s, b: s.execute(insert(legacy_table), b), rows, args.batch, file_bytes(db))
+    # Current schema: the other tables are empty, so the baseline subtracts them
+    db = make_sqlite_session(f"sqlite:///{os.path.join(directory, 'slim.db')}")
+    db.execute(text("PRAGMA foreign_keys = OFF")) # No drones / plans seeded
+    run("after: AppendOnlyBase + Core", db, lambda s, b: crud_telemetry_log.create_bulk(s, rows=b), rows, args.batch, file_bytes(db))
+    shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Telemetry write latency with and without the write-ahead spool.
+
+Times writing 1000-point batches straight to the database (in-memory SQLite
+here; a real Postgres round trip only adds to it) against appending them to
+the memory-mapped spool, then times draining the spool into the database.
+
+Run with: python -m benchmarks.bench_telemetry_spool [--batches N] [--batch N]
+"""
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import make_sqlite_session, seed_flight_plan
+from app.core.config import settings
+from app.services import telemetry_spool as spool_module
+from app.services.telemetry_spool import TelemetrySpool, write_direct
+
+
+def make_rows(drone_id: int, start: datetime, count: int, rng: random.Random):
+    return [{
+        "flight_plan_id": None,
+        "drone_id": drone_id,
+        "timestamp": start + timedelta(milliseconds=i),
+        "latitude": 43.2 + rng.uniform(0, 0.1),
+        "longitude": 76.8 + rng.uniform(0, 0.1),
+        "altitude_m": rng.uniform(30, 120),
+        "speed_mps": rng.uniform(0, 20),
+        "heading_degrees": rng.uniform(0, 359),
+        "status_message": "ON_SCHEDULE",
+    } for i in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batches", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+    rng = random.Random(11)
+
+    db = make_sqlite_session()
+    drone_id = seed_flight_plan(db).drone_id
+    start = datetime.now(timezone.utc) - timedelta(days=1)
+    batches = [make_rows(drone_id, start + timedelta(seconds=10 * b), args.batch, rng) for b in range(2 * args.batches)]
+
+    t0 = time.perf_counter()
+    for rows in batches[: args.batches]:
+        write_direct(db, rows)
+    direct_ms = (time.perf_counter() - t0) / args.batches * 1000
+
+    spool_dir = tempfile.mkdtemp(prefix="telemetry-spool-")
+    settings.TELEMETRY_SPOOL_DIR = spool_dir
+    spool_module.SessionLocal = lambda: db # Drain into the benchmark database
+    db.close = lambda: None
+    spool = TelemetrySpool()
+    spool.open()
+    try:
+        t0 = time.perf_counter()
+        for rows in batches[args.batches:]:
+            spool.append(rows)
+        append_ms = (time.perf_counter() - t0) / args.batches * 1000
+
+        t0 = time.perf_counter()
+        drained = 0
+        while True:
+            count = spool.drain_once()
+            if not count:
+                break
+            drained += count
+        drain_s = time.perf_counter() - t0
+    finally:
+        spool.stop()
+        shutil.rmtree(spool_dir)
+
+    print(f"{args.batches} batches of {args.batch} points")
+    print(f"direct write         {direct_ms:10.2f} ms/batch")
+    print(f"spool append         {append_ms:10.2f} ms/batch   x{direct_ms / append_ms:6.1f}")
+    print(f"drain                {drained / drain_s:10.0f} points/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Shared bootstrap for the benchmark scripts.
+
+Builds throwaway in-memory SQLite databases with the full schema (the
+settings the app requires are filled in by the package, benchmarks/__init__.py).
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import BigInteger, create_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base_class import Base
+from app.models.user import User, UserRole
+from app.models.drone import Drone, DroneOwnerType, DroneStatus
+from app.models.flight_plan import FlightPlan, FlightPlanStatus
+from app.models.waypoint import Waypoint
+
+
+@compiles(BigInteger, "sqlite")
+def _sqlite_bigint_as_integer(type_, compiler, **kw):
+    # SQLite only autoincrements "INTEGER PRIMARY KEY" columns.
+    return "INTEGER"
+
+
+def make_sqlite_session(url: str = "sqlite://") -> Session:
+    """Fresh database with every table created, bound to a single connection."""
+    engine = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+
+def seed_flight_plan(db: Session, *, suffix: str = "1", waypoints: int = 5) -> FlightPlan:
+    """Solo pilot + drone + approved flight plan, enough rows to exercise the CRUD paths."""
+    pilot = User(
+        full_name=f"Bench Pilot {suffix}",
+        email=f"pilot{suffix}@example.com",
+        hashed_password="x",
+        role=UserRole.SOLO_PILOT,
+        is_active=True,
+    )
+    db.add(pilot)
+    db.flush()
+    drone = Drone(
+        brand="Bench",
+        model="B1",
+        serial_number=f"BENCH-{suffix}",
+        owner_type=DroneOwnerType.SOLO_PILOT,
+        solo_owner_user_id=pilot.id,
+        current_status=DroneStatus.IDLE,
+    )
+    db.add(drone)
+    db.flush()
+    departure = datetime.now(timezone.utc) + timedelta(hours=1)
+    flight_plan = FlightPlan(
+        user_id=pilot.id,
+        drone_id=drone.id,
+        planned_departure_time=departure,
+        planned_arrival_time=departure + timedelta(minutes=30),
+        status=FlightPlanStatus.APPROVED,
+    )
+    db.add(flight_plan)
+    db.flush()
+    for i in range(waypoints):
+        db.add(Waypoint(
+            flight_plan_id=flight_plan.id,
+            latitude=43.20 + i * 0.001,
+            longitude=76.85 + i * 0.001,
+            altitude_m=100.0,
+            sequence_order=i,
+        ))
+    db.commit()
+    return flight_plan
+
+
+def per_call_us(fn: Callable[[], object], iterations: int) -> float:
+    """Average wall time of `fn` in microseconds."""
+    fn()  # warm up caches / lazy mapper configuration
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def report(label: str, before_us: float, after_us: float) -> None:
+    speedup = before_us / after_us if after_us else float("inf")
+    print(f"{label:<44} before {before_us:10.1f} us   after {after_us:10.1f} us   x{speedup:5.1f}")